@@ -81,6 +81,8 @@ class BaseNode(QtCore.QObject):
         self._loading = False
         self._status = BaseNode.stopped
         self._ports = []
+        # ports indexed by (adapter number, port number)
+        self._ports_by_number = {}
         self._links = set()
 
     def links(self):
@@ -148,7 +150,11 @@ class BaseNode(QtCore.QObject):
         :param new_id: node identifier (integer)
         """
 
+        old_id = self._id
         self._id = new_id
+        if old_id != new_id:
+            from .topology import Topology
+            Topology.instance().updateNodeIndex(self, old_id=old_id)
 
         # update the instance count to avoid conflicts
         if new_id >= BaseNode._instance_count:
@@ -228,6 +234,18 @@ class BaseNode(QtCore.QObject):
 
         return self._ports
 
+    def getPort(self, adapter_number, port_number):
+        """
+        Lookups for a port using its adapter and port numbers.
+
+        :param adapter_number: adapter number
+        :param port_number: port number
+
+        :returns: Port instance or None
+        """
+
+        return self._ports_by_number.get((adapter_number, port_number))
+
     @staticmethod
     def defaultCategories():
         """
@@ -289,9 +307,10 @@ class BaseNode(QtCore.QObject):
         :param callback: callback method to call when the server replies
         :param body: params to send (dictionary)
         :param context: Pass a context to the response callback
+        :returns: False if the query has been dropped
         """
 
-        self._project.post(path, callback, body=body, context=context, **kwargs)
+        return self._project.post(path, callback, body=body, context=context, **kwargs)
 
     def controllerHttpPut(self, path, callback, body={}, context={}, **kwargs):
         """
@@ -19,6 +19,7 @@ from .qt import QtCore
 
 from .compute import Compute
 from .controller import Controller
+from .http_client import HTTPClient
 
 import sys
 import copy
@@ -58,7 +59,7 @@ class ComputeManager(QtCore.QObject):
         if self._controller.connected() and datetime.datetime.now().timestamp() - self._last_computes_refresh > 1:
             self._last_computes_refresh = datetime.datetime.now().timestamp()
             self._refreshingComputes = True
-            self._controller.get("/computes", self._listComputesCallback, showProgress=False, timeout=30)
+            self._controller.get("/computes", self._listComputesCallback, showProgress=False, timeout=30, priority=HTTPClient.BACKGROUND)
 
     def _controllerConnectedSlot(self):
         if self._controller.connected():
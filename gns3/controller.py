@@ -16,11 +16,10 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
-import hashlib
-import tempfile
 
 from .qt import QtCore, QtGui, QtWidgets, qpartial, qslot
 from .symbol import Symbol
+from .utils.static_asset_cache import StaticAssetCache
 from .local_server_config import LocalServerConfig
 from .settings import LOCAL_SERVER_SETTINGS
 
@@ -41,7 +40,8 @@ class Controller(QtCore.QObject):
         super().__init__()
         self._connected = False
         self._connecting = False
-        self._cache_directory = tempfile.mkdtemp()
+        self._static_cache = None
+        self._static_cache_save_scheduled = False
         self._http_client = None
         # If it's the first error we display an alert box to the user
         self._first_error = True
@@ -204,9 +204,12 @@ class Controller(QtCore.QObject):
     def createHTTPQuery(self, method, path, *args, **kwargs):
         """
         Forward the query to the HTTP client or controller depending of the path
+
+        :returns: False if the query has been dropped
         """
         if self._http_client:
             return self._http_client.createHTTPQuery(method, path, *args, **kwargs)
+        return False
 
     def getSynchronous(self, endpoint, timeout=2):
         return self._http_client.getSynchronous(endpoint, timeout)
@@ -225,68 +228,176 @@ class Controller(QtCore.QObject):
             Controller._instance = Controller()
         return Controller._instance
 
-    def getStatic(self, url, callback, fallback=None):
+    def _staticCache(self):
+        """
+        :returns: Cache of the static assets, created on first use
+        """
+
+        if self._static_cache is None:
+            from .local_config import LocalConfig
+            directory = os.path.join(os.path.dirname(LocalConfig.instance().configFilePath()), "static_cache")
+            self._static_cache = StaticAssetCache(directory)
+        return self._static_cache
+
+    def _staticCacheKey(self, url):
+        """
+        The assets of different controllers are cached separately
+        """
+
+        return "{}{}".format(self._http_client.url(), url)
+
+    def getStatic(self, url, callback, fallback=None, error_callback=None):
         """
         Get a URL from the /static on controller and cache it on disk
 
+        A cached file is used immediately, the first time it's used
+        the controller is asked in background if it has changed.
+
         :param url: URL without the protocol and host part
         :param callback: Callback to call when file is ready
         :param fallback: Fallback url in case of error
+        :param error_callback: Callback to call if the file can't be downloaded
         """
 
         if not self._http_client:
             return
 
+        cache = self._staticCache()
+        key = self._staticCacheKey(url)
+        path = cache.path(key)
 
-        path = self.getStaticCachedPath(url)
-
-        if os.path.exists(path):
+        if path is not None:
             callback(path)
-        elif path in self._static_asset_download_queue:
-            self._static_asset_download_queue[path].append((callback, fallback, ))
+            if not cache.validated(key) and key not in self._static_asset_download_queue:
+                self._static_asset_download_queue[key] = []
+                self._http_client.createHTTPQuery("GET", url, qpartial(self._getStaticCallback, url, key), headers=cache.validationHeaders(key), showProgress=False, priority=self._http_client.BACKGROUND)
+        elif key in self._static_asset_download_queue:
+            self._static_asset_download_queue[key].append((callback, fallback, error_callback))
         else:
-            self._static_asset_download_queue[path] = [(callback, fallback, )]
-            self._http_client.createHTTPQuery("GET", url, qpartial(self._getStaticCallback, url, path))
+            self._static_asset_download_queue[key] = [(callback, fallback, error_callback)]
+            self._http_client.createHTTPQuery("GET", url, qpartial(self._getStaticCallback, url, key))
 
-    def _getStaticCallback(self, url, path, result, error=False, raw_body=None, **kwargs):
-        if path not in self._static_asset_download_queue:
+    def _getStaticCallback(self, url, key, result, error=False, raw_body=None, headers=None, status=None, **kwargs):
+        if key not in self._static_asset_download_queue:
             return
+        callbacks = self._static_asset_download_queue.pop(key)
+        cache = self._staticCache()
+
+        if status == 304 and cache.path(key) is None:
+            # the file has been removed from the cache during the validation
+            error = True
+        elif not error and status != 304 and not self._completeBody(raw_body, headers):
+            # an empty or truncated answer is not a valid asset
+            log.warning("Empty or truncated answer received for {}".format(url))
+            error = True
 
         if error:
-            fallback_used = False
-            for callback, fallback in self._static_asset_download_queue[path]:
-                if fallback:
-                    self.getStatic(fallback, callback)
-                fallback_used = True
-            if fallback_used:
-                log.debug("Error while downloading file: {}".format(url))
-            del self._static_asset_download_queue[path]
+            self._staticDownloadFailed(url, callbacks)
             return
+
+        if status == 304:
+            # Not modified since the file has been cached
+            cache.setValidated(key)
+            path = cache.path(key)
+        else:
+            if headers is None:
+                headers = {}
+            try:
+                path = cache.store(key, raw_body, etag=headers.get("etag"), last_modified=headers.get("last-modified"))
+            except OSError as e:
+                log.error("Can't write to {}: {}".format(cache.directory(), str(e)))
+                self._staticDownloadFailed(url, callbacks)
+                return
+            log.debug("File stored {} for {}".format(path, url))
+            self._saveStaticCacheLater()
+        for callback, fallback, error_callback in callbacks:
+            callback(path)
+
+    @staticmethod
+    def _completeBody(raw_body, headers):
+        """
+        :returns: True if the body is not empty and has the announced length
+        """
+
+        if not raw_body:
+            return False
         try:
-            with open(path, "wb+") as f:
-                f.write(raw_body)
-        except OSError as e:
-            log.error("Can't write to {}: {}".format(path, str(e)))
+            return int((headers or {}).get("content-length", len(raw_body))) == len(raw_body)
+        except ValueError:
+            return True
+
+    def _staticDownloadFailed(self, url, callbacks):
+        """
+        Uses the fallback or calls the error callback of the
+        requests waiting for an asset which can't be cached.
+        """
+
+        if callbacks:
+            log.debug("Error while downloading file: {}".format(url))
+        for callback, fallback, error_callback in callbacks:
+            if fallback:
+                self.getStatic(fallback, callback, error_callback=error_callback)
+            elif error_callback:
+                error_callback()
+
+    def _saveStaticCacheLater(self):
+        """
+        The index of the cache is saved once after a burst of downloads
+        """
+
+        if not self._static_cache_save_scheduled:
+            self._static_cache_save_scheduled = True
+            QtCore.QTimer.singleShot(1000, self._saveStaticCache)
+
+    @qslot
+    def _saveStaticCache(self, *args):
+        self._static_cache_save_scheduled = False
+        if self._static_cache is not None:
+            self._static_cache.save()
+
+    def prefetchStatic(self, urls, callback):
+        """
+        Downloads in one batch the assets missing from the cache,
+        for example all the symbols used by a project before creating
+        the scene.
+
+        :param urls: List of URLs
+        :param callback: Callback to call once all the URLs have been processed
+        """
+
+        urls = set(urls)
+        if not self._http_client or len(urls) == 0:
+            callback()
             return
-        log.debug("File stored {} for {}".format(path, url))
-        for callback, fallback in self._static_asset_download_queue[path]:
-            callback(path)
-        del self._static_asset_download_queue[path]
+
+        batch = {"pending": len(urls), "callback": callback}
+        for url in urls:
+            done = qpartial(self._prefetchStaticCallback, batch)
+            self.getStatic(url, done, error_callback=done)
+
+    def _prefetchStaticCallback(self, batch, *args):
+        batch["pending"] -= 1
+        if batch["pending"] == 0:
+            batch["callback"]()
 
     def getStaticCachedPath(self, url):
         """
-        Returns static cached (hashed) path
-        :param url:
-        :return:
+        Returns static cached path
+
+        :param url: URL without the protocol and host part
+        :return: Path or None if the URL is not cached
         """
-        m = hashlib.md5()
-        m.update(url.encode())
-        if ".svg" in url:
-            extension = ".svg"
-        else:
-            extension = ".png"
-        path = os.path.join(self._cache_directory, m.hexdigest() + extension)
-        return path
+
+        if not self._http_client:
+            return None
+        return self._staticCache().path(self._staticCacheKey(url))
+
+    def staticCacheStatistics(self):
+        """
+        :returns: Statistics of the static assets cache
+        """
+
+        return self._staticCache().statistics()
 
     def getSymbolIcon(self, symbol_id, callback, fallback=None):
         """
@@ -66,7 +66,7 @@ class ApplianceWizard(QtWidgets.QWizard, Ui_ApplianceWizard):
         self._appliance = Appliance(self._registry, self._path)
 
         self.uiApplianceVersionTreeWidget.currentItemChanged.connect(self._applianceVersionCurrentItemChangedSlot)
-        self.uiRefreshPushButton.clicked.connect(self.images_changed_signal.emit)
+        self.uiRefreshPushButton.clicked.connect(self._refreshPushButtonClickedSlot)
         self.uiDownloadPushButton.clicked.connect(self._downloadPushButtonClickedSlot)
         self.uiImportPushButton.clicked.connect(self._importPushButtonClickedSlot)
         self.uiCreateVersionPushButton.clicked.connect(self._createVersionPushButtonClickedSlot)
@@ -246,6 +246,15 @@ class ApplianceWizard(QtWidgets.QWizard, Ui_ApplianceWizard):
     def _imageUploadedCallback(self, result, error=False, **kwargs):
         self._registry.getRemoteImageList(self._appliance.emulator(), self._compute_id)
 
+    @qslot
+    def _refreshPushButtonClickedSlot(self, *args):
+        """
+        Scans again the image directories
+        """
+
+        self._registry.refresh()
+        self.images_changed_signal.emit()
+
     @qslot
     def _refreshVersions(self, *args):
         """
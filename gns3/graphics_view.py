@@ -20,6 +20,7 @@ Graphical view on the scene where items are drawn.
 """
 
 import logging
+import math
 import os
 import sip
 import sys
@@ -72,6 +73,15 @@ class GraphicsView(QtWidgets.QGraphicsView):
     :param parent: parent widget
     """
 
+    # Levels of detail used to paint the items depending on the zoom
+    LOD_FULL = 0
+    LOD_PIXMAP = 1
+    LOD_GLYPH = 2
+
+    # Size of a grid cell and approximate size in pixels of the cached grid tiles
+    GRID_SIZE = 75
+    GRID_TILE_PIXELS = 256
+
     def __init__(self, parent):
 
         # Our parent is the central widget which parent is the main window.
@@ -89,6 +99,10 @@ class GraphicsView(QtWidgets.QGraphicsView):
         self._newlink = None
         self._dragging = False
         self._last_mouse_position = None
+        # links to adjust at the end of the current mouse move
+        self._dirty_links = None
+        # pre-rendered grid tiles by zoom level
+        self._grid_tiles = {}
         self._topology = Topology.instance()
         self._background_warning_msgbox = QtWidgets.QErrorMessage(self)
         self._background_warning_msgbox.setWindowTitle("Layer position")
@@ -102,6 +116,8 @@ class GraphicsView(QtWidgets.QGraphicsView):
 
         # set the custom flags for this view
         self.setDragMode(QtWidgets.QGraphicsView.RubberBandDrag)
+        # the background is only repainted when invalidated or zoomed
+        self.setCacheMode(QtWidgets.QGraphicsView.CacheBackground)
         self.setRenderHint(QtGui.QPainter.Antialiasing)
         self.setTransformationAnchor(QtWidgets.QGraphicsView.AnchorUnderMouse)
         self.setResizeAnchor(QtWidgets.QGraphicsView.AnchorViewCenter)
@@ -116,6 +132,35 @@ class GraphicsView(QtWidgets.QGraphicsView):
 
     def setSceneSize(self, width, height):
         self.scene().setSceneRect(-(width / 2), -(height / 2), width, height)
+        self.invalidateBackgroundCache()
+
+    def invalidateBackgroundCache(self):
+        """
+        Drops the cached background, like when the grid is toggled.
+        """
+
+        self._grid_tiles.clear()
+        self.resetCachedContent()
+        self.viewport().update()
+
+    def beginBulkLoad(self):
+        """
+        Suspends the scene indexing and the view updates
+        while a lot of items are added to the scene.
+        """
+
+        self.scene().setItemIndexMethod(QtWidgets.QGraphicsScene.NoIndex)
+        self.setUpdatesEnabled(False)
+
+    def endBulkLoad(self):
+        """
+        Rebuilds the scene index and repaints the view
+        once all the items have been added.
+        """
+
+        self.scene().setItemIndexMethod(QtWidgets.QGraphicsScene.BspTreeIndex)
+        self.setUpdatesEnabled(True)
+        self.viewport().update()
 
     def setZoom(self, zoom):
         """
@@ -190,6 +235,28 @@ class GraphicsView(QtWidgets.QGraphicsView):
         self._settings.update(new_settings)
         LocalConfig.instance().saveSectionSettings(self.__class__.__name__, self._settings)
 
+    def levelOfDetail(self, painter):
+        """
+        Returns the level of detail to paint an item. On a large
+        scene (at least "level_of_detail_min_nodes" nodes) at low zoom
+        the symbols are painted with cached pixmaps or simple glyphs
+        and the labels and status points are skipped.
+
+        :param painter: QPainter instance used to paint the item
+        :returns: LOD_FULL, LOD_PIXMAP or LOD_GLYPH
+        """
+
+        if not self._settings["level_of_detail"]:
+            return self.LOD_FULL
+        if len(Topology.instance().nodes()) < self._settings["level_of_detail_min_nodes"]:
+            return self.LOD_FULL
+        scale = QtWidgets.QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        if scale < self._settings["level_of_detail_glyph_zoom"]:
+            return self.LOD_GLYPH
+        if scale < self._settings["level_of_detail_pixmap_zoom"]:
+            return self.LOD_PIXMAP
+        return self.LOD_FULL
+
     def addingLinkSlot(self, enabled):
         """
         Slot to receive events from MainWindow
@@ -564,7 +631,7 @@ class GraphicsView(QtWidgets.QGraphicsView):
             hBar.setValue(hBar.value() + (delta.x() if QtWidgets.QApplication.isRightToLeft() else -delta.x()))
             vBar.setValue(vBar.value() - delta.y())
             self._last_mouse_position = mapped_global_pos
-        if self._adding_link and self._newlink and self._newlink in self.scene().items():
+        if self._adding_link and self._newlink and self._newlink.scene() is self.scene():
             # update the mouse position when the user is adding a link.
             self._newlink.setMousePoint(self.mapToScene(event.pos()))
             event.ignore()
@@ -577,9 +644,35 @@ class GraphicsView(QtWidgets.QGraphicsView):
 
             # force the children to redraw because of a problem with QGraphicsEffect
             for item in self.scene().selectedItems():
-                for child in item.childItems():
-                    child.update()
-            super().mouseMoveEvent(event)
+                effect = item.graphicsEffect()
+                if effect is not None and effect.isEnabled():
+                    for child in item.childItems():
+                        child.update()
+
+            # the selected items are moved during this call and their links
+            # are adjusted once at the end, even when both ends have moved
+            self._dirty_links = set()
+            try:
+                super().mouseMoveEvent(event)
+            finally:
+                dirty_links = self._dirty_links
+                self._dirty_links = None
+            for link in dirty_links:
+                link.adjust()
+
+    def adjustLinks(self, links):
+        """
+        Adjusts link items after a node has moved. During a mouse
+        move the links are adjusted once all the items have moved.
+
+        :param links: list of LinkItem instances
+        """
+
+        if self._dirty_links is not None:
+            self._dirty_links.update(links)
+        else:
+            for link in links:
+                link.adjust()
 
     def mouseDoubleClickEvent(self, event):
         """
@@ -881,9 +974,7 @@ class GraphicsView(QtWidgets.QGraphicsView):
         contextual menu.
         """
 
-        for item in self.scene().selectedItems():
-            if isinstance(item, NodeItem) and hasattr(item.node(), "start") and item.node().initialized():
-                item.node().start()
+        self._applyNodeAction("start")
 
     def stopActionSlot(self):
         """
@@ -891,9 +982,7 @@ class GraphicsView(QtWidgets.QGraphicsView):
         contextual menu.
         """
 
-        for item in self.scene().selectedItems():
-            if isinstance(item, NodeItem) and hasattr(item.node(), "stop") and item.node().initialized():
-                item.node().stop()
+        self._applyNodeAction("stop")
 
     def suspendActionSlot(self):
         """
@@ -901,9 +990,7 @@ class GraphicsView(QtWidgets.QGraphicsView):
         contextual menu.
         """
 
-        for item in self.scene().selectedItems():
-            if isinstance(item, NodeItem) and hasattr(item.node(), "suspend") and item.node().initialized():
-                item.node().suspend()
+        self._applyNodeAction("suspend")
 
     def reloadActionSlot(self):
         """
@@ -911,9 +998,18 @@ class GraphicsView(QtWidgets.QGraphicsView):
         contextual menu.
         """
 
-        for item in self.scene().selectedItems():
-            if isinstance(item, NodeItem) and hasattr(item.node(), "reload") and item.node().initialized():
-                item.node().reload()
+        self._applyNodeAction("reload")
+
+    def _applyNodeAction(self, action):
+        """
+        Applies an action to all the selected nodes at once.
+
+        :param action: action name (start, stop, suspend or reload)
+        """
+
+        nodes = [item.node() for item in self.scene().selectedItems() if isinstance(item, NodeItem)]
+        if nodes:
+            Topology.instance().project().applyNodeAction(action, nodes)
 
     def configureActionSlot(self):
         """
@@ -1041,9 +1137,13 @@ class GraphicsView(QtWidgets.QGraphicsView):
         counter = 0
         for name in sorted(nodes.keys()):
             node = nodes[name]
-            callback = qpartial(self.consoleToNode, node)
-            self._main_window.run_later(counter, callback)
-            counter += delay
+            if node.settings().get("console_type", "telnet") == "telnet":
+                # the telnet consoles are rate limited by the console launcher
+                self.consoleToNode(node)
+            else:
+                callback = qpartial(self.consoleToNode, node)
+                self._main_window.run_later(counter, callback)
+                counter += delay
 
     def consoleFromAllItems(self):
         """
@@ -1544,25 +1644,63 @@ class GraphicsView(QtWidgets.QGraphicsView):
         self._topology.addDrawing(item)
         return item
 
+    def _gridTile(self, scale):
+        """
+        Returns a tile of the grid pre-rendered for a zoom level.
+
+        :param scale: zoom level
+        :returns: tuple with the pixmap and the size of the tile in the scene
+        """
+
+        key = round(scale, 4)
+        tile = self._grid_tiles.get(key)
+        if tile is not None:
+            return tile
+
+        # the zoom changes by small steps, keep only the recent levels
+        if len(self._grid_tiles) >= 8:
+            self._grid_tiles.clear()
+
+        cells = max(1, round(self.GRID_TILE_PIXELS / (self.GRID_SIZE * scale)))
+        tile_size = cells * self.GRID_SIZE
+        ratio = self.viewport().devicePixelRatioF()
+        size = max(1, math.ceil(tile_size * scale * ratio))
+        pixmap = QtGui.QPixmap(size, size)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(QtCore.Qt.transparent)
+
+        painter = QtGui.QPainter(pixmap)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.scale(size / ratio / tile_size, size / ratio / tile_size)
+        painter.setPen(QtGui.QPen(QtGui.QColor(190, 190, 190)))
+        # the lines on the edges are drawn on both sides,
+        # the halves are joined when the tiles are put together
+        for i in range(cells + 1):
+            position = i * self.GRID_SIZE
+            painter.drawLine(QtCore.QLineF(position, 0, position, tile_size))
+            painter.drawLine(QtCore.QLineF(0, position, tile_size, position))
+        painter.end()
+
+        tile = (pixmap, tile_size)
+        self._grid_tiles[key] = tile
+        return tile
+
     def drawBackground(self, painter, rect):
         super().drawBackground(painter, rect)
         if self._main_window.uiShowGridAction.isChecked():
-            gridSize = 75
-            painter.save()
-            painter.setPen(QtGui.QPen(QtGui.QColor(190, 190, 190)))
+            pixmap, tile_size = self._gridTile(painter.worldTransform().m11())
+            source = QtCore.QRectF(0, 0, pixmap.width(), pixmap.height())
 
-            left = int(rect.left()) - (int(rect.left()) % gridSize)
-            top = int(rect.top()) - (int(rect.top()) % gridSize)
+            left = int(rect.left()) - (int(rect.left()) % tile_size)
+            top = int(rect.top()) - (int(rect.top()) % tile_size)
 
-            x = left
-            while x < rect.right():
-                painter.drawLine(x, rect.top(), x, rect.bottom())
-                x += gridSize
             y = top
             while y < rect.bottom():
-                painter.drawLine(rect.left(), y, rect.right(), y)
-                y += gridSize
-            painter.restore()
+                x = left
+                while x < rect.right():
+                    painter.drawPixmap(QtCore.QRectF(x, y, tile_size, tile_size), pixmap, source)
+                    x += tile_size
+                y += tile_size
 
     def toggleUiDeviceMenu(self):
         """ Hook which enables/disables uiDeviceMenu based on the current items selection"""
@@ -19,7 +19,9 @@ import sip
 import json
 import copy
 import http
+import time
 import uuid
+import collections
 import pathlib
 import base64
 import datetime
@@ -31,6 +33,7 @@ import urllib.parse
 from .version import __version__, __version_info__
 from .qt import QtCore, QtNetwork, qpartial, sip_is_deleted, QtWebSockets
 from .utils import parse_version
+from .utils.json_stream_decoder import JSONStreamDecoder
 
 import logging
 log = logging.getLogger(__name__)
@@ -42,6 +45,154 @@ class HttpBadRequest(Exception):
     pass
 
 
+class HTTPQueryScheduler:
+
+    """
+    Limits the number of concurrent queries sent to a host.
+
+    Waiting queries are queued by priority class and dequeued with a
+    weighted round robin, the bulk and background queries have less
+    slots than the interactive queries but are never starved.
+
+    :param max_concurrent_queries: Maximum number of queries running at the same time
+    """
+
+    # query priority classes
+    INTERACTIVE = 0
+    BULK = 1
+    BACKGROUND = 2
+
+    PRIORITY_NAMES = {
+        INTERACTIVE: "interactive",
+        BULK: "bulk",
+        BACKGROUND: "background"
+    }
+
+    # how many queries of each class are dequeued in a round robin cycle
+    PRIORITY_WEIGHTS = {
+        INTERACTIVE: 4,
+        BULK: 2,
+        BACKGROUND: 1
+    }
+
+    def __init__(self, max_concurrent_queries=6):
+
+        self._queues = {priority: collections.deque() for priority in self.PRIORITY_NAMES}
+        self._running = {priority: 0 for priority in self.PRIORITY_NAMES}
+        self._cycle = []
+        for priority in sorted(self.PRIORITY_WEIGHTS):
+            self._cycle += [priority] * self.PRIORITY_WEIGHTS[priority]
+        self._cycle_index = 0
+
+        # statistics
+        self._completed = 0
+        self._total_wait = 0.0
+        self._total_latency = 0.0
+
+        self.setMaxConcurrentQueries(max_concurrent_queries)
+
+    def setMaxConcurrentQueries(self, max_concurrent_queries):
+        """
+        Sets the maximum number of concurrent queries, some slots
+        are always kept free for the interactive queries.
+
+        :param max_concurrent_queries: integer
+        """
+
+        self._max_concurrent_queries = max(1, max_concurrent_queries)
+        self._limits = {
+            self.INTERACTIVE: self._max_concurrent_queries,
+            self.BULK: max(1, self._max_concurrent_queries - 2),
+            self.BACKGROUND: max(1, self._max_concurrent_queries // 3)
+        }
+        self._dispatch()
+
+    def maxConcurrentQueries(self):
+
+        return self._max_concurrent_queries
+
+    def schedule(self, execute, priority=INTERACTIVE):
+        """
+        Runs a query now if a slot is available otherwise queues it.
+
+        :param execute: Function sending the query and returning the QNetworkReply
+        :param priority: Priority class of the query
+        :returns: QNetworkReply or None if the query is queued
+        """
+
+        if priority not in self._queues:
+            priority = self.INTERACTIVE
+        now = time.time()
+        if not self._queues[priority] and self._canRun(priority):
+            return self._run(execute, priority, now)
+        self._queues[priority].append((execute, now))
+        self._dispatch()
+        return None
+
+    def _canRun(self, priority):
+
+        return sum(self._running.values()) < self._max_concurrent_queries and self._running[priority] < self._limits[priority]
+
+    def _nextPriority(self):
+        """
+        :returns: The next priority class to dequeue or None
+        """
+
+        for offset in range(len(self._cycle)):
+            index = (self._cycle_index + offset) % len(self._cycle)
+            priority = self._cycle[index]
+            if self._queues[priority] and self._canRun(priority):
+                self._cycle_index = index + 1
+                return priority
+        return None
+
+    def _dispatch(self):
+
+        while True:
+            priority = self._nextPriority()
+            if priority is None:
+                return
+            execute, queued_at = self._queues[priority].popleft()
+            self._run(execute, priority, queued_at)
+
+    def _run(self, execute, priority, queued_at):
+
+        started_at = time.time()
+        self._total_wait += started_at - queued_at
+        self._running[priority] += 1
+        try:
+            response = execute()
+        except Exception:
+            self._finished(priority, started_at)
+            raise
+        if response is None:
+            self._finished(priority, started_at)
+        else:
+            response.finished.connect(qpartial(self._finished, priority, started_at))
+        return response
+
+    def _finished(self, priority, started_at, *args):
+
+        self._running[priority] -= 1
+        self._completed += 1
+        self._total_latency += time.time() - started_at
+        self._dispatch()
+
+    def statistics(self):
+        """
+        :returns: Dictionary with the running queries, the queue depth
+        by priority class and the average wait and latency in seconds
+        """
+
+        return {
+            "running": sum(self._running.values()),
+            "queued": {name: len(self._queues[priority]) for priority, name in self.PRIORITY_NAMES.items()},
+            "completed": self._completed,
+            "average_wait": self._total_wait / self._completed if self._completed else 0.0,
+            "average_latency": self._total_latency / self._completed if self._completed else 0.0
+        }
+
+
 class HTTPClient(QtCore.QObject):
 
     """
@@ -54,6 +205,15 @@ class HTTPClient(QtCore.QObject):
     # Callback class used for displaying progress
     _progress_callback = None
 
+    # Minimum delay in seconds between two progress updates of a query,
+    # the progress dialog is not refreshed faster
+    PROGRESS_INTERVAL = 0.5
+
+    # query priority classes
+    INTERACTIVE = HTTPQueryScheduler.INTERACTIVE
+    BULK = HTTPQueryScheduler.BULK
+    BACKGROUND = HTTPQueryScheduler.BACKGROUND
+
     connection_connected_signal = QtCore.Signal()
     connection_disconnected_signal = QtCore.Signal()
 
@@ -87,12 +247,17 @@ class HTTPClient(QtCore.QObject):
             self._network_manager = network_manager
         else:
             self._network_manager = QtNetwork.QNetworkAccessManager()
-        # A buffer used by progress download
+        # JSON stream decoders used by progress download, one per query
         self._buffer = {}
+        # Bytes sent and received and time of the last progress update, one per query
+        self._query_progress = {}
 
         # List of query waiting for the connection
         self._query_waiting_connections = []
 
+        # Limit the number of queries running at the same time on the host
+        self._scheduler = HTTPQueryScheduler()
+
         self._websocket = QtWebSockets.QWebSocket()
 
     def setMaxTimeDifferenceBetweenQueries(self, value):
@@ -186,6 +351,19 @@ class HTTPClient(QtCore.QObject):
         """
         return self._max_retry_connection
 
+    def setMaxConcurrentQueries(self, max_concurrent_queries):
+        """
+        Sets how many queries can run at the same time on the host
+        :param max_concurrent_queries: integer
+        """
+        self._scheduler.setMaxConcurrentQueries(max_concurrent_queries)
+
+    def queryStatistics(self):
+        """
+        Returns the queue depth and latency of the queries
+        """
+        return self._scheduler.statistics()
+
     def _notify_progress_start_query(self, query_id, progress_text, response):
         """
         Called when a query start
@@ -196,28 +374,49 @@ class HTTPClient(QtCore.QObject):
             else:
                 HTTPClient._progress_callback.add_query_signal.emit(query_id, "Waiting for {}".format(self.url()), response)
 
-    def _notify_progress_end_query(cls, query_id):
+    def _notify_progress_end_query(self, query_id):
         """
         Called when a query is over
         """
 
+        query_progress = self._query_progress.pop(query_id, None)
         if not sip_is_deleted(HTTPClient._progress_callback):
+            if query_progress is not None:
+                HTTPClient._progress_callback.transfer_signal.emit(query_id, str(query_progress["sent"]), str(query_progress["received"]))
             HTTPClient._progress_callback.remove_query_signal.emit(query_id)
 
+    def _throttle_progress(self, query_id, direction, current, total):
+        """
+        Records the progress of a query.
+
+        :returns: True if the progress dialog must be notified
+        """
+
+        query_progress = self._query_progress.get(query_id)
+        if query_progress is None:
+            query_progress = self._query_progress[query_id] = {"sent": 0, "received": 0, "notified": 0}
+        query_progress[direction] = current
+
+        now = time.monotonic()
+        if current == total or now - query_progress["notified"] >= self.PROGRESS_INTERVAL:
+            query_progress["notified"] = now
+            return True
+        return False
+
     def _notify_progress_upload(self, query_id, sent, total):
         """
         Called when a query upload progress
         """
-        if not sip_is_deleted(HTTPClient._progress_callback):
+        if self._throttle_progress(query_id, "sent", sent, total) and not sip_is_deleted(HTTPClient._progress_callback):
             HTTPClient._progress_callback.progress_signal.emit(query_id, str(sent), str(total))
 
     def _notify_progress_download(self, query_id, sent, total):
         """
         Called when a query download progress
         """
-        if not sip_is_deleted(HTTPClient._progress_callback):
-            # abs() for maxium because sometimes the system send negative
-            # values
+        # abs() for maxium because sometimes the system send negative
+        # values
+        if self._throttle_progress(query_id, "received", sent, abs(total)) and not sip_is_deleted(HTTPClient._progress_callback):
             HTTPClient._progress_callback.progress_signal.emit(query_id, str(sent), str(abs(total)))
 
     @classmethod
@@ -273,6 +472,8 @@ class HTTPClient(QtCore.QObject):
                         params={},
                         networkManager=None,
                         eventsHandler=None,
+                        priority=INTERACTIVE,
+                        headers=None,
                         **kwargs):
         """
         Call the remote server, if not connected, check connection before
@@ -293,7 +494,10 @@ class HTTPClient(QtCore.QObject):
         :param eventsHandler: Handler receiving and triggering events like `updated`, `cancelled`.
                               If not specified and showProgress is `True` then `ProgressDialog` receives them.
         :param params: Query arguments parameters
-        :returns: QNetworkReply
+        :param priority: Priority class of the query (INTERACTIVE, BULK or BACKGROUND)
+        :param headers: Additional HTTP headers (dictionary)
+        :returns: QNetworkReply, None if the query is waiting to be sent
+        or False if the query has been dropped
         """
 
         if "dev" in __version__:
@@ -301,7 +505,7 @@ class HTTPClient(QtCore.QObject):
 
         # Shutdown in progress do not execute the query
         if self._shutdown:
-            return
+            return False
 
         # We try to detect computer hibernation
         # if time between two query is too long we trigger a disconnect
@@ -311,7 +515,7 @@ class HTTPClient(QtCore.QObject):
                 log.warning("Synchronisation lost with the server.")
                 self.disconnect()
                 self._last_query_timestamp = None
-                return
+                return False
             self._last_query_timestamp = now
 
         request = qpartial(self._executeHTTPQuery, method, path, qpartial(callback), body, context,
@@ -324,7 +528,13 @@ class HTTPClient(QtCore.QObject):
                            timeout=timeout,
                            prefix=prefix,
                            eventsHandler=eventsHandler,
-                           params=params)
+                           params=params,
+                           headers=headers)
+
+        # The streams are running until they are closed
+        # they don't take a slot in the scheduler
+        if downloadProgressCallback is None:
+            request = qpartial(self._scheduler.schedule, request, priority)
 
         if self._connected:
             return request()
@@ -505,7 +715,7 @@ class HTTPClient(QtCore.QObject):
             query_string += urllib.parse.urlencode(params)
         return query_string
 
-    def _executeHTTPQuery(self, method, path, callback, body, context={}, downloadProgressCallback=None, showProgress=True, ignoreErrors=False, progressText=None, server=None, timeout=120, prefix="/v2", params={}, networkManager=None, eventsHandler=None, **kwargs):
+    def _executeHTTPQuery(self, method, path, callback, body, context={}, downloadProgressCallback=None, showProgress=True, ignoreErrors=False, progressText=None, server=None, timeout=120, prefix="/v2", params={}, networkManager=None, eventsHandler=None, headers=None, **kwargs):
         """
         Call the remote server
 
@@ -524,6 +734,7 @@ class HTTPClient(QtCore.QObject):
         :param eventsHandler: Handler receiving and triggering events like `updated`, `cancelled`.
                       If not specified and showProgress is `True` then `ProgressDialog` receives them.
         :param params: Query arguments parameters
+        :param headers: Additional HTTP headers (dictionary)
         :returns: QNetworkReply
         """
 
@@ -540,6 +751,8 @@ class HTTPClient(QtCore.QObject):
         request = self._addAuth(request)
 
         request.setRawHeader(b"User-Agent", "GNS3 QT Client v{version}".format(version=__version__).encode())
+        for name, value in (headers or {}).items():
+            request.setRawHeader(name.encode(), value.encode())
 
         # By default QT doesn't support GET with body even if it's in the RFC that's why we need to use sendCustomRequest
         body = self._addBodyToRequest(body, request)
@@ -598,17 +811,11 @@ class HTTPClient(QtCore.QObject):
         content = bytes(response.readAll())
         content_type = response.header(QtNetwork.QNetworkRequest.ContentTypeHeader)
         if content_type == "application/json":
-            content = content.decode("utf-8")
-            if context["query_id"] in self._buffer:
-                content = self._buffer[context["query_id"]] + content
-            try:
-                while True:
-                    content = content.lstrip(" \r\n\t")
-                    answer, index = json.JSONDecoder().raw_decode(content)
-                    callback(answer, server=server, context=context)
-                    content = content[index:]
-            except ValueError:  # Partial JSON
-                self._buffer[context["query_id"]] = content
+            decoder = self._buffer.get(context["query_id"])
+            if decoder is None:
+                decoder = self._buffer[context["query_id"]] = JSONStreamDecoder()
+            for answer in decoder.feed(content):
+                callback(answer, server=server, context=context)
         else:
             callback(content, server=server, context=context)
 
@@ -646,6 +853,7 @@ class HTTPClient(QtCore.QObject):
 
             if "query_id" in context:
                 self._notify_progress_end_query(context["query_id"])
+                self._buffer.pop(context["query_id"], None)
 
             if error_code < 200 or error_code == 403:
                 if error_code == QtNetwork.QNetworkReply.OperationCanceledError:  # It's legit to cancel do not disconnect
@@ -689,6 +897,7 @@ class HTTPClient(QtCore.QObject):
 
         if "query_id" in context:
             self._notify_progress_end_query(context["query_id"])
+            self._buffer.pop(context["query_id"], None)
 
         if response.error() == QtNetwork.QNetworkReply.NoError:
             status = response.attribute(QtNetwork.QNetworkRequest.HttpStatusCodeAttribute)
@@ -712,7 +921,7 @@ class HTTPClient(QtCore.QObject):
                 if status >= 400:
                     callback(params, error=True, server=server, context=context)
                 else:
-                    callback(params, server=server, context=context, raw_body=raw_body)
+                    callback(params, server=server, context=context, raw_body=raw_body, headers=self._responseHeaders(response), status=status)
             if status == 400:
                 try:
                     params = json.loads(body)
@@ -723,6 +932,15 @@ class HTTPClient(QtCore.QObject):
                     e = HttpBadRequest(body)
                 raise e
 
+    @staticmethod
+    def _responseHeaders(response):
+        """
+        :param response: QNetworkReply
+        :returns: Dictionary of the response headers with lower case names
+        """
+
+        return {bytes(name).decode("latin-1").lower(): bytes(value).decode("latin-1") for name, value in response.rawHeaderPairs()}
+
     def getSynchronous(self, endpoint, timeout=2):
         """
         Synchronous check if a server is running
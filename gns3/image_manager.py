@@ -104,9 +104,11 @@ class ImageManager:
                         return source_path
 
                     worker = FileCopyWorker(source_path, destination_path)
-                    progress_dialog = ProgressDialog(worker, 'Image', 'Copying {}'.format(source_filename), 'Cancel', busy=True, parent=parent)
+                    progress_dialog = ProgressDialog(worker, 'Image', 'Copying {}'.format(source_filename), 'Cancel', parent=parent)
                     progress_dialog.show()
-                    progress_dialog.exec_()
+                    if not progress_dialog.exec_():
+                        # the copy has been cancelled
+                        return source_path
                     errors = progress_dialog.errors()
                     if errors:
                         QtWidgets.QMessageBox.critical(parent, 'Image', '{}'.format(''.join(errors)))
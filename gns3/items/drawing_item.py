@@ -83,7 +83,11 @@ class DrawingItem:
         if error:
             log.error("Error while setting up drawing: {}".format(result["message"]))
             return False
-        self._id = result["drawing_id"]
+        if self._id != result["drawing_id"]:
+            old_drawing_id = self._id
+            self._id = result["drawing_id"]
+            from ..topology import Topology
+            Topology.instance().updateDrawingIndex(self, old_drawing_id)
         self.updateDrawingCallback(result)
 
     def updateDrawing(self):
@@ -169,9 +173,13 @@ class DrawingItem:
         if self.zValue() < 0:
             self.setFlag(self.ItemIsSelectable, False)
             self.setFlag(self.ItemIsMovable, False)
+            # background drawings rarely change, keep them rendered
+            # for the current zoom until they are updated
+            self.setCacheMode(self.DeviceCoordinateCache)
         else:
             self.setFlag(self.ItemIsSelectable, True)
             self.setFlag(self.ItemIsMovable, True)
+            self.setCacheMode(self.NoCache)
 
     def delete(self, skip_controller=False):
         """
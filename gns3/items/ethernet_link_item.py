@@ -21,8 +21,6 @@ Graphical representation of an Ethernet link for QGraphicsScene.
 
 from ..qt import QtCore, QtGui, QtWidgets
 from .link_item import LinkItem
-from .note_item import NoteItem
-from ..ports.port import Port
 
 
 class EthernetLinkItem(LinkItem):
@@ -41,8 +39,6 @@ class EthernetLinkItem(LinkItem):
     def __init__(self, source_item, source_port, destination_item, destination_port, link=None, adding_flag=False):
 
         super().__init__(source_item, source_port, destination_item, destination_port, link, adding_flag)
-        self._source_collision_offset = 0.0
-        self._destination_collision_offset = 0.0
 
     def adjust(self):
         """
@@ -50,11 +46,9 @@ class EthernetLinkItem(LinkItem):
         """
 
         LinkItem.adjust(self)
-
-        if self._hovered:
-            self.setPen(QtGui.QPen(QtCore.Qt.red, self._pen_width + 1, QtCore.Qt.SolidLine, QtCore.Qt.RoundCap, QtCore.Qt.RoundJoin))
-        else:
-            self.setPen(QtGui.QPen(QtCore.Qt.black, self._pen_width, QtCore.Qt.SolidLine, QtCore.Qt.RoundCap, QtCore.Qt.RoundJoin))
+        self._setLinkPen(QtCore.Qt.black)
+        if not self._geometry_changed:
+            return
 
         # draw a line between nodes
         path = QtGui.QPainterPath(self.source)
@@ -66,6 +60,62 @@ class EthernetLinkItem(LinkItem):
             self.edge_offset = QtCore.QPointF(0, 0)
         else:
             self.edge_offset = QtCore.QPointF((self.dx * 40) / self.length, (self.dy * 40) / self.length)
+        self._layoutStatusPoints()
+        self._drawSymbol()
+
+    def _layoutStatusPoints(self):
+        """
+        Computes the position of the status points, they are moved
+        along the link until they don't collide with the nodes.
+        """
+
+        self._source_collision_offset = 0.0
+        self._destination_collision_offset = 0.0
+        if self._adding_flag or self.length == 0:
+            self._source_point = self.source
+            self._destination_point = self.destination
+            return
+
+        direction = QtCore.QPointF(self.dx / self.length, self.dy / self.length)
+        self._source_collision_offset = self._collisionOffset(self._source_item, self.source + self.edge_offset, direction)
+        self._source_point = self.source + self.edge_offset + direction * self._source_collision_offset
+        self._destination_collision_offset = self._collisionOffset(self._destination_item, self.destination - self.edge_offset, direction * -1)
+        self._destination_point = self.destination - self.edge_offset - direction * self._destination_collision_offset
+
+    def _collisionOffset(self, node_item, origin, direction):
+        """
+        Returns how far a status point must be moved from its origin to
+        be outside of a node. The distance is found by bisection between
+        the last offset inside the node and the first offset outside.
+
+        :param node_item: NodeItem instance
+        :param origin: position of the status point without collision
+        :param direction: unit vector of the move
+        :returns: offset in pixels
+        """
+
+        def inside(offset):
+            return node_item.contains(self.mapToItem(node_item, origin + direction * offset))
+
+        if not inside(0):
+            return 0.0
+
+        low = 0.0
+        high = 10.0
+        while inside(high):
+            low = high
+            high *= 2
+            if high >= self.length:
+                return self.length
+
+        while high - low > 1.0:
+            middle = (low + high) / 2
+            if inside(middle):
+                low = middle
+            else:
+                high = middle
+        # keep the whole point outside of the node
+        return high + self._point_size / 2
 
     def shape(self):
         """
@@ -76,23 +126,9 @@ class EthernetLinkItem(LinkItem):
 
         path = QtWidgets.QGraphicsPathItem.shape(self)
         offset = self._point_size / 2
-        if not self._adding_flag:
-            if self.length:
-                collision_offset = QtCore.QPointF((self.dx * self._source_collision_offset) / self.length, (self.dy * self._source_collision_offset) / self.length)
-            else:
-                collision_offset = QtCore.QPointF(0, 0)
-            point = self.source + (self.edge_offset + collision_offset)
-        else:
-            point = self.source
+        point = self._source_point
         path.addEllipse(point.x() - offset, point.y() - offset, self._point_size, self._point_size)
-        if not self._adding_flag:
-            if self.length:
-                collision_offset = QtCore.QPointF((self.dx * self._destination_collision_offset) / self.length, (self.dy * self._destination_collision_offset) / self.length)
-            else:
-                collision_offset = QtCore.QPointF(0, 0)
-            point = self.destination - (self.edge_offset + collision_offset)
-        else:
-            point = self.destination
+        point = self._destination_point
         path.addEllipse(point.x() - offset, point.y() - offset, self._point_size, self._point_size)
         return path
 
@@ -108,90 +144,18 @@ class EthernetLinkItem(LinkItem):
         QtWidgets.QGraphicsPathItem.paint(self, painter, option, widget)
         if not self._adding_flag and self._settings["draw_link_status_points"]:
 
+            # points disappears at low zoom
+            if self._main_window.uiGraphicsView.levelOfDetail(painter) != self._main_window.uiGraphicsView.LOD_FULL:
+                return
+
             # points disappears if nodes are too close to each others.
             if self.length < 100:
                 return
 
-            if self._link.suspended() or self._source_port.status() == Port.suspended:
-                # link or port is suspended
-                color = QtCore.Qt.yellow
-                shape = QtCore.Qt.RoundCap
-            elif self._source_port.status() == Port.started:
-                # port is active
-                color = QtCore.Qt.green
-                shape = QtCore.Qt.RoundCap
-            else:
-                color = QtCore.Qt.red
-                shape = QtCore.Qt.SquareCap
-
-            painter.setPen(QtGui.QPen(color, self._point_size, QtCore.Qt.SolidLine, shape, QtCore.Qt.MiterJoin))
-            point1 = QtCore.QPointF(self.source + self.edge_offset) + QtCore.QPointF((self.dx * self._source_collision_offset) / self.length, (self.dy * self._source_collision_offset) / self.length)
-
-            # avoid any collision of the status point with the source node
-            while self._source_item.contains(self.mapFromScene(self.mapToItem(self._source_item, point1))):
-                self._source_collision_offset += 10
-                point1 = QtCore.QPointF(self.source + self.edge_offset) + QtCore.QPointF((self.dx * self._source_collision_offset) / self.length, (self.dy * self._source_collision_offset) / self.length)
+            painter.setPen(self._statusPointPen(self._source_port))
+            self._updatePortLabel(self._source_port, self._source_item, self._source_point)
+            painter.drawPoint(self._source_point)
 
-            # check with we can paint the status point more closely of the source node
-            if not self._source_item.contains(self.mapFromScene(self.mapToItem(self._source_item, point1))):
-                check_point = QtCore.QPointF(self.source + self.edge_offset) + QtCore.QPointF((self.dx * (self._source_collision_offset - 20)) / self.length, (self.dy * (self._source_collision_offset - 20)) / self.length)
-                if not self._source_item.contains(self.mapFromScene(self.mapToItem(self._source_item, check_point))) and self._source_collision_offset > 0:
-                    self._source_collision_offset -= 10
-
-            source_port_label = self._source_port.label()
-
-            if source_port_label is None:
-                source_port_label = NoteItem(self._source_item)
-                source_port_label.setPlainText(self._source_port.shortName())
-                source_port_label.setPos(self.mapToItem(self._source_item, point1))
-                self._source_port.setLabel(source_port_label)
-
-            if self._draw_port_labels:
-                source_port_label.show()
-            else:
-                source_port_label.hide()
-
-            painter.drawPoint(point1)
-
-            if self._link.suspended() or self._destination_port.status() == Port.suspended:
-                # link or port is suspended
-                color = QtCore.Qt.yellow
-                shape = QtCore.Qt.RoundCap
-            elif self._destination_port.status() == Port.started:
-                # port is active
-                color = QtCore.Qt.green
-                shape = QtCore.Qt.RoundCap
-            else:
-                color = QtCore.Qt.red
-                shape = QtCore.Qt.SquareCap
-
-            painter.setPen(QtGui.QPen(color, self._point_size, QtCore.Qt.SolidLine, shape, QtCore.Qt.MiterJoin))
-            point2 = QtCore.QPointF(self.destination - self.edge_offset) - QtCore.QPointF((self.dx * self._destination_collision_offset) / self.length, (self.dy * self._destination_collision_offset) / self.length)
-
-            # avoid any collision of the status point with the destination node
-            while self._destination_item.contains(self.mapFromScene(self.mapToItem(self._destination_item, point2))):
-                self._destination_collision_offset += 10
-                point2 = QtCore.QPointF(self.destination - self.edge_offset) - QtCore.QPointF((self.dx * self._destination_collision_offset) / self.length, (self.dy * self._destination_collision_offset) / self.length)
-
-            # check with we can paint the status point more closely of the destination node
-            if not self._destination_item.contains(self.mapFromScene(self.mapToItem(self._destination_item, point2))):
-                check_point = QtCore.QPointF(self.destination - self.edge_offset) - QtCore.QPointF((self.dx * (self._destination_collision_offset - 20)) / self.length, (self.dy * (self._destination_collision_offset - 20)) / self.length)
-                if not self._destination_item.contains(self.mapFromScene(self.mapToItem(self._destination_item, check_point))) and self._destination_collision_offset > 0:
-                    self._destination_collision_offset -= 10
-
-            destination_port_label = self._destination_port.label()
-
-            if destination_port_label is None:
-                destination_port_label = NoteItem(self._destination_item)
-                destination_port_label.setPlainText(self._destination_port.shortName())
-                destination_port_label.setPos(self.mapToItem(self._destination_item, point2))
-                self._destination_port.setLabel(destination_port_label)
-
-            if self._draw_port_labels:
-                destination_port_label.show()
-            else:
-                destination_port_label.hide()
-
-            painter.drawPoint(point2)
-
-        self._drawSymbol()
+            painter.setPen(self._statusPointPen(self._destination_port))
+            self._updatePortLabel(self._destination_port, self._destination_item, self._destination_point)
+            painter.drawPoint(self._destination_point)
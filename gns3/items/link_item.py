@@ -25,6 +25,8 @@ from ..qt import QtCore, QtGui, QtWidgets, QtSvg, qslot
 
 from ..packet_capture import PacketCapture
 from ..dialogs.filter_dialog import FilterDialog
+from ..ports.port import Port
+from .note_item import NoteItem
 
 
 class SvgIconItem(QtSvg.QGraphicsSvgItem):
@@ -55,6 +57,9 @@ class LinkItem(QtWidgets.QGraphicsPathItem):
     _draw_port_labels = False
     delete_link_item_signal = QtCore.pyqtSignal(str)
 
+    # pens shared by all the link items
+    _pens = {}
+
     def __init__(self, source_item, source_port, destination_item, destination_port, link=None, adding_flag=False):
 
         super().__init__()
@@ -85,6 +90,10 @@ class LinkItem(QtWidgets.QGraphicsPathItem):
         # indicates if the link is being hovered
         self._hovered = False
 
+        # geometry used for the last layout of the link
+        self._geometry = None
+        self._geometry_changed = True
+
         # QGraphicsSvgItem to indicate a capture
         self._capturing_item = None
         # QGraphicsSvgItem to indicate a filter is applied
@@ -393,7 +402,6 @@ class LinkItem(QtWidgets.QGraphicsPathItem):
             min_zvalue = min([self._source_item.zValue(), self._destination_item.zValue()])
             self.setZValue(min_zvalue - 0.5)
 
-        self.prepareGeometryChange()
         source_rect = self._source_item.boundingRect()
         self.source = self.mapFromItem(self._source_item, source_rect.width() / 2.0, source_rect.height() / 2.0)
 
@@ -401,6 +409,8 @@ class LinkItem(QtWidgets.QGraphicsPathItem):
         if not self._adding_flag:
             destination_rect = self._destination_item.boundingRect()
             self.destination = self.mapFromItem(self._destination_item, destination_rect.width() / 2.0, destination_rect.height() / 2.0)
+        else:
+            destination_rect = None
 
         # compute vectors
         self.dx = self.destination.x() - self.source.x()
@@ -420,6 +430,86 @@ class LinkItem(QtWidgets.QGraphicsPathItem):
             self.source = QtCore.QPointF(self.source + offset)
             self.destination = QtCore.QPointF(self.destination + offset)
 
+        # the subclasses only compute the path and the status points
+        # again when the link or the nodes have changed
+        geometry = (self.source, self.destination, source_rect, destination_rect)
+        self._geometry_changed = geometry != self._geometry
+        if self._geometry_changed:
+            self.prepareGeometryChange()
+            self._geometry = geometry
+        else:
+            self.update()
+
+    @classmethod
+    def _pen(cls, color, width, cap=QtCore.Qt.RoundCap, join=QtCore.Qt.RoundJoin):
+        """
+        Returns a pen shared by all the link items.
+
+        :param color: pen color
+        :param width: pen width
+        :param cap: pen cap style
+        :param join: pen join style
+        :returns: QPen instance
+        """
+
+        key = (color, width, cap, join)
+        pen = cls._pens.get(key)
+        if pen is None:
+            pen = QtGui.QPen(color, width, QtCore.Qt.SolidLine, cap, join)
+            cls._pens[key] = pen
+        return pen
+
+    def _setLinkPen(self, color):
+        """
+        Sets the pen of the link, red when hovered.
+
+        :param color: color when the link is not hovered
+        """
+
+        if self._hovered:
+            pen = self._pen(QtCore.Qt.red, self._pen_width + 1)
+        else:
+            pen = self._pen(color, self._pen_width)
+        if self.pen() != pen:
+            self.setPen(pen)
+
+    def _statusPointPen(self, port):
+        """
+        Returns the pen for the status point of a port.
+
+        :param port: Port instance
+        :returns: QPen instance
+        """
+
+        if self._link.suspended() or port.status() == Port.suspended:
+            # link or port is suspended
+            return self._pen(QtCore.Qt.yellow, self._point_size, QtCore.Qt.RoundCap, QtCore.Qt.MiterJoin)
+        elif port.status() == Port.started:
+            # port is active
+            return self._pen(QtCore.Qt.green, self._point_size, QtCore.Qt.RoundCap, QtCore.Qt.MiterJoin)
+        return self._pen(QtCore.Qt.red, self._point_size, QtCore.Qt.SquareCap, QtCore.Qt.MiterJoin)
+
+    def _updatePortLabel(self, port, node_item, point):
+        """
+        Creates the label of a port the first time and shows or hides it.
+
+        :param port: Port instance
+        :param node_item: NodeItem instance of the port
+        :param point: initial position of the label
+        """
+
+        port_label = port.label()
+        if port_label is None:
+            port_label = NoteItem(node_item)
+            port_label.setPlainText(port.shortName())
+            port_label.setPos(self.mapToItem(node_item, point))
+            port.setLabel(port_label)
+
+        if self._draw_port_labels:
+            port_label.show()
+        else:
+            port_label.hide()
+
     def _computeMultiLink(self):
         # Multi-link management
         #
@@ -437,15 +527,12 @@ class LinkItem(QtWidgets.QGraphicsPathItem):
         elif not hasattr(self._destination_item, "node"):  # Could be temporary a qpointf during link creation
             multi = 0
         else:
-            multi = 0
-            link_items = self._source_item.links()
-            for link_item in link_items:
-                if link_item == self:
-                    break
-                if link_item.destinationItem().node().id() == self._destination_item.node().id():
-                    multi += 1
-                if link_item.sourceItem().node().id() == self._destination_item.node().id():
-                    multi += 1
+            # the links between the two nodes are indexed by the node items
+            link_items = self._source_item.linksTo(self._destination_item)
+            try:
+                multi = link_items.index(self)
+            except ValueError:
+                multi = len(link_items)
 
         # MAX 7 links on the scene between 2 nodes
         if multi > 7:
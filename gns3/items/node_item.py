@@ -22,7 +22,7 @@ Graphical representation of a node on the QGraphicsScene.
 import sip
 
 from ..qt import QtCore, QtGui, QtWidgets, QtSvg, qslot
-from ..qt.qimage_svg_renderer import QImageSvgRenderer
+from ..qt.qimage_svg_renderer import QImageSvgRendererPool
 from .note_item import NoteItem
 from ..symbol import Symbol
 from ..controller import Controller
@@ -50,6 +50,8 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
         self._node = node
         # link items connected to this node item.
         self._links = []
+        # link items to each connected node item in the order they have been added
+        self._links_by_node_item = {}
         self._symbol = None
 
         # says if the attached node has been initialized
@@ -63,9 +65,7 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
         self.setZValue(self._node.z())
 
         # Temporary symbol during loading
-        renderer = QImageSvgRenderer(":/icons/reload.svg")
-        renderer.setObjectName("symbol_loading")
-        self.setSharedRenderer(renderer)
+        self.setSharedRenderer(QImageSvgRendererPool.instance().renderer(":/icons/reload.svg"))
 
         effect = QtWidgets.QGraphicsColorizeEffect()
         effect.setColor(QtGui.QColor("black"))
@@ -132,9 +132,7 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
             self._symbol = symbol
 
             # Temporary symbol during loading
-            renderer = QImageSvgRenderer(":/icons/reload.svg")
-            renderer.setObjectName("symbol_loading")
-            self.setSharedRenderer(renderer)
+            self.setSharedRenderer(QImageSvgRendererPool.instance().renderer(":/icons/reload.svg"))
 
             Controller.instance().getStatic(Symbol(symbol_id=symbol).url(), self._symbolLoadedCallback)
 
@@ -143,9 +141,8 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
 
     @qslot
     def _symbolLoadedCallback(self, path, *args):
-        renderer = QImageSvgRenderer(path, fallback=":/icons/cancel.svg")
-        renderer.setObjectName(path)
-        self.setSharedRenderer(renderer)
+        # The items with the same symbol share the same renderer
+        self.setSharedRenderer(QImageSvgRendererPool.instance().renderer(path, fallback=":/icons/cancel.svg"))
         if self._node.settings().get("symbol") != self._symbol:
             self.updateNode()
         if not self._initialized:
@@ -177,6 +174,11 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
 
         if not sip.isdeleted(link_item):
             self._links.append(link_item)
+            if link_item.sourceItem() is self:
+                node_item = link_item.destinationItem()
+            else:
+                node_item = link_item.sourceItem()
+            self._links_by_node_item.setdefault(node_item, []).append(link_item)
             link_item.link().delete_link_signal.connect(self._removeLink)
             link_item.link().updated_link_signal.connect(self._linkUpdatedSlot)
             self._node.updated_signal.emit()
@@ -199,6 +201,12 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
         for link_item in self._links:
             if link_item.link().id() == link_id:
                 self._links.remove(link_item)
+                for node_item, link_items in self._links_by_node_item.items():
+                    if link_item in link_items:
+                        link_items.remove(link_item)
+                        if not link_items:
+                            del self._links_by_node_item[node_item]
+                        break
                 return
 
     def links(self):
@@ -210,6 +218,16 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
 
         return self._links
 
+    def linksTo(self, node_item):
+        """
+        Returns the link items between this node item and another one.
+
+        :param node_item: NodeItem instance
+        :returns: list of LinkItem instances in the order they have been added
+        """
+
+        return self._links_by_node_item.get(node_item, [])
+
     @qslot
     def createdSlot(self, base_node_id, *args):
         """
@@ -470,10 +488,10 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
                 self.graphicsEffect().setEnabled(False)
                 self.updateNode()
 
-        # adjust link item positions when this node is moving or has changed.
-        if change == QtWidgets.QGraphicsItem.ItemPositionChange or change == QtWidgets.QGraphicsItem.ItemPositionHasChanged:
-            for link in self._links:
-                link.adjust()
+        # adjust link item positions when this node has moved, the view
+        # adjusts them only once per mouse move when several nodes are dragged.
+        if change == QtWidgets.QGraphicsItem.ItemPositionHasChanged:
+            self._main_window.uiGraphicsView.adjustLinks(self._links)
 
         return super().itemChange(change, value)
 
@@ -486,10 +504,32 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
         :param widget: QWidget instance
         """
 
+        # at low zoom the symbol is replaced by a pixmap or a simple glyph
+        view = self._main_window.uiGraphicsView
+        level_of_detail = view.levelOfDetail(painter)
+        if level_of_detail == view.LOD_GLYPH:
+            painter.fillRect(self.boundingRect(), QtCore.Qt.darkGray)
+            return
+        if level_of_detail == view.LOD_PIXMAP:
+            pixmap = self._symbolPixmap()
+            if pixmap is not None:
+                painter.drawPixmap(self.boundingRect(), pixmap, QtCore.QRectF(pixmap.rect()))
+                self._paintStatusIndicator(painter)
+                return
+
         # don't show the selection rectangle
         if not self._settings["draw_rectangle_selected_item"]:
             option.state = QtWidgets.QStyle.State_None
         super().paint(painter, option, widget)
+        self._paintStatusIndicator(painter)
+
+    def _paintStatusIndicator(self, painter):
+        """
+        Paints the initialization or error indicator, or the
+        Z value when the layers are shown.
+
+        :param painter: QPainter instance
+        """
 
         if not self._initialized or self.show_layer:
             brect = self.boundingRect()
@@ -506,6 +546,31 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
                 text = "S"  # initialization
             painter.drawText(QtCore.QPointF(center.x() - 4, center.y() + 4), text)
 
+    def _symbolPixmap(self):
+        """
+        Returns the symbol rendered in a pixmap at the highest zoom using
+        pixmaps. The pixmap is shared by the items with the same symbol.
+
+        :returns: QPixmap instance or None if the symbol is empty
+        or doesn't come from the renderer pool
+        """
+
+        renderer = self.renderer()
+        size = (self.boundingRect().size() * self._settings["level_of_detail_pixmap_zoom"]).toSize()
+        if size.isEmpty() or renderer.digest() is None:
+            return None
+        # keyed on the content, an id can be reused by another renderer
+        key = "node_symbol_{}_{}x{}".format(renderer.digest(), size.width(), size.height())
+        pixmap = QtGui.QPixmapCache.find(key)
+        if pixmap is None:
+            pixmap = QtGui.QPixmap(size)
+            pixmap.fill(QtCore.Qt.transparent)
+            pixmap_painter = QtGui.QPainter(pixmap)
+            renderer.render(pixmap_painter)
+            pixmap_painter.end()
+            QtGui.QPixmapCache.insert(key, pixmap)
+        return pixmap
+
     def setZValue(self, value):
         """
         Sets a new Z value.
@@ -40,6 +40,7 @@ class NoteItem(QtWidgets.QGraphicsTextItem):
         from ..main_window import MainWindow
 
         main_window = MainWindow.instance()
+        self._graphics_view = main_window.uiGraphicsView
         view_settings = main_window.uiGraphicsView.settings()
         qt_font = QtGui.QFont()
         qt_font.fromString(view_settings["default_label_font"])
@@ -156,6 +157,10 @@ class NoteItem(QtWidgets.QGraphicsTextItem):
         :param widget: QWidget instance
         """
 
+        # the node and port labels are not painted at low zoom
+        if self.parentItem() and self._graphics_view.levelOfDetail(painter) != self._graphics_view.LOD_FULL:
+            return
+
         super().paint(painter, option, widget)
 
         if self.show_layer is False or self.parentItem():
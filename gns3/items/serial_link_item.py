@@ -22,8 +22,6 @@ Graphical representation of a Serial link on the QGraphicsScene.
 import math
 from ..qt import QtCore, QtGui, QtWidgets
 from .link_item import LinkItem
-from .note_item import NoteItem
-from ..ports.port import Port
 
 
 class SerialLinkItem(LinkItem):
@@ -49,11 +47,9 @@ class SerialLinkItem(LinkItem):
         """
 
         LinkItem.adjust(self)
-
-        if self._hovered:
-            self.setPen(QtGui.QPen(QtCore.Qt.red, self._pen_width + 1, QtCore.Qt.SolidLine, QtCore.Qt.RoundCap, QtCore.Qt.RoundJoin))
-        else:
-            self.setPen(QtGui.QPen(QtCore.Qt.darkRed, self._pen_width, QtCore.Qt.SolidLine, QtCore.Qt.RoundCap, QtCore.Qt.RoundJoin))
+        self._setLinkPen(QtCore.Qt.darkRed)
+        if not self._geometry_changed:
+            return
 
         # get source to destination angle
         vector_angle = math.atan2(self.dy, self.dx)
@@ -80,6 +76,7 @@ class SerialLinkItem(LinkItem):
 
         self.source_point = QtCore.QPointF(self.source.x() + scale_vect.x() / scale_coef, self.source.y() + scale_vect.y() / scale_coef)
         self.destination_point = QtCore.QPointF(self.destination.x() - scale_vect.x() / scale_coef, self.destination.y() - scale_vect.y() / scale_coef)
+        self._drawSymbol()
 
     def shape(self):
         """
@@ -109,67 +106,18 @@ class SerialLinkItem(LinkItem):
 
         if not self._adding_flag and self._settings["draw_link_status_points"]:
 
+            # points disappears at low zoom
+            if self._main_window.uiGraphicsView.levelOfDetail(painter) != self._main_window.uiGraphicsView.LOD_FULL:
+                return
+
             # points disappears if nodes are too close to each others.
             if self.length < 80:
                 return
 
-            # source point color
-            if self._link.suspended() or self._source_port.status() == Port.suspended:
-                # link or port is suspended
-                shape = QtCore.Qt.RoundCap
-                color = QtCore.Qt.yellow
-            elif self._source_port.status() == Port.started:
-                # port is active
-                shape = QtCore.Qt.RoundCap
-                color = QtCore.Qt.green
-            else:
-                shape = QtCore.Qt.SquareCap
-                color = QtCore.Qt.red
-
-            painter.setPen(QtGui.QPen(color, self._point_size, QtCore.Qt.SolidLine, shape, QtCore.Qt.MiterJoin))
-
-            source_port_label = self._source_port.label()
-            if source_port_label is None:
-                source_port_label = NoteItem(self._source_item)
-                source_port_label.setPlainText(self._source_port.shortName())
-                source_port_label.setPos(self.mapToItem(self._source_item, self.source))
-                self._source_port.setLabel(source_port_label)
-
-            if self._draw_port_labels:
-                source_port_label.show()
-            else:
-                source_port_label.hide()
-
+            painter.setPen(self._statusPointPen(self._source_port))
+            self._updatePortLabel(self._source_port, self._source_item, self.source)
             painter.drawPoint(self.source_point)
 
-            # destination point color
-            if self._link.suspended() or self._destination_port.status() == Port.suspended:
-                # link or port is suspended
-                color = QtCore.Qt.yellow
-                shape = QtCore.Qt.RoundCap
-            elif self._destination_port.status() == Port.started:
-                # port is active
-                color = QtCore.Qt.green
-                shape = QtCore.Qt.RoundCap
-            else:
-                color = QtCore.Qt.red
-                shape = QtCore.Qt.SquareCap
-
-            painter.setPen(QtGui.QPen(color, self._point_size, QtCore.Qt.SolidLine, shape, QtCore.Qt.MiterJoin))
-
-            destination_port_label = self._destination_port.label()
-
-            if destination_port_label is None:
-                destination_port_label = NoteItem(self._destination_item)
-                destination_port_label.setPlainText(self._destination_port.shortName())
-                destination_port_label.setPos(self.mapToItem(self._destination_item, self.destination))
-                self._destination_port.setLabel(destination_port_label)
-
-            if self._draw_port_labels:
-                destination_port_label.show()
-            else:
-                destination_port_label.hide()
-
+            painter.setPen(self._statusPointPen(self._destination_port))
+            self._updatePortLabel(self._destination_port, self._destination_item, self.destination)
             painter.drawPoint(self.destination_point)
-
-        self._drawSymbol()
@@ -238,7 +238,11 @@ class Link(QtCore.QObject):
         self._destination_port.setDestinationNode(self._source_node)
         self._destination_port.setDestinationPort(self._source_port)
 
-        self._link_id = result["link_id"]
+        if self._link_id != result["link_id"]:
+            old_link_id = self._link_id
+            self._link_id = result["link_id"]
+            from .topology import Topology
+            Topology.instance().updateLinkIndex(self, old_link_id)
         self._parseResponse(result)
 
     def link_id(self):
@@ -27,6 +27,7 @@ from .qt import QtCore, QtWidgets, qslot
 from .version import __version__
 from .utils import parse_version
 from .controller import Controller
+from .http_client import HTTPClient
 
 import logging
 log = logging.getLogger(__name__)
@@ -144,7 +145,7 @@ class LocalConfig(QtCore.QObject):
         controller = Controller.instance()
         if controller.connected():
             self._refreshingSettings = True
-            controller.get("/settings", self._getSettingsCallback, showProgress=False)
+            controller.get("/settings", self._getSettingsCallback, showProgress=False, priority=HTTPClient.BACKGROUND)
         self._monitorChanges()
 
     def _getSettingsCallback(self, result, error=False, **kwargs):
@@ -103,6 +103,8 @@ class LocalServer(QtCore.QObject):
             self._http_client = None
 
         self._stopping = False
+        # Seconds waited for the local server to be ready
+        self._time_to_ready = None
         self._timer = QtCore.QTimer()
         self._timer.setInterval(5000)
         self._timer.timeout.connect(self._checkLocalServerRunningSlot)
@@ -318,7 +320,8 @@ class LocalServer(QtCore.QObject):
             Controller.instance().setHttpClient(self._http_client)
             return
 
-        if self.isLocalServerRunning() and self._server_started_by_me:
+        server_running = self.isLocalServerRunning()
+        if server_running and self._server_started_by_me:
             return True
 
         # We check if two gui are not launched at the same time
@@ -329,13 +332,14 @@ class LocalServer(QtCore.QObject):
             Controller.instance().setHttpClient(self._http_client)
             return True
 
-        if self.isLocalServerRunning():
+        if server_running:
             log.debug("A local server already running on this host")
             # Try to kill the server. The server can be still running after
             # if the server was started by hand
             self._killAlreadyRunningServer()
+            server_running = self.isLocalServerRunning()
 
-        if not self.isLocalServerRunning():
+        if not server_running:
             if not self.initLocalServer():
                 QtWidgets.QMessageBox.critical(self.parent(), "Local server", "Could not start the local server process: {}".format(self._settings["path"]))
                 return False
@@ -344,14 +348,20 @@ class LocalServer(QtCore.QObject):
                 return False
 
         if self.parent():
-            worker = WaitForConnectionWorker(self._settings["host"], self._port)
+            # the worker doesn't block, it runs in the event loop of the dialog
+            worker = WaitForConnectionWorker(self._settings["host"],
+                                             self._port,
+                                             protocol=self._settings["protocol"],
+                                             user=self._settings["user"],
+                                             password=self._settings["password"])
             progress_dialog = ProgressDialog(worker,
                                              "Local server",
                                              "Connecting to server {} on port {}...".format(self._settings["host"], self._port),
-                                             "Cancel", busy=True, parent=self.parent())
+                                             "Cancel", busy=True, parent=self.parent(), create_thread=False, cancelable=True)
             progress_dialog.show()
             if not progress_dialog.exec_():
                 return False
+            self._time_to_ready = worker.timeToReady()
         self._server_started_by_me = True
         self._http_client = HTTPClient(self._settings)
         Controller.instance().setHttpClient(self._http_client)
@@ -505,6 +515,15 @@ class LocalServer(QtCore.QObject):
             pass
         return False
 
+    def timeToReady(self):
+        """
+        Returns how long the local server took to be ready after its start.
+
+        :returns: seconds or None if the server was not started by the GUI
+        """
+
+        return self._time_to_ready
+
     def isLocalServerRunning(self):
         """
         Synchronous check if a server is already running on this host.
@@ -611,7 +611,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         :param show_grid: boolean
         :return: None
         """
-        self.uiGraphicsView.viewport().update()
+        self.uiGraphicsView.invalidateBackgroundCache()
 
     def snapToGrid(self, snap_to_grid):
         """
@@ -249,9 +249,9 @@ class IOSRouterPreferencesPage(QtWidgets.QWidget, Ui_IOSRouterPreferencesPageWid
                 progress_dialog = ProgressDialog(worker,
                                                  "IOS image",
                                                  "Decompressing IOS image {}...".format(os.path.basename(path)),
-                                                 "Cancel", busy=True, parent=parent)
+                                                 "Cancel", parent=parent)
                 progress_dialog.show()
-                if progress_dialog.exec_() is not False:
+                if progress_dialog.exec_():
                     path = decompressed_image_path
 
         path = ImageManager.instance().askCopyUploadImage(parent, path, server, "DYNAMIPS")
@@ -321,9 +321,9 @@ class IOSRouterPreferencesPage(QtWidgets.QWidget, Ui_IOSRouterPreferencesPageWid
             progress_dialog = ProgressDialog(worker,
                                              "IOS image",
                                              "Decompressing IOS image {}...".format(path),
-                                             "Cancel", busy=True, parent=self)
+                                             "Cancel", parent=self)
             progress_dialog.show()
-            if progress_dialog.exec_() is not False:
+            if progress_dialog.exec_():
                 ios_router["image"] = decompressed_image_path
                 self._refreshInfo(ios_router)
 
@@ -15,11 +15,67 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import os
+import io
 import mmap
 import zipfile
-import shutil
-import tempfile
+
+# ZIP 'end of central directory' signature and record size
+END_OF_CENTRAL_DIRECTORY = b"\x50\x4b\x05\x06"
+END_OF_CENTRAL_DIRECTORY_SIZE = 22
+CHUNK_SIZE = 1024 * 1024
+
+
+class _MappedFile(io.RawIOBase):
+    """
+    Read only file object on the beginning of a mapped file,
+    used to open the ZIP archive without copying the image.
+
+    :param mapped_file: mmap object
+    :param size: size of the file object
+    """
+
+    def __init__(self, mapped_file, size):
+
+        super().__init__()
+        self._mapped_file = mapped_file
+        self._size = size
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+        self._position = max(0, offset)
+        return self._position
+
+    def read(self, size=-1):
+
+        if size is None or size < 0:
+            end = self._size
+        else:
+            end = min(self._size, self._position + size)
+        if end <= self._position:
+            return b""
+        data = self._mapped_file[self._position:end]
+        self._position = end
+        return data
+
+    def readinto(self, buffer):
+
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
 
 
 def isIOSCompressed(ios_image):
@@ -32,65 +88,69 @@ def isIOSCompressed(ios_image):
     :returns: boolean
     """
 
-    fd = open(ios_image, "r+b")
-    mapped_file = mmap.mmap(fd.fileno(), 0)
-
-    # look for ZIP 'end of central directory' signature
-    pos = mapped_file.rfind(b"\x50\x4b\x05\x06")
+    with open(ios_image, "rb") as fd:
+        with mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
 
-    # look for another ZIP 'end of central directory' signature
-    # if we find one it means the IOS image itself contains zipped files
-    multiple_zipped_files = mapped_file.find(b"\x50\x4b\x05\x06", 0, pos)
+            # look for ZIP 'end of central directory' signature
+            pos = mapped_file.rfind(END_OF_CENTRAL_DIRECTORY)
 
-    # let's find the 'CISCO SYSTEMS' string between our last signature and the end of our file
-    # so we can know the IOS image is compressed even if there are other ZIP signatures in our file
-    cisco_string = mapped_file.find(b"\x43\x49\x53\x43\x4F\x20\x53\x59\x53\x54\x45\x4D\x53", pos + 4)
+            # look for another ZIP 'end of central directory' signature
+            # if we find one it means the IOS image itself contains zipped files
+            multiple_zipped_files = mapped_file.find(END_OF_CENTRAL_DIRECTORY, 0, pos)
 
-    mapped_file.close()
-    fd.close()
+            # let's find the 'CISCO SYSTEMS' string between our last signature and the end of our file
+            # so we can know the IOS image is compressed even if there are other ZIP signatures in our file
+            cisco_string = mapped_file.find(b"\x43\x49\x53\x43\x4F\x20\x53\x59\x53\x54\x45\x4D\x53", pos + 4)
 
     if pos > 0 and not (multiple_zipped_files > 0 and not cisco_string > 0):
         return True
     return False
 
 
-def decompressIOS(ios_image, destination_file):
+def decompressIOS(ios_image, destination_file, progress_callback=None, is_cancelled=None):
     """
     Decompress an IOS image.
 
+    The image is read through a memory map and the ZIP archive
+    ends at the last 'end of central directory' record, the data
+    after it is ignored. The members are streamed to the destination.
+
     :param ios_image: IOS image path
     :param destination_file: destination path for the decompressed IOS image
+    :param progress_callback: called with the number of decompressed bytes and the total
+    :param is_cancelled: called before each chunk, the decompression stops if it returns True
+    :returns: False if the decompression has been cancelled
     """
 
-    # we don't touch the original image
-    tmp_fd = tempfile.NamedTemporaryFile(delete=False)
-    shutil.copyfile(ios_image, tmp_fd.name)
-    data = tmp_fd.read()
-
-    # look for ZIP 'end of central directory' signature
-    pos = data.rfind(b"\x50\x4b\x05\x06")
-    if pos > 0:
-        # size of 'ZIP end of central directory record'
-        tmp_fd.seek(pos + 22)
-        # this make a clean zipped file
-        tmp_fd.truncate()
-
-    # decompress the IOS image
-    is_zipfile = zipfile.is_zipfile(tmp_fd.name)
-    if is_zipfile:
-        zip_file = zipfile.ZipFile(tmp_fd.name, "r")
-        for member in zip_file.namelist():
-            source = zip_file.open(member)
-            target = open(destination_file, "wb")
-            shutil.copyfileobj(source, target)
-            source.close()
-            target.close()
-        zip_file.close()
-    try:
-        tmp_fd.close()
-        os.remove(tmp_fd.name)
-    except OSError:
-        pass
+    with open(ios_image, "rb") as fd:
+        with mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            size = len(mapped_file)
+            pos = mapped_file.rfind(END_OF_CENTRAL_DIRECTORY)
+            if pos > 0:
+                # this make a clean zipped file
+                size = min(size, pos + END_OF_CENTRAL_DIRECTORY_SIZE)
+
+            zip_data = _MappedFile(mapped_file, size)
+            if not zipfile.is_zipfile(zip_data):
+                return True
+            with zipfile.ZipFile(zip_data, "r") as zip_file:
+                members = zip_file.infolist()
+                total = sum(member.file_size for member in members)
+                done = 0
+                for member in members:
+                    with zip_file.open(member) as source, open(destination_file, "wb") as target:
+                        while True:
+                            if is_cancelled and is_cancelled():
+                                return False
+                            buf = source.read(CHUNK_SIZE)
+                            if not buf:
+                                break
+                            target.write(buf)
+                            done += len(buf)
+                            if progress_callback:
+                                progress_callback(done, total)
+    return True
+
 
 if __name__ == '__main__':
 
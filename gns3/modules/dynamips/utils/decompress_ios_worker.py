@@ -19,6 +19,8 @@
 Thread to wait for an IOS image to be decompressed.
 """
 
+import os
+import time
 import zipfile
 import zlib
 
@@ -40,12 +42,17 @@ class DecompressIOSWorker(QtCore.QObject):
     finished = QtCore.pyqtSignal()
     updated = QtCore.pyqtSignal(int)
 
+    # minimum delay in seconds between two progress updates
+    PROGRESS_INTERVAL = 0.1
+
     def __init__(self, ios_image, destination_file):
 
         super().__init__()
         self._is_running = False
         self._ios_image = ios_image
         self._destination_file = destination_file
+        self._progress = None
+        self._last_update = 0
 
     def run(self):
         """
@@ -53,18 +60,53 @@ class DecompressIOSWorker(QtCore.QObject):
         """
 
         self._is_running = True
+        self._progress = None
+        self._last_update = 0
         try:
-            decompressIOS(self._ios_image, self._destination_file)
+            completed = decompressIOS(self._ios_image,
+                                      self._destination_file,
+                                      progress_callback=self._progressCallback,
+                                      is_cancelled=self._isCancelled)
         except (zipfile.BadZipFile, zlib.error) as e:
             self.error.emit("File {} is corrupted {}".format(self._ios_image, e), True)
             return
-        except (OSError, MemoryError) as e:
+        except (OSError, ValueError, MemoryError) as e:
             self.error.emit("Could not decompress {}: {}".format(self._ios_image, e), True)
             return
 
+        if not completed:
+            # remove the partially decompressed image
+            try:
+                os.remove(self._destination_file)
+            except OSError:
+                pass
+            return
+
         # IOS image has successfully been decompressed
+        self.updated.emit(100)
         self.finished.emit()
 
+    def _progressCallback(self, done, total):
+        """
+        Emits the progress, at most every PROGRESS_INTERVAL.
+
+        :param done: bytes decompressed
+        :param total: size of the decompressed image
+        """
+
+        now = time.monotonic()
+        if not total or now - self._last_update < self.PROGRESS_INTERVAL:
+            return
+        progress = int(done * 100 / total)
+        if progress != self._progress:
+            self._last_update = now
+            self._progress = progress
+            self.updated.emit(progress)
+
+    def _isCancelled(self):
+
+        return not self._is_running
+
     def cancel(self):
         """
         Cancel this worker.
@@ -22,6 +22,8 @@ IOU device implementation.
 import os
 import re
 from gns3.node import Node
+from gns3.http_client import HTTPClient
+from gns3.qt import qpartial
 from gns3.utils.normalize_filename import normalize_filename
 from .settings import IOU_DEVICE_SETTINGS
 
@@ -67,17 +69,21 @@ class IOUDevice(Node):
         """
         pass
 
-    def start(self):
+    def start(self, callback=None, showProgress=True):
         """
         Starts this VM instance.
+
+        :param callback: callback method to call when the server replies
+        :param showProgress: display the progress to the user
+        :returns: False if the device is already running or the query has been dropped
         """
 
         if self.status() == Node.started:
             log.debug("{} is already running".format(self.name()))
-            return
+            return False
 
         log.debug("{} is starting".format(self.name()))
-        self.controllerHttpPost("/nodes/{node_id}/start".format(node_id=self._node_id), self._startCallback, progressText="{} is starting".format(self.name()))
+        return self.controllerHttpPost("/nodes/{node_id}/start".format(node_id=self._node_id), qpartial(self._startCallback, callback=callback), timeout=None, progressText="{} is starting".format(self.name()), showProgress=showProgress, priority=HTTPClient.BULK) is not False
 
     def update(self, new_settings):
         """
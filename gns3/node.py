@@ -20,10 +20,11 @@ import uuid
 import pathlib
 
 from gns3.controller import Controller
+from gns3.http_client import HTTPClient
 from gns3.ports.ethernet_port import EthernetPort
 from gns3.ports.serial_port import SerialPort
 from gns3.utils.bring_to_front import bring_window_to_front_from_title
-from gns3.qt import QtGui, QtCore
+from gns3.qt import QtGui, QtCore, qpartial
 
 from .base_node import BaseNode
 
@@ -270,8 +271,11 @@ class Node(BaseNode):
         """
         Parse node object from API
         """
-        if "node_id" in result:
+        if "node_id" in result and result["node_id"] != self._node_id:
+            old_node_id = self._node_id
             self._node_id = result["node_id"]
+            from .topology import Topology
+            Topology.instance().updateNodeIndex(self, old_node_id=old_node_id)
 
         if "name" in result:
             self.setName(result["name"])
@@ -311,17 +315,14 @@ class Node(BaseNode):
 
     def _updatePorts(self, ports):
         self._settings["ports"] = ports
-        old_ports = self._ports.copy()
+        old_ports = self._ports_by_number
         self._ports = []
+        self._ports_by_number = {}
         for port in ports:
-            new_port = None
-
             # Update port if already exist
-            for old_port in old_ports:
-                if old_port.adapterNumber() == port["adapter_number"] and old_port.portNumber() == port["port_number"] and old_port.name() == port["name"]:
-                    new_port = old_port
-                    old_ports.remove(old_port)
-                    break
+            new_port = old_ports.pop((port["adapter_number"], port["port_number"]), None)
+            if new_port is not None and new_port.name() != port["name"]:
+                new_port = None
 
             if new_port is None:
                 if port["link_type"] == "serial":
@@ -334,6 +335,7 @@ class Node(BaseNode):
             new_port.setDataLinkTypes(port["data_link_types"])
             new_port.setStatus(self.status())
             self._ports.append(new_port)
+            self._ports_by_number[(new_port.adapterNumber(), new_port.portNumber())] = new_port
 
     def createNodeCallback(self, result, error=False, **kwargs):
         """
@@ -406,24 +408,29 @@ class Node(BaseNode):
         """
         return self.status() == Node.started
 
-    def start(self):
+    def start(self, callback=None, showProgress=True):
         """
         Starts this node instance.
+
+        :param callback: callback method to call when the server replies
+        :param showProgress: display the progress to the user
+        :returns: False if the node is already running or the query has been dropped
         """
 
         if self.isStarted():
             log.debug("{} is already running".format(self.name()))
-            return
+            return False
 
         log.debug("{} is starting".format(self.name()))
-        self.controllerHttpPost("/nodes/{node_id}/start".format(node_id=self._node_id), self._startCallback, timeout=None, progressText="{} is starting".format(self.name()))
+        return self.controllerHttpPost("/nodes/{node_id}/start".format(node_id=self._node_id), qpartial(self._startCallback, callback=callback), timeout=None, progressText="{} is starting".format(self.name()), showProgress=showProgress, priority=HTTPClient.BULK) is not False
 
-    def _startCallback(self, result, error=False, **kwargs):
+    def _startCallback(self, result, error=False, callback=None, **kwargs):
         """
         Callback for start.
 
         :param result: server response (dict)
         :param error: indicates an error (boolean)
+        :param callback: callback method to call after processing the response
         """
 
         if error:
@@ -431,25 +438,32 @@ class Node(BaseNode):
             self.server_error_signal.emit(self.id(), result["message"])
         else:
             self._parseResponse(result)
+        if callback:
+            callback(result, error=error, **kwargs)
 
-    def stop(self):
+    def stop(self, callback=None, showProgress=True):
         """
         Stops this node instance.
+
+        :param callback: callback method to call when the server replies
+        :param showProgress: display the progress to the user
+        :returns: False if the node is already stopped or the query has been dropped
         """
 
         if self.status() == Node.stopped:
             log.debug("{} is already stopped".format(self.name()))
-            return
+            return False
 
         log.debug("{} is stopping".format(self.name()))
-        self.controllerHttpPost("/nodes/{node_id}/stop".format(node_id=self._node_id), self._stopCallback, progressText="{} is stopping".format(self.name()), timeout=None)
+        return self.controllerHttpPost("/nodes/{node_id}/stop".format(node_id=self._node_id), qpartial(self._stopCallback, callback=callback), progressText="{} is stopping".format(self.name()), showProgress=showProgress, timeout=None, priority=HTTPClient.BULK) is not False
 
-    def _stopCallback(self, result, error=False, **kwargs):
+    def _stopCallback(self, result, error=False, callback=None, **kwargs):
         """
         Callback for stop.
 
         :param result: server response (dict)
         :param error: indicates an error (boolean)
+        :param callback: callback method to call after processing the response
         """
 
         if error:
@@ -460,25 +474,32 @@ class Node(BaseNode):
                 self.setStatus(Node.stopped)
         else:
             self._parseResponse(result)
+        if callback:
+            callback(result, error=error, **kwargs)
 
-    def suspend(self):
+    def suspend(self, callback=None, showProgress=True):
         """
         Suspends this node.
+
+        :param callback: callback method to call when the server replies
+        :param showProgress: display the progress to the user
+        :returns: False if the node is already suspended or the query has been dropped
         """
 
         if self.status() == Node.suspended:
             log.debug("{} is already suspended".format(self.name()))
-            return
+            return False
 
         log.debug("{} is being suspended".format(self.name()))
-        self.controllerHttpPost("/nodes/{node_id}/suspend".format(node_id=self._node_id), self._suspendCallback, timeout=None)
+        return self.controllerHttpPost("/nodes/{node_id}/suspend".format(node_id=self._node_id), qpartial(self._suspendCallback, callback=callback), timeout=None, showProgress=showProgress, priority=HTTPClient.BULK) is not False
 
-    def _suspendCallback(self, result, error=False, **kwargs):
+    def _suspendCallback(self, result, error=False, callback=None, **kwargs):
         """
         Callback for suspend.
 
         :param result: server response (dict)
         :param error: indicates an error (boolean)
+        :param callback: callback method to call after processing the response
         """
 
         if error:
@@ -486,26 +507,35 @@ class Node(BaseNode):
             self.server_error_signal.emit(self.id(), result["message"])
         else:
             self._parseResponse(result)
+        if callback:
+            callback(result, error=error, **kwargs)
 
-    def reload(self):
+    def reload(self, callback=None, showProgress=True):
         """
         Reloads this node instance.
+
+        :param callback: callback method to call when the server replies
+        :param showProgress: display the progress to the user
+        :returns: False if the query has been dropped
         """
 
         log.debug("{} is being reloaded".format(self.name()))
-        self.controllerHttpPost("/nodes/{node_id}/reload".format(node_id=self._node_id), self._reloadCallback, timeout=None)
+        return self.controllerHttpPost("/nodes/{node_id}/reload".format(node_id=self._node_id), qpartial(self._reloadCallback, callback=callback), timeout=None, showProgress=showProgress, priority=HTTPClient.BULK) is not False
 
-    def _reloadCallback(self, result, error=False, **kwargs):
+    def _reloadCallback(self, result, error=False, callback=None, **kwargs):
         """
         Callback for reload.
 
         :param result: server response (dict)
         :param error: indicates an error (boolean)
+        :param callback: callback method to call after processing the response
         """
 
         if error:
             log.error("error while reloading {}: {}".format(self.name(), result["message"]))
             self.server_error_signal.emit(self.id(), result["message"])
+        if callback:
+            callback(result, error=error, **kwargs)
 
     def openConsole(self, command=None, aux=False):
         if command is None:
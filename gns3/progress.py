@@ -35,6 +35,7 @@ class Progress(QtCore.QObject):
     add_query_signal = QtCore.Signal(str, str, QtNetwork.QNetworkReply)
     remove_query_signal = QtCore.Signal(str)
     progress_signal = QtCore.Signal(str, str, str)
+    transfer_signal = QtCore.Signal(str, str, str)
     show_signal = QtCore.Signal()
     hide_signal = QtCore.Signal()
 
@@ -48,10 +49,10 @@ class Progress(QtCore.QObject):
         self._progress_dialog = None
         self._show_lock = False
 
-        # Timer called for refreshing the progress dialog status
+        # Timer called for refreshing the progress dialog status,
+        # only running while there are queries or a dialog to hide
         self._rtimer = QtCore.QTimer()
         self._rtimer.timeout.connect(self.update)
-        self._rtimer.start(delay)
 
         # When in millisecond we started to show the progress dialog
         self._display_start_time = 0
@@ -60,12 +61,15 @@ class Progress(QtCore.QObject):
 
         self._finished_query_during_display = 0
         self._queries = {}
+        self._bytes_sent = 0
+        self._bytes_received = 0
         # QtCore.Qt.QueuedConnection warranty that we execute the slot
         # in the current thread and not emitter thread.
         # This fix an issue with Qt 5.5
         self.add_query_signal.connect(self._addQuerySlot, QtCore.Qt.QueuedConnection)
         self.remove_query_signal.connect(self._removeQuerySlot, QtCore.Qt.QueuedConnection)
         self.progress_signal.connect(self._progressSlot, QtCore.Qt.QueuedConnection)
+        self.transfer_signal.connect(self._transferSlot, QtCore.Qt.QueuedConnection)
         self.show_signal.connect(self._showSlot, QtCore.Qt.QueuedConnection)
         self.hide_signal.connect(self._hideSlot, QtCore.Qt.QueuedConnection)
 
@@ -75,7 +79,9 @@ class Progress(QtCore.QObject):
         self._enable = True
 
     def _addQuerySlot(self, query_id, explanation, response):
-        self._queries[query_id] = {"explanation": explanation, "current": 0, "maximum": 0, "response": response}
+        self._queries[query_id] = {"explanation": explanation, "current": 0, "maximum": 0, "response": response, "start_time": time.monotonic()}
+        if not self._rtimer.isActive():
+            self._rtimer.start(self._delay)
 
     def _removeQuerySlot(self, query_id):
         if query_id in self._queries:
@@ -85,6 +91,7 @@ class Progress(QtCore.QObject):
     def reset(self):
         if not sip.isdeleted(self):
             self._queries = {}
+            self._rtimer.stop()
             self.hide_signal.emit()
 
     def progress_dialog(self):
@@ -98,6 +105,27 @@ class Progress(QtCore.QObject):
             self._queries[query_id]["current"] = current
             self._queries[query_id]["maximum"] = maximum
 
+    def _transferSlot(self, query_id, sent, received):
+        self._bytes_sent += int(sent)
+        self._bytes_received += int(received)
+
+    def statistics(self):
+        """
+        Returns the number of running queries, the age in seconds
+        of the oldest one and the bytes transferred by the finished queries.
+        """
+
+        if self._queries:
+            oldest_query_age = time.monotonic() - min(query["start_time"] for query in self._queries.values())
+        else:
+            oldest_query_age = 0
+        return {
+            "queries": len(self._queries),
+            "oldest_query_age": oldest_query_age,
+            "bytes_sent": self._bytes_sent,
+            "bytes_received": self._bytes_received
+        }
+
     def setAllowCancelQuery(self, allow_cancel_query):
         self._allow_cancel_query = allow_cancel_query
 
@@ -109,7 +137,9 @@ class Progress(QtCore.QObject):
         if self._allow_cancel_query:
             log.debug("Cancel running queries")
             for query in self._queries.copy().values():
-                query["response"].abort()
+                # queries grouping several HTTP queries have no response
+                if query["response"] is not None:
+                    query["response"].abort()
 
     @qslot
     def _rejectSlot(self, *args):
@@ -123,6 +153,8 @@ class Progress(QtCore.QObject):
         if now < self._display_start_time:
             return
         if len(self._queries) == 0 and (time.time() * 1000) >= self._display_start_time + self._minimum_duration:
+            # nothing left to display, the next query restarts the timer
+            self._rtimer.stop()
             self.hide_signal.emit()
             return
         self.show_signal.emit()
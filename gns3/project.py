@@ -17,6 +17,9 @@
 
 import os
 import json
+import time
+import uuid
+import collections
 from .qt import QtCore, qpartial, QtWidgets, QtNetwork, qslot
 
 from gns3.controller import Controller
@@ -25,6 +28,8 @@ from gns3.topology import Topology
 from gns3.local_config import LocalConfig
 from gns3.settings import GRAPHICS_VIEW_SETTINGS
 from gns3.appliance_manager import ApplianceManager
+from gns3.progress import Progress
+from gns3.symbol import Symbol
 from gns3.utils import parse_version
 
 import logging
@@ -49,6 +54,29 @@ class Project(QtCore.QObject):
     # Called when project is fully loaded
     project_loaded_signal = QtCore.Signal()
 
+    # Maximum time spent creating items on the scene before giving
+    # back control to the event loop during the project loading (seconds)
+    LOAD_TIME_SLICE = 0.05
+
+    # Update events received during this delay are merged before
+    # being applied (milliseconds)
+    EVENT_DISPATCH_INTERVAL = 40
+
+    # Node actions supported by applyNodeAction with the progress text
+    NODE_ACTIONS = {
+        "start": "Starting {} nodes",
+        "stop": "Stopping {} nodes",
+        "suspend": "Suspending {} nodes",
+        "reload": "Reloading {} nodes"
+    }
+
+    # Update events which can be merged and the key identifying the object
+    COALESCED_EVENTS = {
+        "node.updated": "node_id",
+        "link.updated": "link_id",
+        "drawing.updated": "drawing_id"
+    }
+
     def __init__(self):
 
         self._id = None
@@ -79,8 +107,47 @@ class Project(QtCore.QObject):
         self._notification_network_manager = QtNetwork.QNetworkAccessManager()
         self._notification_stream = None
 
+        # items received from the controller and timings
+        # of the project loading steps
+        self._load_results = {}
+        self._load_start_time = None
+        self._load_timings = []
+        # incremented by each loading, the replies of a previous loading are ignored
+        self._load_id = 0
+
         super().__init__()
 
+        self._event_handlers = {
+            "node.created": self._nodeCreatedEvent,
+            "node.updated": self._nodeUpdatedEvent,
+            "node.deleted": self._nodeDeletedEvent,
+            "link.created": self._linkCreatedEvent,
+            "link.updated": self._linkUpdatedEvent,
+            "link.deleted": self._linkDeletedEvent,
+            "drawing.created": self._drawingCreatedEvent,
+            "drawing.updated": self._drawingUpdatedEvent,
+            "drawing.deleted": self._drawingDeletedEvent,
+            "project.closed": self._projectClosedEvent,
+            "project.updated": self._projectUpdatedCallback,
+            "snapshot.restored": self._snapshotRestoredEvent,
+            "log.error": self._logErrorEvent,
+            "log.warning": self._logWarningEvent,
+            "log.info": self._logInfoEvent,
+            "compute.created": self._computeUpdatedEvent,
+            "compute.updated": self._computeUpdatedEvent,
+            "settings.updated": self._settingsUpdatedEvent,
+            "ping": self._pingEvent
+        }
+
+        # update events waiting to be applied, merged by object identifier
+        self._pending_events = collections.OrderedDict()
+        self._events_received = 0
+        self._events_applied = 0
+        self._event_timer = QtCore.QTimer()
+        self._event_timer.setSingleShot(True)
+        self._event_timer.setInterval(self.EVENT_DISPATCH_INTERVAL)
+        self._event_timer.timeout.connect(self._dispatchPendingEvents)
+
     def name(self):
         """
         :returns: Project name (string)
@@ -305,6 +372,68 @@ class Project(QtCore.QObject):
 
         Controller.instance().post("/projects/{project_id}/nodes/reload".format(project_id=self._id), None, body={}, timeout=None)
 
+    def applyNodeAction(self, action, nodes):
+        """
+        Applies an action (start, stop, suspend or reload) to a set of nodes.
+
+        When the set covers all the nodes of the project a single project wide
+        query is sent to the controller. Otherwise one query per node is sent
+        with the bulk priority, the HTTP client limits how many are running at
+        the same time, and the progress is reported once for the whole set.
+
+        :param action: action name
+        :param nodes: list of nodes
+        """
+
+        if action not in self.NODE_ACTIONS:
+            raise ValueError("Unknown node action {}".format(action))
+
+        # Don't do anything if the project doesn't exist on the server
+        if self._id is None:
+            return
+
+        nodes = [node for node in nodes if hasattr(node, action) and node.initialized()]
+        if not nodes:
+            return
+        if len(nodes) == 1:
+            getattr(nodes[0], action)()
+            return
+
+        topology_nodes = Topology.instance().nodes()
+        if len(nodes) == len(topology_nodes) and {node.id() for node in nodes} == {node.id() for node in topology_nodes}:
+            log.debug("{} all the {} nodes with a project query".format(action, len(nodes)))
+            Controller.instance().post("/projects/{project_id}/nodes/{action}".format(project_id=self._id, action=action), None, body={}, timeout=None)
+            return
+
+        batch = {"query_id": str(uuid.uuid4()), "total": 0, "done": 0}
+        # the nodes already in the state and the queries dropped by the
+        # HTTP client (shutdown, lost connection) will never reply
+        for node in nodes:
+            if getattr(node, action)(callback=qpartial(self._nodeActionCallback, batch), showProgress=False) is not False:
+                batch["total"] += 1
+
+        if batch["total"] > 0:
+            log.debug("{} {} nodes".format(action, batch["total"]))
+            progress = Progress.instance()
+            progress.add_query_signal.emit(batch["query_id"], self.NODE_ACTIONS[action].format(batch["total"]), None)
+            progress.progress_signal.emit(batch["query_id"], str(batch["done"]), str(batch["total"]))
+
+    def _nodeActionCallback(self, batch, result, error=False, **kwargs):
+        """
+        Called when a node of a batch started by applyNodeAction has replied.
+
+        :param batch: batch status
+        :param result: server response (dict)
+        :param error: indicates an error (boolean)
+        """
+
+        batch["done"] += 1
+        progress = Progress.instance()
+        if batch["done"] >= batch["total"]:
+            progress.remove_query_signal.emit(batch["query_id"])
+        else:
+            progress.progress_signal.emit(batch["query_id"], str(batch["done"]), str(batch["total"]))
+
     def get(self, path, callback, **kwargs):
         """
         HTTP GET on the remote server
@@ -327,7 +456,7 @@ class Project(QtCore.QObject):
 
         Full arg list in createHTTPQuery
         """
-        self._projectHTTPQuery("POST", path, callback, body=body, **kwargs)
+        return self._projectHTTPQuery("POST", path, callback, body=body, **kwargs)
 
     def put(self, path, callback, body={}, **kwargs):
         """
@@ -368,7 +497,7 @@ class Project(QtCore.QObject):
         """
 
         path = "/projects/{project_id}{path}".format(project_id=self._id, path=path)
-        Controller.instance().createHTTPQuery(method, path, callback, body=body, **kwargs)
+        return Controller.instance().createHTTPQuery(method, path, callback, body=body, **kwargs)
 
     def create(self):
         """
@@ -439,6 +568,7 @@ class Project(QtCore.QObject):
         self._show_interface_labels = result.get("show_interface_labels", False)
 
     def load(self, path=None):
+        self._load_start_time = time.time()
         if not path:
             path = self.path()
         if path:
@@ -460,34 +590,127 @@ class Project(QtCore.QObject):
             self._startListenNotifications()
         self.project_updated_signal.emit()
 
-        self.get("/nodes", self._listNodesCallback)
-
-    def _listNodesCallback(self, result, error=False, **kwargs):
+        # nodes, links and drawings are requested at the same time
+        # and created once everything has been received
+        self._load_id += 1
+        self._load_results = {}
+        self._load_timings = []
+        for name in ("nodes", "links", "drawings"):
+            self.get("/" + name, qpartial(self._listItemsCallback, self._load_id, name))
+
+    def _listItemsCallback(self, load_id, name, result, error=False, **kwargs):
+        if load_id != self._load_id:
+            log.debug("Ignore the {} of a previous loading".format(name))
+            return
         if error:
-            log.error("Error while listing project: {}".format(result["message"]))
+            log.error("Error while listing {}: {}".format(name, result["message"]))
+            result = None
+        self._load_results[name] = result
+        if len(self._load_results) == 3:
+            self._projectItemsReceived()
+
+    def _projectItemsReceived(self):
+        """
+        Creates the nodes first and then the links and drawings
+        once all the items have been received from the controller.
+        """
+
+        results = self._load_results
+        self._load_results = {}
+        if Topology.instance().project() is not self:
+            return  # The project has been closed during the loading
+        if self._load_start_time is not None:
+            log.info("Project {} items received in {:.3f}s".format(self._name, time.time() - self._load_start_time))
+
+        # All the symbols are downloaded in one batch before building the scene
+        symbols = {node.get("symbol") for node in results.get("nodes") or []}
+        symbols.discard(None)
+        urls = [Symbol(symbol_id=symbol).url() for symbol in symbols]
+        Controller.instance().prefetchStatic(urls, qpartial(self._buildProjectScene, self._load_id, results, len(urls), time.time()))
+
+    def _buildProjectScene(self, load_id, results, nb_symbols, prefetch_start_time):
+        """
+        Creates the items once the symbols are available.
+
+        :param load_id: loading of the items
+        :param results: items received from the controller
+        :param nb_symbols: number of symbols prefetched
+        :param prefetch_start_time: time when the symbols prefetch has started
+        """
+
+        if Topology.instance().project() is not self or load_id != self._load_id:
+            return  # The project has been closed or loaded again during the loading
+        self._load_timings.append(("symbols", nb_symbols, time.time() - prefetch_start_time))
+
+        topology = Topology.instance()
+        topology.beginBulkLoad()
+        steps = [("nodes", topology.createNode), ("links", topology.createLink), ("drawings", topology.createDrawing)]
+        self._createProjectItems(steps, results)
+
+    def _createProjectItems(self, steps, results):
+        """
+        Runs the creation steps one after the other.
+
+        :param steps: list of (name, create method)
+        :param results: items received from the controller
+        """
+
+        if len(steps) == 0:
+            self._endLoad()
+            self.project_loaded_signal.emit()
             return
-        topo = Topology.instance()
-        for node in result:
-            topo.createNode(node)
-        self.get("/links", self._listLinksCallback)
 
-    def _listLinksCallback(self, result, error=False, **kwargs):
-        if error:
-            log.error("Error while listing links: {}".format(result["message"]))
+        name, create = steps[0]
+        if results[name] is None:
+            # the listing has failed, we stop the loading here
+            self._load_start_time = None
+            self._endLoad()
             return
-        topo = Topology.instance()
-        for link in result:
-            topo.createLink(link)
-        self.get("/drawings", self._listDrawingsCallback)
+        self._createItemsBySlices(name, results[name], create, qpartial(self._createProjectItems, steps[1:], results))
 
-    def _listDrawingsCallback(self, result, error=False, **kwargs):
-        if error:
-            log.error("Error while listing drawings: {}".format(result["message"]))
+    def _createItemsBySlices(self, name, items, create, callback, start=0, elapsed=0.0):
+        """
+        Creates items on the scene by time slices, the control is given
+        back to the event loop between each slice in order to keep the
+        user interface responsive.
+
+        :param name: name of the items used in the timing report
+        :param items: list of items data returned by the API
+        :param create: method to call for each item
+        :param callback: method called once all the items are created
+        :param start: index of the first item to create
+        :param elapsed: time already spent creating the items
+        """
+
+        if Topology.instance().project() is not self:
+            return  # The project has been closed during the loading
+
+        begin = time.time()
+        index = start
+        while index < len(items):
+            create(items[index])
+            index += 1
+            if time.time() - begin > self.LOAD_TIME_SLICE:
+                break
+        elapsed += time.time() - begin
+
+        if index < len(items):
+            QtCore.QTimer.singleShot(0, qpartial(self._createItemsBySlices, name, items, create, callback, index, elapsed))
+        else:
+            self._load_timings.append((name, len(items), elapsed))
+            callback()
+
+    def _endLoad(self):
+        """
+        Commits the items created on the scene and reports the loading time.
+        """
+
+        Topology.instance().endBulkLoad()
+        if self._load_start_time is None:
             return
-        topo = Topology.instance()
-        for drawing in result:
-            topo.createDrawing(drawing)
-        self.project_loaded_signal.emit()
+        report = ", ".join("{} {} in {:.3f}s".format(count, name, elapsed) for name, count, elapsed in self._load_timings)
+        log.info("Project {} loaded in {:.3f}s ({})".format(self._name, time.time() - self._load_start_time, report))
+        self._load_start_time = None
 
     def close(self, local_server_shutdown=False):
         """Close project"""
@@ -525,6 +748,8 @@ class Project(QtCore.QObject):
         Topology.instance().setProject(None)
 
     def stopListenNotifications(self):
+        self._event_timer.stop()
+        self._pending_events.clear()
         if self._notification_stream:
             log.debug("Stop listening for notifications from project %s", self._id)
             stream = self._notification_stream
@@ -578,59 +803,119 @@ class Project(QtCore.QObject):
         # Log only relevant events
         if result["action"] not in ("ping", "compute.updated"):
             log.debug("Event received: %s", result)
-        if result["action"] == "node.created":
-            node = Topology.instance().getNodeFromUuid(result["event"]["node_id"])
-            if node is None:
-                Topology.instance().createNode(result["event"])
-        elif result["action"] == "node.updated":
-            node = Topology.instance().getNodeFromUuid(result["event"]["node_id"])
-            if node is not None:
-                node.updateNodeCallback(result["event"])
-        elif result["action"] == "node.deleted":
-            node = Topology.instance().getNodeFromUuid(result["event"]["node_id"])
-            if node is not None:
-                node.delete(skip_controller=True)
-        elif result["action"] == "link.created":
-            link = Topology.instance().getLinkFromUuid(result["event"]["link_id"])
-            if link is None:
-                Topology.instance().createLink(result["event"])
-        elif result["action"] == "link.updated":
-            link = Topology.instance().getLinkFromUuid(result["event"]["link_id"])
-            if link is not None:
-                link.updateLinkCallback(result["event"])
-        elif result["action"] == "link.deleted":
-            link = Topology.instance().getLinkFromUuid(result["event"]["link_id"])
-            if link is not None:
-                link.deleteLink(skip_controller=True)
-        elif result["action"] == "drawing.created":
-            drawing = Topology.instance().getDrawingFromUuid(result["event"]["drawing_id"])
-            if drawing is None:
-                Topology.instance().createDrawing(result["event"])
-        elif result["action"] == "drawing.updated":
-            drawing = Topology.instance().getDrawingFromUuid(result["event"]["drawing_id"])
-            if drawing is not None:
-                drawing.updateDrawingCallback(result["event"])
-        elif result["action"] == "drawing.deleted":
-            drawing = Topology.instance().getDrawingFromUuid(result["event"]["drawing_id"])
-            if drawing is not None:
-                drawing.delete(skip_controller=True)
-        elif result["action"] == "project.closed":
-            Topology.instance().setProject(None)
-        elif result["action"] == "project.updated":
-            self._projectUpdatedCallback(result["event"])
-        elif result["action"] == "snapshot.restored":
-            Topology.instance().createLoadProject({"project_id": result["event"]["project_id"]})
-        elif result["action"] == "log.error":
-            log.error(result["event"]["message"])
-        elif result["action"] == "log.warning":
-            log.warning(result["event"]["message"])
-        elif result["action"] == "log.info":
-            log.info(result["event"]["message"], extra={"show": True})
-        elif result["action"] == "compute.created" or result["action"] == "compute.updated":
-            cm = ComputeManager.instance()
-            cm.computeDataReceivedCallback(result["event"])
-        elif result["action"] == "settings.updated":
-            LocalConfig.instance().refreshConfigFromController()
-            ApplianceManager.instance().refresh()
-        elif result["action"] == "ping":
-            pass
+        self._events_received += 1
+
+        action = result["action"]
+        event = result.get("event")
+        if action in self.COALESCED_EVENTS:
+            key = (action, event[self.COALESCED_EVENTS[action]])
+            pending_event = self._pending_events.get(key)
+            if pending_event is None:
+                self._pending_events[key] = event
+            else:
+                # the latest values win but we keep the fields
+                # not sent again, like an unchanged drawing SVG
+                pending_event.update(event)
+            if not self._event_timer.isActive():
+                self._event_timer.start()
+            return
+
+        # apply the waiting updates first to keep the events order
+        self._dispatchPendingEvents()
+        self._dispatchEvent(action, event)
+
+    def _dispatchPendingEvents(self):
+        """
+        Applies the update events waiting in the queue.
+        """
+
+        self._event_timer.stop()
+        if not self._pending_events:
+            return
+        pending_events = self._pending_events
+        self._pending_events = collections.OrderedDict()
+        for (action, _), event in pending_events.items():
+            self._dispatchEvent(action, event)
+
+    def _dispatchEvent(self, action, event):
+        handler = self._event_handlers.get(action)
+        if handler is not None:
+            self._events_applied += 1
+            handler(event)
+
+    def eventsStatistics(self):
+        """
+        :returns: Number of events received from the notification feed and number of events applied
+        """
+
+        return {"received": self._events_received, "applied": self._events_applied}
+
+    def _nodeCreatedEvent(self, event):
+        node = Topology.instance().getNodeFromUuid(event["node_id"])
+        if node is None:
+            Topology.instance().createNode(event)
+
+    def _nodeUpdatedEvent(self, event):
+        node = Topology.instance().getNodeFromUuid(event["node_id"])
+        if node is not None:
+            node.updateNodeCallback(event)
+
+    def _nodeDeletedEvent(self, event):
+        node = Topology.instance().getNodeFromUuid(event["node_id"])
+        if node is not None:
+            node.delete(skip_controller=True)
+
+    def _linkCreatedEvent(self, event):
+        link = Topology.instance().getLinkFromUuid(event["link_id"])
+        if link is None:
+            Topology.instance().createLink(event)
+
+    def _linkUpdatedEvent(self, event):
+        link = Topology.instance().getLinkFromUuid(event["link_id"])
+        if link is not None:
+            link.updateLinkCallback(event)
+
+    def _linkDeletedEvent(self, event):
+        link = Topology.instance().getLinkFromUuid(event["link_id"])
+        if link is not None:
+            link.deleteLink(skip_controller=True)
+
+    def _drawingCreatedEvent(self, event):
+        drawing = Topology.instance().getDrawingFromUuid(event["drawing_id"])
+        if drawing is None:
+            Topology.instance().createDrawing(event)
+
+    def _drawingUpdatedEvent(self, event):
+        drawing = Topology.instance().getDrawingFromUuid(event["drawing_id"])
+        if drawing is not None:
+            drawing.updateDrawingCallback(event)
+
+    def _drawingDeletedEvent(self, event):
+        drawing = Topology.instance().getDrawingFromUuid(event["drawing_id"])
+        if drawing is not None:
+            drawing.delete(skip_controller=True)
+
+    def _projectClosedEvent(self, event):
+        Topology.instance().setProject(None)
+
+    def _snapshotRestoredEvent(self, event):
+        Topology.instance().createLoadProject({"project_id": event["project_id"]})
+
+    def _logErrorEvent(self, event):
+        log.error(event["message"])
+
+    def _logWarningEvent(self, event):
+        log.warning(event["message"])
+
+    def _logInfoEvent(self, event):
+        log.info(event["message"], extra={"show": True})
+
+    def _computeUpdatedEvent(self, event):
+        ComputeManager.instance().computeDataReceivedCallback(event)
+
+    def _settingsUpdatedEvent(self, event):
+        LocalConfig.instance().refreshConfigFromController()
+        ApplianceManager.instance().refresh()
+
+    def _pingEvent(self, event):
+        pass
@@ -16,6 +16,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
+import hashlib
 import xml.etree.ElementTree as ET
 
 from . import QtCore
@@ -37,6 +38,7 @@ class QImageSvgRenderer(QtSvg.QSvgRenderer):
     def __init__(self, path_or_data=None, fallback=None):
         super().__init__()
         self._fallback = fallback
+        self._digest = None
         self._svg = """<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" width="{width}" height="{height}"></svg>"""
         self.load(path_or_data)
 
@@ -89,3 +91,148 @@ class QImageSvgRenderer(QtSvg.QSvgRenderer):
         :returns: SVG source code
         """
         return self._svg
+
+    def digest(self):
+        """
+        :returns: Identifier of the rendered content set by the
+        renderer pool, None if the renderer is not shared
+        """
+        return self._digest
+
+    def setDigest(self, digest):
+        """
+        :param digest: Identifier of the rendered content
+        """
+        self._digest = digest
+
+
+class QImageSvgRendererPool:
+    """
+    Process wide pool of renderers, the items displaying the same
+    image share the same renderer instead of parsing the file again.
+
+    The renderers are identified by the content of the files, the
+    path and the state of the file are only used to avoid reading a
+    file already known. The resources (path starting with ":") can't
+    change and are identified by their path.
+    """
+
+    def __init__(self):
+        # (path, fallback) => (file state, content hash)
+        self._paths = {}
+        # (content hash, fallback) => renderer
+        self._renderers = {}
+        # content hash => size of the source
+        self._sizes = {}
+        self._hits = 0
+        self._misses = 0
+
+    def renderer(self, path, fallback=None):
+        """
+        Returns the shared renderer of an image.
+
+        :param path: Path of the image
+        :param fallback: Image to display if the image is not working
+        :returns: QImageSvgRenderer instance
+        """
+
+        if path.startswith(":"):
+            state = None
+        else:
+            try:
+                stat = os.stat(path)
+                state = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                # the renderer will display the fallback
+                state = None
+
+        known = self._paths.get((path, fallback))
+        if known is not None and known[0] == state:
+            digest = known[1]
+        else:
+            digest, size = self._digest(path, state)
+            self._paths[(path, fallback)] = (state, digest)
+            self._sizes[digest] = size
+            if known is not None and known[1] != digest:
+                # the file has been edited
+                self._release(known[1], fallback)
+
+        renderer = self._renderers.get((digest, fallback))
+        if renderer is not None:
+            self._hits += 1
+            return renderer
+
+        self._misses += 1
+        renderer = QImageSvgRenderer(path, fallback=fallback)
+        renderer.setObjectName(path)
+        renderer.setDigest("{}|{}".format(digest, fallback or ""))
+        self._renderers[(digest, fallback)] = renderer
+        return renderer
+
+    def _release(self, digest, fallback):
+        """
+        Forgets the renderer of a content no longer used by any path,
+        the items already using it are not affected.
+        """
+
+        if any(key[1] == fallback and value[1] == digest for key, value in self._paths.items()):
+            # another file has the same content
+            return
+        self._renderers.pop((digest, fallback), None)
+        if not any(renderer_digest == digest for renderer_digest, _ in self._renderers):
+            self._sizes.pop(digest, None)
+
+    @staticmethod
+    def _digest(path, state):
+        """
+        :returns: Tuple with the hash of the content and its size
+        """
+
+        if path.startswith(":"):
+            # Resources can't change
+            return path, QtCore.QFile(path).size()
+        if state is None:
+            return path, 0
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return path, 0
+        return hashlib.sha1(data).hexdigest(), len(data)
+
+    def clear(self):
+        """
+        Forgets all the renderers, the renderers already
+        used by items are not affected.
+        """
+
+        self._paths = {}
+        self._renderers = {}
+        self._sizes = {}
+
+    def statistics(self):
+        """
+        :returns: Dictionary with the number of renderers, the size of
+        the parsed sources, the number of hits and misses and the hit rate
+        """
+
+        lookups = self._hits + self._misses
+        return {
+            "renderers": len(self._renderers),
+            "memory": sum(self._sizes[digest] for digest, fallback in self._renderers if digest in self._sizes),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0
+        }
+
+    @staticmethod
+    def instance():
+        """
+        Singleton to return only one instance of QImageSvgRendererPool.
+
+        :returns: instance of QImageSvgRendererPool
+        """
+
+        if not hasattr(QImageSvgRendererPool, "_instance") or QImageSvgRendererPool._instance is None:
+            QImageSvgRendererPool._instance = QImageSvgRendererPool()
+        return QImageSvgRendererPool._instance
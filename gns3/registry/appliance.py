@@ -19,6 +19,7 @@
 import json
 import copy
 import os
+import hashlib
 import collections
 import jsonschema
 
@@ -32,6 +33,13 @@ class ApplianceError(Exception):
 
 class Appliance(collections.Mapping):
 
+    # Validator of the appliance schema shared by all the appliances
+    _validator = None
+
+    # Appliances already parsed, validated and resolved by file
+    # (path, modification time and size) or by content hash
+    _cache = {}
+
     def __init__(self, registry, path):
         """
         :params registry: Instance of the registry where images are located
@@ -41,17 +49,39 @@ class Appliance(collections.Mapping):
 
         if os.path.isabs(path):
             try:
+                st = os.stat(path)
+                cache_key = (path, st.st_mtime_ns, st.st_size)
+                if cache_key in Appliance._cache:
+                    self._appliance = copy.deepcopy(Appliance._cache[cache_key])
+                    return
                 with open(path, encoding="utf-8") as f:
                     self._appliance = json.load(f)
             except (OSError, ValueError) as e:
                 raise ApplianceError("Could not read appliance {}: {}".format(os.path.abspath(path), str(e)))
         else:
+            cache_key = hashlib.sha1(path.encode("utf-8", errors="surrogateescape")).hexdigest()
+            if cache_key in Appliance._cache:
+                self._appliance = copy.deepcopy(Appliance._cache[cache_key])
+                return
             try:
                 self._appliance = json.loads(path)
             except ValueError as e:
                 raise ApplianceError("Could not read appliance {}: {}".format(os.path.abspath(path), str(e)))
         self._check_config()
         self._resolve_version()
+        Appliance._cache[cache_key] = copy.deepcopy(self._appliance)
+
+    @classmethod
+    def _getValidator(cls):
+        """
+        :returns: Validator of the appliance schema
+        """
+
+        if cls._validator is None:
+            with open(get_resource(os.path.join("schemas", "appliance.json"))) as f:
+                schema = json.load(f)
+            cls._validator = jsonschema.Draft4Validator(schema)
+        return cls._validator
 
     def _check_config(self):
         """
@@ -62,14 +92,10 @@ class Appliance(collections.Mapping):
         if self._appliance["registry_version"] > 5:
             raise ApplianceError("Please update GNS3 in order to install this appliance")
 
-        with open(get_resource(os.path.join("schemas", "appliance.json"))) as f:
-            schema = json.load(f)
-        v = jsonschema.Draft4Validator(schema)
-        try:
-            v.validate(self._appliance)
-        except jsonschema.ValidationError as e:
-            error = jsonschema.exceptions.best_match(v.iter_errors(self._appliance)).message
-            raise ApplianceError("Invalid appliance file: {}".format(error))
+        # the errors are collected in one pass, the most relevant is reported
+        error = jsonschema.exceptions.best_match(self._getValidator().iter_errors(self._appliance))
+        if error is not None:
+            raise ApplianceError("Invalid appliance file: {}".format(error.message))
 
     def __getitem__(self, key):
         return self._appliance.__getitem__(key)
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import json
+import hashlib
+import threading
+import concurrent.futures
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class ChecksumIndex:
+    """
+    Persistent index of the MD5 checksums of the image files.
+
+    A checksum is valid as long as the size, the modification time and
+    the inode of the file have not changed, so an image is hashed only
+    once. The index also maps the checksums to the files for finding an
+    image without hashing the image directories.
+
+    :param path: Path of the index file
+    """
+
+    INDEX_FILE = "image_checksums.json"
+    READ_SIZE = 1024 * 1024
+    MAX_WORKERS = 4
+
+    def __init__(self, path):
+
+        self._path = path
+        self._lock = threading.Lock()
+        # path => {"size", "mtime", "inode", "md5sum"}
+        self._entries = {}
+        # md5sum => set of paths
+        self._paths_by_md5sum = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+
+        try:
+            with open(self._path, encoding="utf-8") as f:
+                entries = json.load(f).get("entries", {})
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, AttributeError) as e:
+            log.warning("Can't load the image checksum index: {}".format(e))
+            return
+        for path, entry in entries.items():
+            self._addEntry(path, entry)
+
+    def save(self):
+        """
+        Saves the index if it has changed.
+        """
+
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                os.makedirs(os.path.dirname(self._path), exist_ok=True)
+                with open(self._path + ".tmp", "w", encoding="utf-8") as f:
+                    json.dump({"entries": self._entries}, f)
+                os.replace(self._path + ".tmp", self._path)
+            except OSError as e:
+                log.warning("Can't save the image checksum index: {}".format(e))
+                return
+            self._dirty = False
+
+    def _addEntry(self, path, entry):
+
+        self._removeEntry(path)
+        self._entries[path] = entry
+        self._paths_by_md5sum.setdefault(entry["md5sum"], set()).add(path)
+
+    def _removeEntry(self, path):
+
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            paths = self._paths_by_md5sum[entry["md5sum"]]
+            paths.discard(path)
+            if not paths:
+                del self._paths_by_md5sum[entry["md5sum"]]
+
+    @staticmethod
+    def _matches(entry, st):
+
+        return entry["size"] == st.st_size and entry["mtime"] == st.st_mtime_ns and entry["inode"] == st.st_ino
+
+    def lookup(self, path):
+        """
+        Returns the checksum of a file if it is in the index and has not changed.
+
+        :param path: Path of the file
+        :returns: hexadecimal md5 or None
+        """
+
+        entry = self._entries.get(path)
+        if entry is None:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if self._matches(entry, st):
+            return entry["md5sum"]
+        return None
+
+    def find(self, md5sum):
+        """
+        Returns the files with a checksum, the files changed since
+        they have been hashed are ignored.
+
+        :param md5sum: hexadecimal md5
+        :returns: list of paths
+        """
+
+        return [path for path in list(self._paths_by_md5sum.get(md5sum, ())) if self.lookup(path) == md5sum]
+
+    def md5sum(self, path):
+        """
+        Returns the checksum of a file, the file is hashed if
+        it's not in the index.
+
+        :param path: Path of the file
+        :returns: hexadecimal md5 or None if the file can't be read
+        """
+
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        entry = self._entries.get(path)
+        if entry is not None and self._matches(entry, st):
+            return entry["md5sum"]
+
+        m = hashlib.md5()
+        try:
+            with open(path, "rb") as f:
+                while True:
+                    buf = f.read(self.READ_SIZE)
+                    if not buf:
+                        break
+                    m.update(buf)
+        except OSError as e:
+            log.error("Can't hash {}: {}".format(path, e))
+            return None
+
+        md5sum = m.hexdigest()
+        with self._lock:
+            self._addEntry(path, {"size": st.st_size, "mtime": st.st_mtime_ns, "inode": st.st_ino, "md5sum": md5sum})
+            self._dirty = True
+        return md5sum
+
+    def hashFiles(self, paths):
+        """
+        Returns the checksums of several files, the files which
+        are not in the index are hashed on a thread pool.
+
+        :param paths: Paths of the files
+        :returns: dictionary path => md5sum (None if the file can't be read)
+        """
+
+        results = {}
+        to_hash = []
+        for path in paths:
+            md5sum = self.lookup(path)
+            if md5sum is None:
+                to_hash.append(path)
+            else:
+                results[path] = md5sum
+
+        if len(to_hash) == 1:
+            results[to_hash[0]] = self.md5sum(to_hash[0])
+        elif to_hash:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+                for path, md5sum in zip(to_hash, executor.map(self.md5sum, to_hash)):
+                    results[path] = md5sum
+        if to_hash:
+            self.save()
+        return results
+
+    @staticmethod
+    def instance():
+        """
+        Singleton to return only one instance of ChecksumIndex.
+
+        :returns: instance of ChecksumIndex
+        """
+
+        if not hasattr(ChecksumIndex, "_instance") or ChecksumIndex._instance is None:
+            from ..local_config import LocalConfig
+            directory = os.path.dirname(LocalConfig.instance().configFilePath())
+            ChecksumIndex._instance = ChecksumIndex(os.path.join(directory, ChecksumIndex.INDEX_FILE))
+        return ChecksumIndex._instance
@@ -301,7 +301,7 @@ class Config:
 
         if is_symbol_on_controller:
             cached = Controller.instance().getStaticCachedPath(symbol)
-            if os.path.exists(cached):
+            if cached is not None and os.path.exists(cached):
                 try:
                     shutil.copy(cached, path)
                 except IOError as e:
@@ -16,7 +16,8 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
-import hashlib
+
+from .checksum_index import ChecksumIndex
 
 import logging
 log = logging.getLogger(__name__)
@@ -102,14 +103,12 @@ class Image:
 
             if not os.path.isfile(self.path):
                 return None
-            m = hashlib.md5()
-            with open(self.path, "rb") as f:
-                while True:
-                    buf = f.read(4096)
-                    if not buf:
-                        break
-                    m.update(buf)
-            self._md5sum = m.hexdigest()
+            # the checksums are kept on disk between two runs
+            index = ChecksumIndex.instance()
+            self._md5sum = index.md5sum(self.path)
+            if self._md5sum is None:
+                return None
+            index.save()
         Image._cache[self.path] = self._md5sum
         return self._md5sum
 
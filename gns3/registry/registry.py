@@ -17,11 +17,13 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
+import threading
 
 import logging
 log = logging.getLogger(__name__)
 
 from .image import Image
+from .checksum_index import ChecksumIndex
 from ..controller import Controller
 from ..qt import QtCore
 
@@ -40,6 +42,15 @@ class Registry(QtCore.QObject):
         super().__init__()
         self._images_dirs = images_dirs
         self._remote_images = []
+        # directory => {"mtime", "files": {filename: (path, size, mtime)}, "sizes": {size: [paths]}}
+        self._directory_index = {}
+        # search results reused until an image directory changes,
+        # key => (image, size, mtime) or (None, None, None) for a miss
+        self._search_cache = {}
+        # scan all the directories again even if they haven't changed
+        self._rescan = False
+        # the wizard searches from a worker thread
+        self._lock = threading.RLock()
 
     def appendImageDirectory(self, image_directory):
         """
@@ -48,6 +59,18 @@ class Registry(QtCore.QObject):
         :param image_directory: Folder we need to add
         """
         self._images_dirs.append(image_directory)
+        self.refresh()
+
+    def refresh(self):
+        """
+        Forgets the search results, the image directories are
+        scanned again by the next search. The files rewritten in
+        place since the last scan are found by this scan.
+        """
+
+        with self._lock:
+            self._rescan = True
+            self._search_cache = {}
 
     def getRemoteImageList(self, emulator, compute_id):
         self._emulator = emulator
@@ -65,6 +88,8 @@ class Registry(QtCore.QObject):
             image.md5sum = res.get("md5sum")
             image.filesize = res.get("filesize")
             self._remote_images.append(image)
+        with self._lock:
+            self._search_cache = {}
         self.image_list_changed_signal.emit()
 
     def search_image_file(self, emulator, filename, md5sum, size):
@@ -85,27 +110,165 @@ class Registry(QtCore.QObject):
                 if filename == remote_image.filename:
                     return remote_image
 
+        with self._lock:
+            self._refreshDirectoryIndex()
+            key = (emulator, filename, md5sum, size)
+            cached = self._search_cache.get(key)
+            if cached is not None:
+                image, file_size, mtime = cached
+                if image is None or self._fileStat(image.path) == (file_size, mtime):
+                    return image
+                # the file has been rewritten in place, the directory
+                # modification time doesn't tell it
+                self._rescan = True
+                self._refreshDirectoryIndex()
+
+            image = self._searchLocalImage(emulator, filename, md5sum, size)
+            file_stat = None
+            if image is not None:
+                file_stat = self._fileStat(image.path)
+            if file_stat is not None:
+                self._search_cache[key] = (image, ) + file_stat
+            elif image is None:
+                self._search_cache[key] = (None, None, None)
+            return image
+
+    def _searchLocalImage(self, emulator, filename, md5sum, size):
+        """
+        Search an image in the local image directories.
+
+        :returns: Image object or None
+        """
+
+        if md5sum is None:
+            for directory in self._images_dirs:
+                entry = self._directory_index[directory]["files"].get(filename)
+                if entry is not None:
+                    return Image(emulator, entry[0])
+            return None
+
+        # files already hashed, found without hashing the directories
+        images_dirs = set(os.path.normpath(directory) for directory in self._images_dirs)
+        for path in ChecksumIndex.instance().find(md5sum):
+            if os.path.dirname(path) in images_dirs and self._sizeMatches(path, size):
+                log.debug("Found images %s (%s) in %s from the checksum index", filename, md5sum, path)
+                return Image(emulator, path)
+
         for directory in self._images_dirs:
             log.debug("Search images %s (%s) in %s", filename, md5sum, directory)
-            if os.path.exists(directory):
-                for file in os.listdir(directory):
-                    if not file.endswith(".md5sum") and not file.startswith("."):
-                        path = os.path.join(directory, file)
-                        try:
-                            if os.path.isfile(path):
-                                if md5sum is None:
-                                    if filename == os.path.basename(path):
-                                        return Image(emulator, path)
-                                else:
-                                    # We take all the file with almost the size of the image
-                                    # Almost to avoid round issue with system.
-                                    file_size = os.stat(path).st_size
-                                    if size is None or (file_size - 10 < size and file_size + 10 > size):
-                                        image = Image(emulator, path)
-                                        if image.md5sum == md5sum:
-                                            log.debug("Found images %s (%s) in %s", filename, md5sum, image.path)
-                                            return image
-                        except (OSError, PermissionError) as e:
-                            log.error("Can't scan {}: {}".format(path, str(e)))
+            candidates = self._candidates(directory, size)
+            if candidates:
+                image = self._findImageByMd5sum(emulator, candidates, md5sum)
+                if image is not None:
+                    log.debug("Found images %s (%s) in %s", filename, md5sum, image.path)
+                    return image
+        return None
+
+    @staticmethod
+    def _fileStat(path):
+        """
+        :returns: Tuple (size, mtime) of a file or None if it doesn't exist
+        """
+
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def _refreshDirectoryIndex(self):
+        """
+        Scans the image directories changed since the last search,
+        or all of them after a refresh.
+        """
+
+        rescan = self._rescan
+        self._rescan = False
+        for directory in self._images_dirs:
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                mtime = None
+            previous_index = self._directory_index.get(directory)
+            if not rescan and previous_index is not None and previous_index["mtime"] == mtime:
+                continue
+
+            index = {"mtime": mtime, "files": {}, "sizes": {}}
+            if mtime is not None:
+                try:
+                    entries = list(os.scandir(directory))
+                except OSError as e:
+                    log.error("Can't scan {}: {}".format(directory, str(e)))
+                    entries = []
+                for entry in entries:
+                    if entry.name.endswith(".md5sum") or entry.name.startswith("."):
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        st = entry.stat()
+                    except OSError as e:
+                        log.error("Can't scan {}: {}".format(entry.path, str(e)))
+                        continue
+                    file_size = st.st_size
+                    index["files"][entry.name] = (entry.path, file_size, st.st_mtime_ns)
+                    if previous_index is not None:
+                        previous = previous_index["files"].get(entry.name)
+                        if previous is not None and previous[1:] != (file_size, st.st_mtime_ns):
+                            # the checksum in memory is for the previous content
+                            Image._cache.pop(entry.path, None)
+                    index["sizes"].setdefault(file_size, []).append(entry.path)
+            self._directory_index[directory] = index
+            self._search_cache = {}
+
+    def _candidates(self, directory, size):
+        """
+        Returns the files of a directory with almost the size of the image.
+        Almost to avoid round issue with system.
+        """
+
+        index = self._directory_index[directory]
+        if size is None:
+            return [entry[0] for entry in index["files"].values()]
+        candidates = []
+        size = int(size)
+        for file_size in range(size - 9, size + 10):
+            candidates.extend(index["sizes"].get(file_size, []))
+        return candidates
+
+    def _sizeMatches(self, path, size):
+        """
+        :returns: True if the file has almost the size of the image
+        """
+
+        if size is None:
+            return True
+        # Almost to avoid round issue with system.
+        file_size = os.stat(path).st_size
+        return file_size - 10 < size and file_size + 10 > size
+
+    def _findImageByMd5sum(self, emulator, paths, md5sum):
+        """
+        Hashes the files not yet in the checksum index on a thread pool.
+
+        :returns: Image object or None
+        """
+
+        images = [Image(emulator, path) for path in paths]
+        # the .md5sum files and the memory cache are checked first
+        # without hashing the images
+        unknown = []
+        for image in images:
+            if image.path in Image._cache or os.path.exists(image.path + ".md5sum"):
+                if image.md5sum == md5sum:
+                    return image
+            else:
+                unknown.append(image)
 
+        checksums = ChecksumIndex.instance().hashFiles([image.path for image in unknown])
+        for image in unknown:
+            if checksums.get(image.path) == md5sum:
+                image.md5sum = md5sum
+                Image._cache[image.path] = md5sum
+                return image
         return None
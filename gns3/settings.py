@@ -148,6 +148,10 @@ else:
         if distro == "Debian" or distro == "Ubuntu" or distro == "LinuxMint":
             DEFAULT_TELNET_CONSOLE_COMMAND = PRECONFIGURED_TELNET_CONSOLE_COMMANDS["Gnome Terminal"]
 
+# Telnet console command opening the consoles in the built-in console dock
+BUILTIN_TELNET_CONSOLE_COMMAND = "builtin"
+PRECONFIGURED_TELNET_CONSOLE_COMMANDS["Built-in console"] = BUILTIN_TELNET_CONSOLE_COMMAND
+
 # Pre-configured VNC console commands on various OSes
 if sys.platform.startswith("win"):
     # Windows
@@ -260,6 +264,8 @@ GENERAL_SETTINGS = {
     "vnc_console_command": DEFAULT_VNC_CONSOLE_COMMAND,
     "spice_console_command": DEFAULT_SPICE_CONSOLE_COMMAND,
     "delay_console_all": 500,
+    "console_log_max_size": 1024 * 1024,  # size of a built-in console log file in bytes
+    "console_log_backups": 3,  # number of full log files kept for each built-in console
     "hide_getting_started_dialog": False,
     "hide_setup_wizard": False,
     "hide_new_appliance_template_button": False,
@@ -283,6 +289,10 @@ GRAPHICS_VIEW_SETTINGS = {
     "scene_height": 1000,
     "draw_rectangle_selected_item": False,
     "draw_link_status_points": True,
+    "level_of_detail": True,
+    "level_of_detail_min_nodes": 500,  # the small topologies are always fully painted
+    "level_of_detail_pixmap_zoom": 0.5,
+    "level_of_detail_glyph_zoom": 0.2,
     "default_label_font": "TypeWriter,10,-1,5,75,0,0,0,0,0",
     "default_label_color": "#000000",
     "zoom": None,
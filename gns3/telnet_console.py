@@ -19,75 +19,219 @@
 Functions to start external console terminals.
 """
 
-from .qt import QtCore
+from .qt import QtCore, qslot
 
 import os
 import sys
+import time
 import shlex
+import collections
 import subprocess
 from .main_window import MainWindow
 from .controller import Controller
+from .settings import BUILTIN_TELNET_CONSOLE_COMMAND
 
 import logging
 log = logging.getLogger(__name__)
 
-console_mutex = QtCore.QMutex()
 
+class ConsoleLauncher(QtCore.QObject):
 
-class ConsoleThread(QtCore.QThread):
+    """
+    Starts the console terminals and tracks them without a thread
+    per console.
+
+    The launches are queued and started one after the other with the
+    "delay_console_all" delay between them. The running terminals are
+    polled by a single timer, a console already open for a node is
+    not started again.
+    """
 
     consoleError = QtCore.pyqtSignal(str)
+    sessions_changed_signal = QtCore.pyqtSignal()
+
+    # how often the running terminals are checked (in milliseconds)
+    POLL_INTERVAL = 1000
+
+    def __init__(self, parent=None):
 
-    def __init__(self, parent, command, node, port):
         super().__init__(parent)
+        self._queue = collections.deque()
+        # (node id, port, command) => session
+        self._sessions = {}
+        self._last_launch = None
 
-        self._command = command
-        self._name = node.name()
-        self._host = node.consoleHost()
-        assert self._host
-        self._port = port
-        self._node = node
-
-    def exec_command(self, command):
-
-        if sys.platform.startswith("win"):
-            # use the string on Windows
-            subprocess.call(command)
-        else:
-            # use arguments on other platforms
-            try:
-                args = shlex.split(command)
-            except ValueError:
-                self.consoleError.emit("Syntax error in command: '{}'".format(command))
-                return
-            subprocess.call(args, env=os.environ)
+        self._launch_timer = QtCore.QTimer(self)
+        self._launch_timer.setSingleShot(True)
+        self._launch_timer.timeout.connect(self._launchNextSlot)
+
+        self._poll_timer = QtCore.QTimer(self)
+        self._poll_timer.setInterval(self.POLL_INTERVAL)
+        self._poll_timer.timeout.connect(self._pollSlot)
+
+    def launch(self, node, port, command):
+        """
+        Queues the start of a console terminal for a node.
 
-    def run(self):
+        :param node: The node
+        :param port: Console port
+        :param command: Console command with the place-holders
+        """
 
-        host = self._host
-        port = self._port
+        host = node.consoleHost()
+        assert host
 
         # replace the place-holders by the actual values
-        command = self._command.replace("%h", host)
+        command = command.replace("%h", host)
         command = command.replace("%p", str(port))
-        command = command.replace("%d", self._name.replace('"', '\\"'))
-        command = command.replace("%i", self._node.project().id())
-        command = command.replace("%n", str(self._node.id()))
+        command = command.replace("%d", node.name().replace('"', '\\"'))
+        command = command.replace("%i", node.project().id())
+        command = command.replace("%n", str(node.id()))
         command = command.replace("%c", Controller.instance().httpClient().fullUrl())
 
-        # If the console use an apple script we lock to avoid multiple console
-        # to interact at the same time
-        if sys.platform.startswith("darwin") and "osascript" in command:
-            console_mutex.lock()
+        key = (node.id(), port, command)
+        session = self._sessions.get(key)
+        if session is not None:
+            if session["process"] is None or session["process"].poll() is None:
+                log.debug("Console for {} is already open".format(node.name()))
+                self._bringToFront(session)
+                return
+            self._removeSession(key)
+
+        self._sessions[key] = {"key": key, "name": node.name(), "host": host, "port": port, "command": command, "process": None, "start_time": None}
+        self._queue.append(key)
+        self._scheduleLaunch()
+
+    def sessions(self):
+        """
+        Returns the console terminals started or waiting to be started.
+
+        :returns: list of dictionaries with the node name, host, port,
+        command, pid (None while waiting) and start time
+        """
+
+        sessions = []
+        for session in self._sessions.values():
+            process = session["process"]
+            sessions.append({
+                "name": session["name"],
+                "host": session["host"],
+                "port": session["port"],
+                "command": session["command"],
+                "pid": process.pid if process is not None else None,
+                "start_time": session["start_time"]
+            })
+        return sessions
+
+    def _delay(self):
+        """
+        :returns: Delay between two launches in milliseconds
+        """
+
+        return MainWindow.instance().settings()["delay_console_all"]
+
+    def _scheduleLaunch(self):
+
+        if self._launch_timer.isActive() or not self._queue:
+            return
+        delay = 0
+        if self._last_launch is not None:
+            elapsed = (time.monotonic() - self._last_launch) * 1000
+            delay = max(0, int(self._delay() - elapsed))
+        self._launch_timer.start(delay)
+
+    @qslot
+    def _launchNextSlot(self, *args):
 
+        while self._queue:
+            key = self._queue[0]
+            session = self._sessions.get(key)
+            if session is None:
+                self._queue.popleft()
+                continue
+            # Apple scripts must not interact at the same time
+            if sys.platform.startswith("darwin") and "osascript" in session["command"] and self._osascriptRunning():
+                self._launch_timer.start(self.POLL_INTERVAL)
+                return
+            self._queue.popleft()
+            self._start(session)
+            break
+        self._scheduleLaunch()
+
+    def _osascriptRunning(self):
+
+        for session in self._sessions.values():
+            if session["process"] is not None and "osascript" in session["command"] and session["process"].poll() is None:
+                return True
+        return False
+
+    def _start(self, session):
+        """
+        Starts a console terminal.
+        """
+
+        command = session["command"]
+        self._last_launch = time.monotonic()
+        log.debug('Starting telnet console "{}"'.format(command))
         try:
-            self.exec_command(command)
+            if sys.platform.startswith("win"):
+                # use the string on Windows
+                session["process"] = subprocess.Popen(command)
+            else:
+                # use arguments on other platforms
+                try:
+                    args = shlex.split(command)
+                except ValueError:
+                    self._removeSession(session["key"])
+                    self.consoleError.emit("Syntax error in command: '{}'".format(command))
+                    return
+                session["process"] = subprocess.Popen(args, env=os.environ)
         except (OSError, subprocess.SubprocessError) as e:
+            self._removeSession(session["key"])
             self.consoleError.emit("Could not start Telnet console with command '{}': {}".format(command, e))
-        finally:
-            log.debug('Telnet console {}:{} closed'.format(host, port))
-            if sys.platform.startswith("darwin") and "osascript" in command:
-                console_mutex.unlock()
+            return
+
+        session["start_time"] = time.time()
+        if not self._poll_timer.isActive():
+            self._poll_timer.start()
+        self.sessions_changed_signal.emit()
+
+    @qslot
+    def _pollSlot(self, *args):
+        """
+        Forgets the console terminals which have been closed.
+        """
+
+        for key, session in list(self._sessions.items()):
+            if session["process"] is not None and session["process"].poll() is not None:
+                log.debug("Telnet console {}:{} closed".format(session["host"], session["port"]))
+                self._removeSession(key)
+        if not any(session["process"] is not None for session in self._sessions.values()):
+            self._poll_timer.stop()
+
+    def _removeSession(self, key):
+
+        if self._sessions.pop(key, None) is not None:
+            self.sessions_changed_signal.emit()
+
+    def _bringToFront(self, session):
+
+        if sys.platform.startswith("win") and session["process"] is not None:
+            from .utils.bring_to_front import bring_window_to_front_from_pid
+            bring_window_to_front_from_pid(session["process"].pid)
+
+    @staticmethod
+    def instance():
+        """
+        Singleton to return only one instance of ConsoleLauncher.
+
+        :returns: instance of ConsoleLauncher
+        """
+
+        if not hasattr(ConsoleLauncher, "_instance") or ConsoleLauncher._instance is None:
+            ConsoleLauncher._instance = ConsoleLauncher(MainWindow.instance())
+            ConsoleLauncher._instance.consoleError.connect(_consoleErrorSlot)
+        return ConsoleLauncher._instance
 
 
 def nodeTelnetConsole(node, port, command=None):
@@ -107,10 +251,12 @@ def nodeTelnetConsole(node, port, command=None):
         if not command:
             return
 
-    log.debug('Starting telnet console in thread "{}"'.format(command))
-    console_thread = ConsoleThread(MainWindow.instance(), command, node, port)
-    console_thread.consoleError.connect(_consoleErrorSlot)
-    console_thread.start()
+    if command == BUILTIN_TELNET_CONSOLE_COMMAND:
+        from .telnet_console_dock import TelnetConsoleDock
+        TelnetConsoleDock.instance().openConsole(node, port)
+        return
+
+    ConsoleLauncher.instance().launch(node, port, command)
 
 
 def _consoleErrorSlot(message):
@@ -0,0 +1,449 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Built-in telnet consoles displayed as tabs in a dock of the main window.
+
+All the consoles share the event loop of the GUI, there is no process
+or thread per console. The output of each console is saved in a log
+file capped in size.
+"""
+
+import re
+import os
+import codecs
+
+from .qt import QtCore, QtGui, QtNetwork, QtWidgets, qslot, qpartial
+from .utils.telnet_protocol import TelnetProtocol
+from .utils.rolling_log import RollingLog
+from .utils.normalize_filename import normalize_filename
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class TelnetSession(QtCore.QObject):
+
+    """
+    Telnet connection to the console of a node.
+
+    :param host: Console host
+    :param port: Console port
+    :param log_path: Path of the session log, None to disable the log
+    :param log_max_size: Maximum size of a log file in bytes
+    :param log_backups: Number of full log files kept
+    :param parent: Parent object
+    """
+
+    data_received_signal = QtCore.pyqtSignal(str)
+    state_changed_signal = QtCore.pyqtSignal()
+
+    def __init__(self, host, port, log_path=None, log_max_size=1024 * 1024, log_backups=3, parent=None):
+
+        super().__init__(parent)
+        self._host = host
+        self._port = port
+        self._protocol = None
+        self._decoder = None
+        self._log = None
+        if log_path:
+            self._log = RollingLog(log_path, max_size=log_max_size, backups=log_backups)
+
+        self._socket = QtNetwork.QTcpSocket(self)
+        self._socket.connected.connect(self._connectedSlot)
+        self._socket.disconnected.connect(self._disconnectedSlot)
+        self._socket.readyRead.connect(self._readyReadSlot)
+        self._socket.error.connect(self._errorSlot)
+
+    def connectToConsole(self):
+        """
+        Opens the connection, a connected session is not affected.
+        """
+
+        if self._socket.state() != QtNetwork.QAbstractSocket.UnconnectedState:
+            return
+        self._protocol = TelnetProtocol()
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._socket.connectToHost(self._host, self._port)
+
+    def isConnected(self):
+        """
+        :returns: True if the session is connected
+        """
+
+        return self._socket.state() == QtNetwork.QAbstractSocket.ConnectedState
+
+    def logPath(self):
+        """
+        :returns: Path of the session log or None
+        """
+
+        if self._log:
+            return self._log.path()
+        return None
+
+    def send(self, data):
+        """
+        Sends data to the console.
+
+        :param data: bytes
+        """
+
+        if self.isConnected():
+            self._socket.write(TelnetProtocol.encode(data))
+
+    def flushLog(self):
+
+        if self._log:
+            self._log.flush()
+
+    def close(self):
+        """
+        Closes the connection and the log.
+        """
+
+        self._socket.abort()
+        if self._log:
+            self._log.close()
+
+    @qslot
+    def _connectedSlot(self, *args):
+
+        log.debug("Connected to the console {}:{}".format(self._host, self._port))
+        self.state_changed_signal.emit()
+
+    @qslot
+    def _disconnectedSlot(self, *args):
+
+        log.debug("Disconnected from the console {}:{}".format(self._host, self._port))
+        self.flushLog()
+        self.state_changed_signal.emit()
+
+    @qslot
+    def _errorSlot(self, *args):
+
+        if self._socket.error() != QtNetwork.QAbstractSocket.RemoteHostClosedError:
+            self.data_received_signal.emit("\nConnection to {}:{} failed: {}\n".format(self._host, self._port, self._socket.errorString()))
+        self.state_changed_signal.emit()
+
+    @qslot
+    def _readyReadSlot(self, *args):
+
+        data, replies = self._protocol.feed(bytes(self._socket.readAll()))
+        if replies:
+            self._socket.write(replies)
+        if data:
+            if self._log:
+                self._log.write(data)
+            self.data_received_signal.emit(self._decoder.decode(data))
+
+
+class TelnetConsoleWidget(QtWidgets.QPlainTextEdit):
+
+    """
+    Terminal of a telnet session, the keys are sent to the session
+    and the output of the session is displayed.
+
+    :param session: TelnetSession instance
+    :param parent: Parent widget
+    """
+
+    # lines kept in the widget, the full output is in the session log
+    SCROLLBACK_LINES = 5000
+
+    # ANSI escape sequences, the widget doesn't support them
+    _ESCAPE_SEQUENCE_RE = re.compile(r"\x1b(\[[0-9;?]*[ -/]*[@-~]|[@-Z\\-_])")
+    _CONTROL_CHARACTERS_RE = re.compile(r"[\x00-\x07\x0b-\x1f\x7f]")
+
+    _KEYS = {
+        QtCore.Qt.Key_Return: b"\r\0",
+        QtCore.Qt.Key_Enter: b"\r\0",
+        QtCore.Qt.Key_Backspace: b"\x7f",
+        QtCore.Qt.Key_Tab: b"\t",
+        QtCore.Qt.Key_Escape: b"\x1b",
+        QtCore.Qt.Key_Up: b"\x1b[A",
+        QtCore.Qt.Key_Down: b"\x1b[B",
+        QtCore.Qt.Key_Right: b"\x1b[C",
+        QtCore.Qt.Key_Left: b"\x1b[D",
+        QtCore.Qt.Key_Home: b"\x1b[H",
+        QtCore.Qt.Key_End: b"\x1b[F",
+        QtCore.Qt.Key_Delete: b"\x1b[3~",
+    }
+
+    def __init__(self, session, parent=None):
+
+        super().__init__(parent)
+        self._session = session
+        self.setReadOnly(True)
+        self.setTextInteractionFlags(QtCore.Qt.TextSelectableByMouse | QtCore.Qt.TextSelectableByKeyboard)
+        self.setUndoRedoEnabled(False)
+        self.setMaximumBlockCount(self.SCROLLBACK_LINES)
+        self.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+        self.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+        self.setFocusPolicy(QtCore.Qt.StrongFocus)
+        session.data_received_signal.connect(self.appendOutput)
+
+    def session(self):
+        """
+        :returns: TelnetSession instance
+        """
+
+        return self._session
+
+    @qslot
+    def appendOutput(self, text):
+        """
+        Displays the output of the session.
+
+        :param text: decoded text
+        """
+
+        text = self._ESCAPE_SEQUENCE_RE.sub("", text).replace("\r\n", "\n")
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() == scrollbar.maximum()
+        cursor = self.textCursor()
+        cursor.movePosition(QtGui.QTextCursor.End)
+        # the devices erase a character with a backspace
+        for index, part in enumerate(text.split("\b")):
+            if index > 0:
+                cursor.deletePreviousChar()
+            part = self._CONTROL_CHARACTERS_RE.sub("", part.replace("\r", ""))
+            if part:
+                cursor.insertText(part)
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def keyPressEvent(self, event):
+        """
+        Sends the keys to the session, the copy shortcut is kept.
+
+        :param event: QKeyEvent
+        """
+
+        if event.matches(QtGui.QKeySequence.Copy) and self.textCursor().hasSelection():
+            super().keyPressEvent(event)
+            return
+        if event.matches(QtGui.QKeySequence.Paste) or (event.key() == QtCore.Qt.Key_Insert and event.modifiers() & QtCore.Qt.ShiftModifier):
+            text = QtWidgets.QApplication.clipboard().text()
+            if text:
+                self._session.send(text.replace("\r\n", "\n").replace("\n", "\r").encode("utf-8"))
+            return
+
+        data = self._KEYS.get(event.key())
+        if data is None and event.text():
+            data = event.text().encode("utf-8")
+        if data is not None:
+            self._session.send(data)
+        else:
+            super().keyPressEvent(event)
+
+    def focusNextPrevChild(self, next):
+
+        # the tab key is sent to the console
+        return False
+
+
+class TelnetConsoleDock(QtWidgets.QDockWidget):
+
+    """
+    Dock with a tab for each built-in telnet console and a line
+    to broadcast a command to the consoles of the selected nodes.
+
+    :param parent: Parent widget
+    """
+
+    # how often the session logs are written to the disk (in milliseconds)
+    LOG_FLUSH_INTERVAL = 2000
+
+    def __init__(self, parent=None):
+
+        super().__init__("Consoles", parent)
+        self.setObjectName("uiTelnetConsoleDockWidget")
+        # (node id, port) => tab widget
+        self._consoles = {}
+
+        contents = QtWidgets.QWidget(self)
+        layout = QtWidgets.QVBoxLayout(contents)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self._tab_widget = QtWidgets.QTabWidget(contents)
+        self._tab_widget.setTabsClosable(True)
+        self._tab_widget.setMovable(True)
+        self._tab_widget.setDocumentMode(True)
+        self._tab_widget.tabCloseRequested.connect(self._tabCloseRequestedSlot)
+        layout.addWidget(self._tab_widget)
+
+        broadcast_layout = QtWidgets.QHBoxLayout()
+        self._broadcast_line_edit = QtWidgets.QLineEdit(contents)
+        self._broadcast_line_edit.setPlaceholderText("Broadcast to selected nodes")
+        self._broadcast_line_edit.setToolTip("Sends a command to the consoles of the nodes selected in the topology "
+                                             "or to the current console if no node is selected")
+        self._broadcast_line_edit.returnPressed.connect(self._broadcastSlot)
+        broadcast_layout.addWidget(self._broadcast_line_edit)
+        broadcast_button = QtWidgets.QPushButton("Send", contents)
+        broadcast_button.clicked.connect(self._broadcastSlot)
+        broadcast_layout.addWidget(broadcast_button)
+        layout.addLayout(broadcast_layout)
+        self.setWidget(contents)
+
+        # a single timer writes the logs of all the sessions
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setInterval(self.LOG_FLUSH_INTERVAL)
+        self._flush_timer.timeout.connect(self._flushLogsSlot)
+        self._flush_timer.start()
+
+        QtWidgets.QApplication.instance().aboutToQuit.connect(self.closeAll)
+
+    def openConsole(self, node, port):
+        """
+        Shows the console of a node, the tab of the node is reused
+        if the console is already open.
+
+        :param node: The node
+        :param port: Console port
+        """
+
+        key = (node.id(), port)
+        widget = self._consoles.get(key)
+        if widget is None:
+            from .main_window import MainWindow
+            settings = MainWindow.instance().settings()
+            session = TelnetSession(node.consoleHost(),
+                                    port,
+                                    log_path=self._logPath(node, port),
+                                    log_max_size=settings["console_log_max_size"],
+                                    log_backups=settings["console_log_backups"],
+                                    parent=self)
+            widget = TelnetConsoleWidget(session)
+            widget.setProperty("node_name", node.name())
+            session.state_changed_signal.connect(qpartial(self._updateTab, widget))
+            self._consoles[key] = widget
+            self._tab_widget.addTab(widget, node.name())
+            log.debug("Console log for {}: {}".format(node.name(), session.logPath()))
+
+        widget.session().connectToConsole()
+        self._tab_widget.setCurrentWidget(widget)
+        self.show()
+        self.raise_()
+        widget.setFocus()
+
+    def consoles(self):
+        """
+        :returns: dictionary (node id, port) => TelnetConsoleWidget
+        """
+
+        return dict(self._consoles)
+
+    @staticmethod
+    def _logPath(node, port):
+        """
+        :returns: Path of the log of a console
+        """
+
+        from .local_config import LocalConfig
+        directory = os.path.join(os.path.dirname(LocalConfig.instance().configFilePath()),
+                                 "console_logs",
+                                 normalize_filename(node.project().name()) or node.project().id())
+        return os.path.join(directory, "{}_{}.log".format(normalize_filename(node.name()) or node.id(), port))
+
+    def _updateTab(self, widget):
+
+        index = self._tab_widget.indexOf(widget)
+        if index < 0:
+            return
+        name = widget.property("node_name")
+        if widget.session().isConnected():
+            self._tab_widget.setTabText(index, name)
+        else:
+            self._tab_widget.setTabText(index, "{} (disconnected)".format(name))
+
+    def _selectedNodeIds(self):
+        """
+        :returns: ids of the nodes selected in the topology
+        """
+
+        from .main_window import MainWindow
+        from .items.node_item import NodeItem
+        items = MainWindow.instance().uiGraphicsView.scene().selectedItems()
+        return {item.node().id() for item in items if isinstance(item, NodeItem)}
+
+    @qslot
+    def _broadcastSlot(self, *args):
+
+        text = self._broadcast_line_edit.text()
+        node_ids = self._selectedNodeIds()
+        if node_ids:
+            widgets = [widget for (node_id, _), widget in self._consoles.items() if node_id in node_ids]
+        else:
+            widgets = [self._tab_widget.currentWidget()] if self._tab_widget.currentWidget() else []
+
+        data = text.encode("utf-8") + b"\r\0"
+        sent = 0
+        for widget in widgets:
+            if widget.session().isConnected():
+                widget.session().send(data)
+                sent += 1
+        if not sent:
+            log.warning("No open console to send the command to")
+            return
+        log.debug("Command sent to {} console(s)".format(sent))
+        self._broadcast_line_edit.clear()
+
+    @qslot
+    def _tabCloseRequestedSlot(self, index):
+
+        widget = self._tab_widget.widget(index)
+        for key, console in list(self._consoles.items()):
+            if console is widget:
+                del self._consoles[key]
+        self._tab_widget.removeTab(index)
+        widget.session().close()
+        widget.session().deleteLater()
+        widget.deleteLater()
+
+    @qslot
+    def _flushLogsSlot(self, *args):
+
+        for widget in self._consoles.values():
+            widget.session().flushLog()
+
+    @qslot
+    def closeAll(self, *args):
+        """
+        Closes all the consoles.
+        """
+
+        while self._tab_widget.count():
+            self._tabCloseRequestedSlot(0)
+
+    @staticmethod
+    def instance():
+        """
+        Singleton to return only one instance of TelnetConsoleDock,
+        the dock is added to the main window next to the console view.
+
+        :returns: instance of TelnetConsoleDock
+        """
+
+        if not hasattr(TelnetConsoleDock, "_instance") or TelnetConsoleDock._instance is None:
+            from .main_window import MainWindow
+            main_window = MainWindow.instance()
+            dock = TelnetConsoleDock(main_window)
+            main_window.addDockWidget(QtCore.Qt.BottomDockWidgetArea, dock)
+            main_window.tabifyDockWidget(main_window.uiConsoleDockWidget, dock)
+            main_window.uiDocksMenu.addAction(dock.toggleViewAction())
+            TelnetConsoleDock._instance = dock
+        return TelnetConsoleDock._instance
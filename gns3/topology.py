@@ -47,6 +47,8 @@ class Topology(QtCore.QObject):
     """
     node_added_signal = QtCore.Signal(int)
     project_changed_signal = QtCore.Signal()
+    bulk_load_started_signal = QtCore.Signal()
+    bulk_load_finished_signal = QtCore.Signal()
 
     def __init__(self):
 
@@ -57,6 +59,22 @@ class Topology(QtCore.QObject):
         self._notes = []
         self._drawings = []
         self._images = []
+
+        # indexes used for fast lookups, they are kept in sync
+        # by the add/remove methods and when an identifier changes
+        self._nodes_by_id = {}
+        self._nodes_by_node_id = {}
+        self._links_by_id = {}
+        self._links_by_link_id = {}
+        self._drawings_by_drawing_id = {}
+        # link connected to each (node, port)
+        self._links_by_port = {}
+
+        # during a bulk load the node added signals are sent
+        # only once all the items have been created
+        self._bulk_loading = False
+        self._deferred_node_ids = []
+
         self._project = None
         self._main_window = None
 
@@ -122,6 +140,7 @@ class Topology(QtCore.QObject):
             self._project.stopListenNotifications()
 
         self._main_window.uiGraphicsView.reset()
+        self.endBulkLoad()
         self._project = project
         if project:
             self._project.project_updated_signal.connect(self._projectUpdatedSlot)
@@ -304,7 +323,47 @@ It is your responsability to check if you have the right to distribute the image
         """
 
         self._nodes.append(node)
-        self.node_added_signal.emit(node.id())
+        self._nodes_by_id[node.id()] = node
+        if hasattr(node, "node_id"):
+            self._nodes_by_node_id[node.node_id()] = node
+        if self._bulk_loading:
+            self._deferred_node_ids.append(node.id())
+        else:
+            self.node_added_signal.emit(node.id())
+
+    def beginBulkLoad(self):
+        """
+        Starts a bulk load: the scene indexing and the view updates are
+        suspended and the node added signals are deferred until endBulkLoad()
+        """
+
+        if self._bulk_loading:
+            return
+        self._bulk_loading = True
+        self._main_window.uiGraphicsView.beginBulkLoad()
+        self.bulk_load_started_signal.emit()
+
+    def endBulkLoad(self):
+        """
+        Ends a bulk load and sends the deferred node added signals.
+        """
+
+        if not self._bulk_loading:
+            return
+        self._main_window.uiGraphicsView.endBulkLoad()
+        deferred_node_ids = self._deferred_node_ids
+        self._deferred_node_ids = []
+        for base_node_id in deferred_node_ids:
+            self.node_added_signal.emit(base_node_id)
+        self._bulk_loading = False
+        self.bulk_load_finished_signal.emit()
+
+    def bulkLoading(self):
+        """
+        :returns: Boolean True if a bulk load is in progress
+        """
+
+        return self._bulk_loading
 
     def removeNode(self, node):
         """
@@ -315,6 +374,24 @@ It is your responsability to check if you have the right to distribute the image
 
         if node in self._nodes:
             self._nodes.remove(node)
+            self._removeFromIndex(self._nodes_by_id, node.id(), node)
+            if hasattr(node, "node_id"):
+                self._removeFromIndex(self._nodes_by_node_id, node.node_id(), node)
+
+    def updateNodeIndex(self, node, old_id=None, old_node_id=None):
+        """
+        Updates the node indexes after an identifier of the node has changed.
+        Nothing is done if the node is not part of this topology.
+
+        :param node: Node instance
+        :param old_id: previous base node identifier
+        :param old_node_id: previous node uuid
+        """
+
+        if old_id is not None and self._removeFromIndex(self._nodes_by_id, old_id, node):
+            self._nodes_by_id[node.id()] = node
+        if old_node_id is not None and self._removeFromIndex(self._nodes_by_node_id, old_node_id, node):
+            self._nodes_by_node_id[node.node_id()] = node
 
     def getNodeFromUuid(self, node_id):
         """
@@ -323,10 +400,7 @@ It is your responsability to check if you have the right to distribute the image
         :returns: Node instance or None
         """
 
-        for node in self._nodes:
-            if hasattr(node, "node_id") and node.node_id() == node_id:
-                return node
-        return None
+        return self._nodes_by_node_id.get(node_id)
 
     def getNode(self, base_node_id):
         """
@@ -335,10 +409,7 @@ It is your responsability to check if you have the right to distribute the image
         :returns: Node instance or None
         """
 
-        for node in self._nodes:
-            if node.id() == base_node_id:
-                return node
-        return None
+        return self._nodes_by_id.get(base_node_id)
 
     def addLink(self, link):
         """
@@ -348,12 +419,16 @@ It is your responsability to check if you have the right to distribute the image
         :returns: Boolean false if link already exists
         """
 
-        for l in self._links:
-            if (l._source_node == link._destination_node and l._source_port == link._destination_port) or \
-                    (l._source_node == link._source_node and l._source_port == link._source_port):
-                return False
+        source = (link._source_node, link._source_port)
+        destination = (link._destination_node, link._destination_port)
+        if source in self._links_by_port or destination in self._links_by_port:
+            return False
 
         self._links.append(link)
+        self._links_by_port[source] = link
+        self._links_by_port[destination] = link
+        self._links_by_id[link.id()] = link
+        self._links_by_link_id[link.link_id()] = link
         return True
 
     def removeLink(self, link):
@@ -365,6 +440,22 @@ It is your responsability to check if you have the right to distribute the image
 
         if link in self._links:
             self._links.remove(link)
+            self._removeFromIndex(self._links_by_id, link.id(), link)
+            self._removeFromIndex(self._links_by_link_id, link.link_id(), link)
+            self._removeFromIndex(self._links_by_port, (link._source_node, link._source_port), link)
+            self._removeFromIndex(self._links_by_port, (link._destination_node, link._destination_port), link)
+
+    def updateLinkIndex(self, link, old_link_id):
+        """
+        Updates the link index after the link uuid has changed.
+        Nothing is done if the link is not part of this topology.
+
+        :param link: Link instance
+        :param old_link_id: previous link uuid
+        """
+
+        if self._removeFromIndex(self._links_by_link_id, old_link_id, link):
+            self._links_by_link_id[link.link_id()] = link
 
     def getLink(self, link_id):
         """
@@ -373,10 +464,19 @@ It is your responsability to check if you have the right to distribute the image
         :returns: Link instance or None
         """
 
-        for link in self._links:
-            if link.id() == link_id:
-                return link
-        return None
+        return self._links_by_id.get(link_id)
+
+    def getLinkFromPort(self, node, port):
+        """
+        Lookups for the link connected to a port.
+
+        :param node: Node instance
+        :param port: Port instance
+
+        :returns: Link instance or None
+        """
+
+        return self._links_by_port.get((node, port))
 
     def getLinkFromUuid(self, link_id):
         """
@@ -385,10 +485,7 @@ It is your responsability to check if you have the right to distribute the image
         :returns: Link instance or None
         """
 
-        for link in self._links:
-            if link.link_id() == link_id:
-                return link
-        return None
+        return self._links_by_link_id.get(link_id)
 
     def addNote(self, note):
         """
@@ -417,6 +514,7 @@ It is your responsability to check if you have the right to distribute the image
         """
 
         self._drawings.append(drawing)
+        self._drawings_by_drawing_id[drawing.drawing_id()] = drawing
 
     def removeDrawing(self, drawing):
         """
@@ -427,6 +525,19 @@ It is your responsability to check if you have the right to distribute the image
 
         if drawing in self._drawings:
             self._drawings.remove(drawing)
+            self._removeFromIndex(self._drawings_by_drawing_id, drawing.drawing_id(), drawing)
+
+    def updateDrawingIndex(self, drawing, old_drawing_id):
+        """
+        Updates the drawing index after the drawing identifier has changed.
+        Nothing is done if the drawing is not part of this topology.
+
+        :param drawing: DrawingItem instance
+        :param old_drawing_id: previous drawing identifier
+        """
+
+        if self._removeFromIndex(self._drawings_by_drawing_id, old_drawing_id, drawing):
+            self._drawings_by_drawing_id[drawing.drawing_id()] = drawing
 
     def getDrawingFromUuid(self, drawing_id):
         """
@@ -435,10 +546,20 @@ It is your responsability to check if you have the right to distribute the image
         :returns: Node instance or None
         """
 
-        for drawing in self._drawings:
-            if drawing.drawing_id() == drawing_id:
-                return drawing
-        return None
+        return self._drawings_by_drawing_id.get(drawing_id)
+
+    @staticmethod
+    def _removeFromIndex(index, key, value):
+        """
+        Removes an entry from an index only if it points to the given value.
+
+        :returns: Boolean True if the entry has been removed
+        """
+
+        if key in index and index[key] is value:
+            del index[key]
+            return True
+        return False
 
     def nodes(self):
         """
@@ -485,6 +606,13 @@ It is your responsability to check if you have the right to distribute the image
         self._notes.clear()
         self._drawings.clear()
         self._images.clear()
+        self._nodes_by_id.clear()
+        self._nodes_by_node_id.clear()
+        self._links_by_id.clear()
+        self._links_by_link_id.clear()
+        self._drawings_by_drawing_id.clear()
+        self._links_by_port.clear()
+        self._deferred_node_ids.clear()
 
     def __str__(self):
 
@@ -529,16 +657,9 @@ It is your responsability to check if you have the right to distribute the image
                 return
 
             link_side = link_data["nodes"][0]
-
-            for port in source_node.ports():
-                if port.adapterNumber() == link_side["adapter_number"] and port.portNumber() == link_side["port_number"]:
-                    source_port = port
-                    break
+            source_port = source_node.getPort(link_side["adapter_number"], link_side["port_number"])
             link_side = link_data["nodes"][1]
-            for port in destination_node.ports():
-                if port.adapterNumber() == link_side["adapter_number"] and port.portNumber() == link_side["port_number"]:
-                    destination_port = port
-                    break
+            destination_port = destination_node.getPort(link_side["adapter_number"], link_side["port_number"])
         if source_port is None or destination_port is None:
             return
         self._main_window.uiGraphicsView.addLink(source_node, source_port, destination_node, destination_port, **link_data)
@@ -101,7 +101,7 @@ class TopologyNodeItem(QtWidgets.QTreeWidgetItem):
         else:
             self.setText(1, "not supported")
         self.refreshLinks()
-        self._parent.invisibleRootItem().sortChildren(0, QtCore.Qt.AscendingOrder)
+        self._parent.sortNodes()
 
     def refreshLinks(self):
         """
@@ -168,6 +168,9 @@ class TopologySummaryView(QtWidgets.QTreeWidget):
         self._topology = Topology.instance()
         self._topology.node_added_signal.connect(self._nodeAddedSlot)
         self._topology.project_changed_signal.connect(self._projectChangedSlot)
+        self._topology.bulk_load_started_signal.connect(self._bulkLoadStartedSlot)
+        self._topology.bulk_load_finished_signal.connect(self._bulkLoadFinishedSlot)
+        self._bulk_loading = False
         self.itemSelectionChanged.connect(self._itemSelectionChangedSlot)
         self.show_only_devices_with_capture = False
         self.show_only_devices_with_filters = False
@@ -182,6 +185,32 @@ class TopologySummaryView(QtWidgets.QTreeWidget):
 
         self.clear()
 
+    @qslot
+    def _bulkLoadStartedSlot(self, *args):
+        """
+        Stops sorting the nodes while the topology is bulk loaded.
+        """
+
+        self._bulk_loading = True
+
+    @qslot
+    def _bulkLoadFinishedSlot(self, *args):
+        """
+        Sorts the nodes once the bulk load is finished.
+        """
+
+        self._bulk_loading = False
+        self.sortNodes()
+        self.resizeColumnToContents(0)
+
+    def sortNodes(self):
+        """
+        Sorts the nodes by name, except during a bulk load.
+        """
+
+        if not self._bulk_loading:
+            self.invisibleRootItem().sortChildren(0, QtCore.Qt.AscendingOrder)
+
     def refreshAllLinks(self, source_child=None):
         """
         Refreshes all links for all items.
@@ -217,7 +246,8 @@ class TopologySummaryView(QtWidgets.QTreeWidget):
             return
         self.nodes_id.add(node.id())
         TopologyNodeItem(self, node)
-        self.resizeColumnToContents(0)
+        if not self._bulk_loading:
+            self.resizeColumnToContents(0)
 
     @qslot
     def _itemSelectionChangedSlot(self, *args):
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Copy of large files (disk images) by chunks.
+
+The holes of sparse files are kept, only the data segments are copied.
+When the system supports it the data is copied by the kernel with
+copy_file_range, which can also share the blocks (reflink) on
+filesystems like Btrfs or XFS.
+"""
+
+import os
+import errno
+import shutil
+
+import logging
+log = logging.getLogger(__name__)
+
+
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# copy_file_range errors meaning the copy must be done by hand
+_COPY_FILE_RANGE_UNSUPPORTED = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF, errno.EPERM}
+
+
+def data_segments(fd, size):
+    """
+    Returns the parts of a file containing data, the rest are holes.
+
+    :param fd: file descriptor
+    :param size: size of the file
+    :returns: list of (start, end) offsets
+    """
+
+    if size == 0:
+        return []
+    if not hasattr(os, "SEEK_DATA"):
+        return [(0, size)]
+
+    segments = []
+    offset = 0
+    try:
+        while offset < size:
+            try:
+                start = os.lseek(fd, offset, os.SEEK_DATA)
+            except OSError as e:
+                if e.errno == errno.ENXIO:
+                    # only a hole until the end of the file
+                    break
+                raise
+            end = min(os.lseek(fd, start, os.SEEK_HOLE), size)
+            segments.append((start, end))
+            offset = end
+    except OSError as e:
+        log.debug("Cannot find the holes of the file: {}".format(e))
+        return [(0, size)]
+    return segments
+
+
+def copy_file(source, destination, progress_callback=None, is_cancelled=None, preserve_metadata=True, chunk_size=CHUNK_SIZE):
+    """
+    Copies a file by chunks, the holes of a sparse file are not written.
+
+    :param source: path to the source file
+    :param destination: path to the destination file
+    :param progress_callback: called with the number of bytes processed after each chunk
+    :param is_cancelled: called before each chunk, the copy stops if it returns True
+    :param preserve_metadata: copy the timestamps like shutil.copy2,
+    otherwise only the permissions like shutil.copy
+    :param chunk_size: size of the chunks in bytes
+    :returns: True if the file is copied, False if the copy is cancelled
+    """
+
+    flags = getattr(os, "O_BINARY", 0)
+    source_fd = os.open(source, os.O_RDONLY | flags)
+    try:
+        size = os.fstat(source_fd).st_size
+        destination_fd = os.open(destination, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | flags, 0o666)
+        try:
+            use_copy_file_range = hasattr(os, "copy_file_range")
+            copied = 0
+            for start, end in data_segments(source_fd, size):
+                if progress_callback and start > copied:
+                    # skipped hole
+                    progress_callback(start - copied)
+                offset = start
+                while offset < end:
+                    if is_cancelled and is_cancelled():
+                        return False
+                    length = min(chunk_size, end - offset)
+                    if use_copy_file_range:
+                        try:
+                            length = _copy_file_range(source_fd, destination_fd, offset, length)
+                        except OSError as e:
+                            if e.errno not in _COPY_FILE_RANGE_UNSUPPORTED:
+                                raise
+                            use_copy_file_range = False
+                    if not use_copy_file_range:
+                        length = _copy_range(source_fd, destination_fd, offset, length)
+                    if length == 0:
+                        # the source file is shorter than expected
+                        break
+                    offset += length
+                    if progress_callback:
+                        progress_callback(length)
+                copied = offset
+            if progress_callback and size > copied:
+                progress_callback(size - copied)
+            # the file ends with a hole or only contains holes
+            os.ftruncate(destination_fd, size)
+        finally:
+            os.close(destination_fd)
+    finally:
+        os.close(source_fd)
+
+    if preserve_metadata:
+        shutil.copystat(source, destination)
+    else:
+        shutil.copymode(source, destination)
+    return True
+
+
+def _copy_file_range(source_fd, destination_fd, offset, length):
+    """
+    Copies a part of a file in the kernel.
+
+    :returns: number of bytes copied
+    """
+
+    copied = 0
+    while copied < length:
+        count = os.copy_file_range(source_fd, destination_fd, length - copied, offset + copied, offset + copied)
+        if count == 0:
+            break
+        copied += count
+    return copied
+
+
+def _copy_range(source_fd, destination_fd, offset, length):
+    """
+    Copies a part of a file by reading and writing it.
+
+    :returns: number of bytes copied
+    """
+
+    os.lseek(source_fd, offset, os.SEEK_SET)
+    data = os.read(source_fd, length)
+    os.lseek(destination_fd, offset, os.SEEK_SET)
+    view = memoryview(data)
+    while view:
+        written = os.write(destination_fd, view)
+        view = view[written:]
+    return len(data)
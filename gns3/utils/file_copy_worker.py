@@ -19,8 +19,10 @@
 Thread to copy or move files without blocking the GUI.
 """
 
-import shutil
+import os
+import time
 from ..qt import QtCore
+from .file_copy import copy_file
 
 import logging
 log = logging.getLogger(__name__)
@@ -31,6 +33,9 @@ class FileCopyWorker(QtCore.QObject):
     """
     Worker to copy a file.
 
+    The file is copied by chunks, the progress is reported in percent
+    and the copy can be cancelled between two chunks.
+
     :param source: path to the source file
     :param destination: path to the destination file
     """
@@ -40,12 +45,19 @@ class FileCopyWorker(QtCore.QObject):
     finished = QtCore.pyqtSignal()
     updated = QtCore.pyqtSignal(int)
 
+    # minimum delay in seconds between two progress updates
+    PROGRESS_INTERVAL = 0.1
+
     def __init__(self, source, destination):
 
         super().__init__()
         self._is_running = False
         self._source = source
         self._destination = destination
+        self._size = 0
+        self._copied = 0
+        self._progress = None
+        self._last_update = 0
 
     def run(self):
         """
@@ -53,13 +65,54 @@ class FileCopyWorker(QtCore.QObject):
         """
 
         self._is_running = True
+        self._copied = 0
+        self._progress = None
+        self._last_update = 0
         try:
-            shutil.copy(self._source, self._destination)
+            self._size = os.path.getsize(self._source)
+            completed = copy_file(self._source,
+                                  self._destination,
+                                  progress_callback=self._progressCallback,
+                                  is_cancelled=self._isCancelled,
+                                  preserve_metadata=False)
         except OSError as e:
             log.warning("cannot copy: {}".format(e))
             self.error.emit("Could not copy file to {}: {}".format(self._destination, e), False)
+            self.finished.emit()
+            return
+
+        if not completed:
+            log.debug("Copy of {} cancelled".format(self._source))
+            try:
+                os.remove(self._destination)
+            except OSError as e:
+                log.warning("Cannot remove incomplete copy {}: {}".format(self._destination, e))
+            return
+
+        self.updated.emit(100)
         self.finished.emit()
 
+    def _progressCallback(self, size):
+        """
+        Emits the progress, at most every PROGRESS_INTERVAL.
+
+        :param size: bytes copied since the last call
+        """
+
+        self._copied += size
+        now = time.monotonic()
+        if now - self._last_update < self.PROGRESS_INTERVAL or not self._size:
+            return
+        progress = int(self._copied * 100 / self._size)
+        if progress != self._progress:
+            self._last_update = now
+            self._progress = progress
+            self.updated.emit(progress)
+
+    def _isCancelled(self):
+
+        return not self._is_running
+
     def cancel(self):
         """
         Stops this worker.
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import re
+import json
+import codecs
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class JSONStreamDecoder:
+    """
+    Incremental decoder for a stream of JSON documents like
+    the notification feed. The data are received by chunks
+    and a document can be split between two chunks.
+
+    The end of a document is found by scanning only the new data
+    (nesting depth and strings), each document is decoded once
+    when it is complete. The invalid data are skipped up to the
+    next object.
+    """
+
+    _WHITESPACE = re.compile(r"[ \t\n\r\0]*")
+    # characters changing the structure outside and inside a string
+    _STRUCTURE = re.compile(r'["{}\[\]]')
+    _STRING_END = re.compile(r'["\\]')
+    # number, true, false or null, ended by a whitespace or a structure character
+    _SCALAR = re.compile(r'[^ \t\n\r\0{}\[\]",]*')
+
+    # the decoded documents are removed from the buffer
+    # when they take more than this number of characters
+    COMPACT_SIZE = 64 * 1024
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        # UTF-8 characters can also be split between two chunks,
+        # the invalid bytes don't stop the stream
+        self._codec = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._buffer = ""
+        # start of the first document not decoded
+        self._offset = 0
+        # state of the scan of the current document
+        self._scan = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+
+    def feed(self, data):
+        """
+        Decodes all the complete documents available.
+
+        :param data: bytes received
+        :returns: list of documents
+        """
+
+        text = self._codec.decode(data)
+        if self._offset == len(self._buffer):
+            # everything has been decoded
+            self._buffer = text
+            self._offset = self._scan = 0
+        else:
+            if self._offset >= self.COMPACT_SIZE:
+                self._buffer = self._buffer[self._offset:]
+                self._scan -= self._offset
+                self._offset = 0
+            self._buffer += text
+
+        documents = []
+        while True:
+            if not self._started:
+                self._offset = self._WHITESPACE.match(self._buffer, self._offset).end()
+                if self._offset == len(self._buffer):
+                    break
+                if self._buffer[self._offset] not in '{["':
+                    end = self._SCALAR.match(self._buffer, self._offset).end()
+                    if end == len(self._buffer):
+                        # the next chunk can continue the value
+                        break
+                    try:
+                        document = self._decoder.decode(self._buffer[self._offset:end])
+                    except ValueError as e:
+                        log.warning("Invalid JSON data received: {}".format(e))
+                        self._skip()
+                        continue
+                    documents.append(document)
+                    self._offset = end
+                    continue
+                self._started = True
+                self._scan = self._offset
+
+            end = self._scanDocument()
+            if end is None:
+                break
+            try:
+                document, end = self._decoder.raw_decode(self._buffer, self._offset)
+                documents.append(document)
+            except ValueError as e:
+                log.warning("Invalid JSON document received: {}".format(e))
+            self._offset = end
+            self._started = False
+        return documents
+
+    def _skip(self):
+        """
+        Skips the data up to the next object.
+        """
+
+        index = self._buffer.find("{", self._offset + 1)
+        self._offset = index if index >= 0 else len(self._buffer)
+
+    def _scanDocument(self):
+        """
+        Continues the scan of the current document.
+
+        :returns: end of the document or None if it's not complete
+        """
+
+        buffer = self._buffer
+        index = self._scan
+        while True:
+            if self._in_string:
+                match = self._STRING_END.search(buffer, index)
+                if match is None:
+                    self._scan = len(buffer)
+                    return None
+                if match.group() == "\\":
+                    if match.end() == len(buffer):
+                        # the escaped character is in the next chunk
+                        self._scan = match.start()
+                        return None
+                    index = match.end() + 1
+                    continue
+                self._in_string = False
+                index = match.end()
+                if self._depth == 0:
+                    self._scan = index
+                    return index
+            else:
+                match = self._STRUCTURE.search(buffer, index)
+                if match is None:
+                    self._scan = len(buffer)
+                    return None
+                token = match.group()
+                index = match.end()
+                if token == '"':
+                    self._in_string = True
+                elif token in "{[":
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._scan = index
+                        return index
+
+    def pending(self):
+        """
+        :returns: Number of characters waiting for the end of a document
+        """
+
+        return len(self._buffer) - self._offset
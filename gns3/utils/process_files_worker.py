@@ -20,8 +20,12 @@ Thread to copy or move files without blocking the GUI.
 """
 
 import os
+import json
 import shutil
+import threading
+import concurrent.futures
 from ..qt import QtCore
+from .file_copy import copy_file
 
 import logging
 log = logging.getLogger(__name__)
@@ -32,6 +36,11 @@ class ProcessFilesWorker(QtCore.QObject):
     """
     Thread to process files (copy or move).
 
+    The progress is computed from the size of the files. The large files
+    are copied in parallel and a manifest of the copied files is kept in
+    the destination directory when the copy is cancelled, a new copy to the
+    same destination skips them.
+
     :param source_dir: path to the source directory
     :param destination_dir: path to the destination directory (created if doesn't exist)
     :param move: indicates if the files must be moved instead of copied
@@ -42,6 +51,11 @@ class ProcessFilesWorker(QtCore.QObject):
     finished = QtCore.pyqtSignal()
     updated = QtCore.pyqtSignal(int)
 
+    MANIFEST_FILE = ".gns3_copy_manifest.json"
+    # files copied on the thread pool
+    LARGE_FILE_SIZE = 64 * 1024 * 1024
+    MAX_PARALLEL_COPIES = 4
+
     def __init__(self, source_dir, destination_dir, move=False, skip_dirs=None, skip_files=None):
 
         super().__init__()
@@ -50,11 +64,15 @@ class ProcessFilesWorker(QtCore.QObject):
         self._destination = destination_dir
         self._move = move
         self._skip_dirs = []
-        self._skip_files = []
+        self._skip_files = [self.MANIFEST_FILE]
         if skip_dirs:
             self._skip_dirs = skip_dirs
         if skip_files:
-            self._skip_files = skip_files
+            self._skip_files.extend(skip_files)
+        self._lock = threading.Lock()
+        self._total_size = 0
+        self._processed_size = 0
+        self._progress = None
 
     def run(self):
         """
@@ -75,71 +93,205 @@ class ProcessFilesWorker(QtCore.QObject):
             self.finished.emit()
             return
 
-        copied = 0
         # start copying/moving from the source directory
         try:
-            # count the number of files in the source directory
-            file_count = self._countFiles(self._source)
-
-            for path, dirs, filenames in os.walk(self._source):
-                dirs[:] = [d for d in dirs if d not in self._skip_dirs]
-                filenames[:] = [f for f in filenames if f not in self._skip_files]
-                base_dir = path.replace(self._source, self._destination)
-
-                # start create the destination sub-directories
-                for directory in dirs:
-                    try:
-                        destination_dir = os.path.join(base_dir, directory)
-                        os.makedirs(destination_dir)
-                    except FileExistsError:
-                        pass
-                    except OSError as e:
-                        self.error.emit("Could not create directory {}: {}".format(destination_dir, e), True)
-                        return
-                    if not self._is_running:
-                        return
-
-                # finally the files themselves
-                for sfile in filenames:
-                    source_file = os.path.join(path, sfile)
-                    destination_file = os.path.join(base_dir, sfile)
-                    try:
-                        if self._move:
-                            shutil.move(source_file, destination_file)
-                        else:
-                            shutil.copy2(source_file, destination_file)
-                    except OSError as e:
-                        if self._move:
-                            log.warning("Cannot move: {}".format(e))
-                            self.error.emit("Could not move file to {}: {}".format(destination_file, e), False)
-                        else:
-                            log.warning("Cannot copy: {}".format(e))
-                            self.error.emit("Could not copy file to {}: {}".format(destination_file, e), False)
-                    if not self._is_running:
-                        return
-                    copied += 1
-                    # update the progress made
-                    progress = float(copied) / file_count * 100
-                    self.updated.emit(progress)
+            directories, files = self._listFiles()
         except RuntimeError:
             self.error.emit("Maximum path depth exceedeed when copying {}".format(self._source), True)
+            return
+
+        # start create the destination sub-directories
+        for destination_dir in directories:
+            try:
+                os.makedirs(destination_dir)
+            except FileExistsError:
+                pass
+            except OSError as e:
+                self.error.emit("Could not create directory {}: {}".format(destination_dir, e), True)
+                return
+            if not self._is_running:
+                return
+
+        # finally the files themselves
+        self._total_size = sum(f[3] for f in files)
+        self._processed_size = 0
+        self._progress = None
+        if self._move:
+            self._moveFiles(files)
+        else:
+            self._copyFiles(files)
+        if not self._is_running:
+            return
 
         # everything has been copied or moved, let's inform the GUI
         self.finished.emit()
 
-    def _countFiles(self, directory):
+    def _listFiles(self):
         """
-        Counts all the files in a directory.
+        Lists the directories and the files to process.
 
-        :param directory: path to the directory.
+        :returns: list of destination directories and list of files
+        (source path, destination path, relative path, size, modification time)
         """
 
-        count = 0
-        for _, dirs, files in os.walk(directory):
+        directories = []
+        files = []
+        for path, dirs, filenames in os.walk(self._source):
             dirs[:] = [d for d in dirs if d not in self._skip_dirs]
-            files[:] = [f for f in files if f not in self._skip_files]
-            count += len(files)
-        return count
+            filenames[:] = [f for f in filenames if f not in self._skip_files]
+            relative_dir = os.path.relpath(path, self._source)
+            for directory in dirs:
+                directories.append(os.path.normpath(os.path.join(self._destination, relative_dir, directory)))
+            for sfile in filenames:
+                source_file = os.path.join(path, sfile)
+                relative = os.path.normpath(os.path.join(relative_dir, sfile))
+                try:
+                    st = os.stat(source_file)
+                    size, mtime = st.st_size, st.st_mtime_ns
+                except OSError:
+                    # reported when the file is processed
+                    size, mtime = 0, 0
+                files.append((source_file, os.path.join(self._destination, relative), relative, size, mtime))
+        return directories, files
+
+    def _moveFiles(self, files):
+
+        for source_file, destination_file, _, size, _ in files:
+            try:
+                shutil.move(source_file, destination_file)
+            except OSError as e:
+                log.warning("Cannot move: {}".format(e))
+                self.error.emit("Could not move file to {}: {}".format(destination_file, e), False)
+            if not self._is_running:
+                return
+            self._addProgress(size)
+            self._updateProgress()
+
+    def _copyFiles(self, files):
+        """
+        Copies the small files one by one and the large ones on a thread pool.
+        """
+
+        manifest = self._loadManifest()
+        copied = {}
+        pending = []
+        for file in files:
+            source_file, destination_file, relative, size, mtime = file
+            if manifest.get(relative) == [size, mtime] and self._fileSize(destination_file) == size:
+                # already copied before the copy was cancelled
+                copied[relative] = [size, mtime]
+                self._addProgress(size)
+            else:
+                pending.append(file)
+        self._updateProgress()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.MAX_PARALLEL_COPIES) as executor:
+            futures = {}
+            for file in pending:
+                if not self._is_running:
+                    break
+                source_file, destination_file, relative, size, mtime = file
+                if size >= self.LARGE_FILE_SIZE:
+                    futures[executor.submit(self._copyFile, source_file, destination_file)] = file
+                else:
+                    if self._copyFile(source_file, destination_file):
+                        copied[relative] = [size, mtime]
+                    self._updateProgress()
+
+            while futures:
+                done, _ = concurrent.futures.wait(futures, timeout=0.2)
+                for future in done:
+                    _, _, relative, size, mtime = futures.pop(future)
+                    if future.result():
+                        copied[relative] = [size, mtime]
+                self._updateProgress()
+
+        if self._is_running:
+            self._removeManifest()
+        else:
+            self._saveManifest(copied)
+
+    def _copyFile(self, source_file, destination_file):
+        """
+        Copies a file, can be called from the thread pool.
+
+        :returns: True if the file is copied
+        """
+
+        try:
+            return copy_file(source_file, destination_file, progress_callback=self._addProgress, is_cancelled=self._isCancelled)
+        except OSError as e:
+            log.warning("Cannot copy: {}".format(e))
+            self.error.emit("Could not copy file to {}: {}".format(destination_file, e), False)
+        return False
+
+    def _isCancelled(self):
+
+        return not self._is_running
+
+    def _fileSize(self, path):
+
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return None
+
+    def _addProgress(self, size):
+
+        with self._lock:
+            self._processed_size += size
+
+    def _updateProgress(self):
+        """
+        Emits the progress made if it has changed.
+        """
+
+        if self._total_size:
+            progress = int(self._processed_size * 100 / self._total_size)
+        else:
+            progress = 100
+        if progress != self._progress:
+            self._progress = progress
+            self.updated.emit(progress)
+
+    def _manifestPath(self):
+
+        return os.path.join(self._destination, self.MANIFEST_FILE)
+
+    def _loadManifest(self):
+        """
+        :returns: Dictionary of the files copied by a cancelled copy
+        """
+
+        try:
+            with open(self._manifestPath()) as f:
+                manifest = json.load(f)
+            if manifest.get("source") == os.path.abspath(self._source):
+                return manifest.get("files", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError) as e:
+            log.warning("Cannot read the copy manifest: {}".format(e))
+        return {}
+
+    def _saveManifest(self, files):
+
+        path = self._manifestPath()
+        try:
+            with open(path + ".tmp", "w") as f:
+                json.dump({"source": os.path.abspath(self._source), "files": files}, f)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            log.warning("Cannot save the copy manifest: {}".format(e))
+
+    def _removeManifest(self):
+
+        try:
+            os.remove(self._manifestPath())
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            log.warning("Cannot remove the copy manifest: {}".format(e))
 
     def cancel(self):
         """
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class RollingLog:
+    """
+    Log file capped in size. When the file is full it is renamed with
+    a .1 suffix (the previous .1 becoming .2 and so on) and a new file
+    is started, the oldest file is removed.
+
+    :param path: Path of the log file
+    :param max_size: Maximum size of a file in bytes
+    :param backups: Number of full files kept
+    """
+
+    # the sizes come from the settings, a smaller size is raised to this one
+    MIN_SIZE = 1024
+
+    def __init__(self, path, max_size=1024 * 1024, backups=3):
+
+        self._path = path
+        self._max_size = max(int(max_size), self.MIN_SIZE)
+        self._backups = max(int(backups), 0)
+        self._file = None
+        self._size = 0
+
+    def path(self):
+        """
+        :returns: Path of the log file
+        """
+
+        return self._path
+
+    def _open(self):
+
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        self._file = open(self._path, "ab")
+        self._size = self._file.tell()
+
+    def write(self, data):
+        """
+        Appends data to the log, the data is split between two files
+        if it doesn't fit in the current one.
+
+        :param data: bytes
+        """
+
+        try:
+            if self._file is None:
+                self._open()
+            while data:
+                if self._size >= self._max_size:
+                    self._rotate()
+                chunk = data[:self._max_size - self._size]
+                self._file.write(chunk)
+                self._size += len(chunk)
+                data = data[len(chunk):]
+        except OSError as e:
+            log.warning("Can't write the log {}: {}".format(self._path, e))
+            self.close()
+
+    def _rotate(self):
+
+        self._file.close()
+        self._file = None
+        if self._backups > 0:
+            for index in range(self._backups - 1, 0, -1):
+                source = "{}.{}".format(self._path, index)
+                if os.path.exists(source):
+                    os.replace(source, "{}.{}".format(self._path, index + 1))
+            os.replace(self._path, self._path + ".1")
+        else:
+            os.remove(self._path)
+        self._open()
+
+    def flush(self):
+        """
+        Writes the buffered data to the disk.
+        """
+
+        if self._file is not None:
+            try:
+                self._file.flush()
+            except OSError as e:
+                log.warning("Can't write the log {}: {}".format(self._path, e))
+
+    def close(self):
+        """
+        Closes the log file.
+        """
+
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
@@ -0,0 +1,289 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import json
+import hashlib
+import collections
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class StaticAssetCache:
+    """
+    Disk cache of the static assets (symbols) downloaded from the controller.
+
+    The files are named after the hash of their content, so the same symbol
+    served under different URLs is only stored once. An index saved in the
+    cache directory keeps for each URL the file, its size and the validators
+    (ETag and Last-Modified) sent by the controller. The entries are kept
+    in least recently used order and the oldest are evicted when the cache
+    is bigger than the maximum size.
+
+    When the content of an URL changes, the previous file can still be used
+    by the items which received its path, it is kept until the eviction.
+    """
+
+    INDEX_FILE = "index.json"
+    DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        """
+        :param directory: Cache directory
+        :param max_size: Maximum size of the cached files in bytes
+        """
+
+        self._directory = directory
+        self._max_size = max_size
+        # URL => entry, the least recently used entry first
+        self._entries = collections.OrderedDict()
+        # File => number of entries using it
+        self._files = {}
+        # Files replaced by a new content, file => size
+        self._superseded = collections.OrderedDict()
+        self._size = 0
+        # URLs validated by the controller since the cache is loaded
+        self._validated = set()
+        self._dirty = False
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._load()
+
+    def directory(self):
+        """
+        :returns: Cache directory
+        """
+
+        return self._directory
+
+    def _load(self):
+        """
+        Loads the index, the entries with a missing file are dropped.
+        """
+
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            with open(os.path.join(self._directory, self.INDEX_FILE)) as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            log.warning("Can't load the static asset cache index: {}".format(e))
+            return
+
+        for url, entry in index.get("entries", []):
+            if os.path.exists(os.path.join(self._directory, entry["file"])):
+                self._addEntry(url, entry)
+            else:
+                self._dirty = True
+
+        # the superseded files of the previous session are not used anymore
+        try:
+            filenames = os.listdir(self._directory)
+        except OSError:
+            return
+        for filename in filenames:
+            if filename.endswith((".svg", ".png")) and filename not in self._files:
+                self._removeFile(filename)
+
+    def save(self):
+        """
+        Saves the index if it has changed.
+        """
+
+        if not self._dirty:
+            return
+        path = os.path.join(self._directory, self.INDEX_FILE)
+        try:
+            with open(path + ".tmp", "w") as f:
+                json.dump({"entries": list(self._entries.items())}, f)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            log.warning("Can't save the static asset cache index: {}".format(e))
+            return
+        self._dirty = False
+
+    def path(self, url):
+        """
+        Returns the cached file for an URL and marks it as recently used.
+
+        :param url: URL of the asset
+        :returns: Path or None if the URL is not cached
+        """
+
+        entry = self._entries.get(url)
+        if entry is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._entries.move_to_end(url)
+        return os.path.join(self._directory, entry["file"])
+
+    def validated(self, url):
+        """
+        :param url: URL of the asset
+        :returns: True if the controller has confirmed the cached file is up to date
+        """
+
+        return url in self._validated
+
+    def validationHeaders(self, url):
+        """
+        Returns the headers of a conditional request for an URL.
+
+        :param url: URL of the asset
+        :returns: Dictionary of headers
+        """
+
+        headers = {}
+        entry = self._entries.get(url)
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def setValidated(self, url):
+        """
+        Marks the cached file of an URL as up to date, like
+        when the controller replies Not Modified.
+
+        :param url: URL of the asset
+        """
+
+        if url in self._entries:
+            self._validated.add(url)
+
+    def store(self, url, data, etag=None, last_modified=None):
+        """
+        Stores the content of an URL.
+
+        :param url: URL of the asset
+        :param data: Content (bytes)
+        :param etag: ETag sent by the controller
+        :param last_modified: Last-Modified sent by the controller
+        :returns: Path of the cached file
+        """
+
+        if ".svg" in url:
+            extension = ".svg"
+        else:
+            extension = ".png"
+        filename = hashlib.sha1(data).hexdigest() + extension
+        path = os.path.join(self._directory, filename)
+
+        if filename in self._superseded:
+            # the previous content is back
+            self._size -= self._superseded.pop(filename)
+        elif filename not in self._files:
+            os.makedirs(self._directory, exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+
+        self._removeEntry(url, keep_file=True)
+        self._addEntry(url, {"file": filename, "size": len(data), "etag": etag, "last_modified": last_modified})
+        self._validated.add(url)
+        self._dirty = True
+        self._evict()
+        return path
+
+    def remove(self, url):
+        """
+        Removes an URL from the cache.
+
+        :param url: URL of the asset
+        """
+
+        if url in self._entries:
+            self._removeEntry(url)
+            self._dirty = True
+
+    def _addEntry(self, url, entry):
+
+        self._entries[url] = entry
+        if entry["file"] not in self._files:
+            self._files[entry["file"]] = 0
+            self._size += entry["size"]
+        self._files[entry["file"]] += 1
+
+    def _removeEntry(self, url, keep_file=False):
+        """
+        Removes an entry and its file if no other entry uses it.
+
+        :param keep_file: The file is kept until the eviction
+        """
+
+        entry = self._entries.pop(url, None)
+        if entry is None:
+            return
+        self._validated.discard(url)
+        self._files[entry["file"]] -= 1
+        if self._files[entry["file"]] == 0:
+            del self._files[entry["file"]]
+            if keep_file:
+                self._superseded[entry["file"]] = entry["size"]
+            else:
+                self._size -= entry["size"]
+                self._removeFile(entry["file"])
+
+    def _removeFile(self, filename):
+
+        try:
+            os.remove(os.path.join(self._directory, filename))
+        except OSError as e:
+            log.debug("Can't remove cached file {}: {}".format(filename, e))
+
+    def _evict(self):
+        """
+        Evicts the superseded files then the least recently used entries
+        until the cache fits in the maximum size. The last entry is always kept.
+        """
+
+        while self._size > self._max_size and self._superseded:
+            filename, size = self._superseded.popitem(last=False)
+            self._size -= size
+            self._removeFile(filename)
+        while self._size > self._max_size and len(self._entries) > 1:
+            url = next(iter(self._entries))
+            log.debug("Evict {} from the static asset cache".format(url))
+            self._removeEntry(url)
+            self._evictions += 1
+
+    def size(self):
+        """
+        :returns: Size of the cached files in bytes
+        """
+
+        return self._size
+
+    def statistics(self):
+        """
+        :returns: Dictionary with the number of entries, files, size, hits, misses and evictions
+        """
+
+        return {
+            "entries": len(self._entries),
+            "files": len(self._files),
+            "superseded": len(self._superseded),
+            "size": self._size,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions
+        }
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Minimal client side of the telnet protocol (RFC 854), independent of the
+transport. The server can echo and suppress the go ahead, every other
+option is refused.
+"""
+
+IAC = 255
+DONT = 254
+DO = 253
+WONT = 252
+WILL = 251
+SB = 250
+SE = 240
+
+ECHO = 1
+SGA = 3
+
+# options the client accepts the server to enable
+SERVER_OPTIONS = (ECHO, SGA)
+# options the client enables when the server asks for it
+CLIENT_OPTIONS = (SGA, )
+
+# states of the parser
+_DATA = 0
+_IAC = 1
+_OPTION = 2
+_SUBNEGOTIATION = 3
+_SUBNEGOTIATION_IAC = 4
+
+
+class TelnetProtocol:
+    """
+    Parses the data received from a telnet server.
+
+    The commands are removed from the data and the answers to the option
+    negotiations are returned with it, the commands can be split between
+    several chunks of data.
+    """
+
+    def __init__(self):
+
+        self._state = _DATA
+        self._command = None
+        # options already answered, to avoid negotiation loops
+        self._answered = {}
+
+    def feed(self, data):
+        """
+        Parses data received from the server.
+
+        :param data: bytes received
+        :returns: tuple (data to display, bytes to send back to the server)
+        """
+
+        if self._state == _DATA and IAC not in data:
+            # fast path, no command in the data
+            return bytes(data), b""
+
+        output = bytearray()
+        replies = bytearray()
+        for byte in data:
+            if self._state == _DATA:
+                if byte == IAC:
+                    self._state = _IAC
+                else:
+                    output.append(byte)
+            elif self._state == _IAC:
+                if byte == IAC:
+                    # escaped 255
+                    output.append(IAC)
+                    self._state = _DATA
+                elif byte in (DO, DONT, WILL, WONT):
+                    self._command = byte
+                    self._state = _OPTION
+                elif byte == SB:
+                    self._state = _SUBNEGOTIATION
+                else:
+                    # NOP, GA, AYT... nothing to do
+                    self._state = _DATA
+            elif self._state == _OPTION:
+                replies += self._negotiate(self._command, byte)
+                self._state = _DATA
+            elif self._state == _SUBNEGOTIATION:
+                if byte == IAC:
+                    self._state = _SUBNEGOTIATION_IAC
+            elif self._state == _SUBNEGOTIATION_IAC:
+                self._state = _DATA if byte == SE else _SUBNEGOTIATION
+        return bytes(output), bytes(replies)
+
+    def _negotiate(self, command, option):
+        """
+        Returns the answer to an option negotiation.
+        """
+
+        if command == WILL:
+            answer = DO if option in SERVER_OPTIONS else DONT
+        elif command == WONT:
+            answer = DONT
+        elif command == DO:
+            answer = WILL if option in CLIENT_OPTIONS else WONT
+        else:
+            answer = WONT
+
+        # answer only the changes of state (RFC 854 loop prevention)
+        if self._answered.get((command in (WILL, WONT), option)) == answer:
+            return b""
+        self._answered[(command in (WILL, WONT), option)] = answer
+        return bytes((IAC, answer, option))
+
+    def serverEchoes(self):
+        """
+        :returns: True if the server echoes the characters typed by the user
+        """
+
+        return self._answered.get((True, ECHO)) == DO
+
+    @staticmethod
+    def encode(data):
+        """
+        Escapes the data to send to the server.
+
+        :param data: bytes
+        :returns: bytes
+        """
+
+        return data.replace(b"\xff", b"\xff\xff")
@@ -16,21 +16,34 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """
-Thread to repeatedly try to connect to a network resource.
+Worker to repeatedly try to connect to a server until it is ready.
 """
 
-import socket
+import json
 import time
-from ..qt import QtCore
+import base64
+from ..qt import QtCore, QtNetwork, qslot
+
+import logging
+log = logging.getLogger(__name__)
 
 
 class WaitForConnectionWorker(QtCore.QObject):
 
     """
-    Thread to wait for a connection.
+    Waits for a server to be ready without blocking the event loop.
+
+    Each attempt opens a TCP connection to the port and, once the port
+    accepts connections, asks the server for its version. Failed attempts
+    are retried with an exponential backoff until the timeout.
 
     :param host: destination host or IP address
     :param port: destination port
+    :param protocol: protocol used to ask the version (http or https),
+    None to only check the port
+    :param user: user for the authentication
+    :param password: password for the authentication
+    :param timeout: how long to wait in seconds
     """
 
     # signals to update the progress dialog.
@@ -38,12 +51,31 @@ class WaitForConnectionWorker(QtCore.QObject):
     finished = QtCore.pyqtSignal()
     updated = QtCore.pyqtSignal(int)
 
-    def __init__(self, host, port):
+    # delays in seconds between two attempts
+    INITIAL_RETRY_DELAY = 0.05
+    MAX_RETRY_DELAY = 1.0
+    # maximum duration in seconds of an attempt
+    ATTEMPT_TIMEOUT = 2.0
+
+    def __init__(self, host, port, protocol="http", user=None, password=None, timeout=30.0):
 
         super().__init__()
         self._is_running = False
         self._host = host
         self._port = port
+        self._protocol = protocol
+        self._user = user
+        self._password = password
+        self._timeout = timeout
+        self._begin = None
+        self._retry_delay = self.INITIAL_RETRY_DELAY
+        self._attempts = 0
+        self._last_error = None
+        self._time_to_ready = None
+        self._socket = None
+        self._reply = None
+        self._network_manager = None
+        self._attempt_timer = None
 
     def run(self):
         """
@@ -51,40 +83,167 @@ class WaitForConnectionWorker(QtCore.QObject):
         """
 
         self._is_running = True
-        connection_success = False
-        begin = time.time()
-
-        # try to connect for 30 seconds
-        while time.time() - begin < 30.0:
-            if not self._is_running:
-                return
-            time.sleep(0.01)
-            sock = None
-            try:
-                sock = socket.create_connection((self._host, self._port), timeout=10)
-            except OSError as e:
-                last_exception = e
-                continue
-            finally:
-                if sock:
-                    sock.close()
-            connection_success = True
-            break
+        self._begin = time.monotonic()
+        self._retry_delay = self.INITIAL_RETRY_DELAY
+        self._attempts = 0
+        self._time_to_ready = None
+
+        # the objects must be created in the thread running the worker
+        self._attempt_timer = QtCore.QTimer()
+        self._attempt_timer.setSingleShot(True)
+        self._attempt_timer.timeout.connect(self._attemptTimeoutSlot)
+        self._network_manager = QtNetwork.QNetworkAccessManager()
+        self._connectToPort()
+
+    def timeToReady(self):
+        """
+        :returns: Seconds waited before the server was ready or None
+        """
+
+        return self._time_to_ready
+
+    def attempts(self):
+        """
+        :returns: Number of connection attempts
+        """
 
+        return self._attempts
+
+    def _connectToPort(self):
+        """
+        First step of an attempt: checks the port accepts connections.
+        """
+
+        if not self._is_running:
+            return
+        self._attempts += 1
+        self._socket = QtNetwork.QTcpSocket()
+        self._socket.connected.connect(self._connectedSlot)
+        self._socket.error.connect(self._socketErrorSlot)
+        self._attempt_timer.start(int(self.ATTEMPT_TIMEOUT * 1000))
+        self._socket.connectToHost(self._host, self._port)
+
+    @qslot
+    def _connectedSlot(self, *args):
+        """
+        The port is open, asks the server version if required.
+        """
+
+        if self._socket is None:
+            # the attempt has timed out
+            return
+        self._closeSocket()
         if not self._is_running:
             return
+        if self._protocol is None:
+            self._ready()
+            return
 
-        if not connection_success:
+        url = QtCore.QUrl("{}://{}:{}/v2/version".format(self._protocol, self._host, self._port))
+        if ":" in self._host:
+            # IPv6 address
+            url.setHost(self._host)
+        request = QtNetwork.QNetworkRequest(url)
+        if self._user:
+            credentials = base64.b64encode("{}:{}".format(self._user, self._password).encode()).decode()
+            request.setRawHeader(b"Authorization", "Basic {}".format(credentials).encode())
+        self._reply = self._network_manager.get(request)
+        # the local server use a self signed certificate
+        self._reply.sslErrors.connect(self._reply.ignoreSslErrors)
+        self._reply.finished.connect(self._versionReceivedSlot)
 
+    @qslot
+    def _socketErrorSlot(self, *args):
+
+        if self._socket is None:
+            # the socket has been closed by the worker
+            return
+        self._last_error = self._socket.errorString()
+        self._closeSocket()
+        self._retry()
+
+    @qslot
+    def _versionReceivedSlot(self, *args):
+        """
+        Last step of an attempt: checks the server is a GNS3 server.
+        """
+
+        reply = self._reply
+        self._reply = None
+        if reply is None or not self._is_running:
+            return
+        reply.deleteLater()
+
+        status = reply.attribute(QtNetwork.QNetworkRequest.HttpStatusCodeAttribute)
+        if status == 401:
+            # authentication issue that need to be solved later
+            self._ready()
+            return
+        if status == 200:
+            try:
+                if json.loads(bytes(reply.readAll()).decode("utf-8")).get("version") is not None:
+                    self._ready()
+                    return
+                self._last_error = "Server is not a GNS3 server"
+            except (ValueError, AttributeError, UnicodeDecodeError) as e:
+                self._last_error = "Invalid version answer: {}".format(e)
+        elif reply.error() != QtNetwork.QNetworkReply.NoError:
+            self._last_error = reply.errorString()
+        else:
+            self._last_error = "HTTP error {}".format(status)
+        self._retry()
+
+    @qslot
+    def _attemptTimeoutSlot(self, *args):
+
+        self._last_error = "Timeout after {} seconds".format(self.ATTEMPT_TIMEOUT)
+        self._closeSocket()
+        if self._reply is not None:
+            reply = self._reply
+            self._reply = None
+            reply.abort()
+            reply.deleteLater()
+        self._retry()
+
+    def _retry(self):
+        """
+        Schedules the next attempt or reports the failure.
+        """
+
+        self._attempt_timer.stop()
+        if not self._is_running:
+            return
+
+        elapsed = time.monotonic() - self._begin
+        if elapsed >= self._timeout:
+            self._is_running = False
             # let the GUI know about the connection was unsuccessful
             self.error.emit("Could not connect to {} on port {}: {}".format(self._host,
                                                                             self._port,
-                                                                            last_exception), True)
+                                                                            self._last_error), True)
             return
 
+        delay = min(self._retry_delay, self._timeout - elapsed)
+        self._retry_delay = min(self._retry_delay * 2, self.MAX_RETRY_DELAY)
+        QtCore.QTimer.singleShot(int(delay * 1000), self._connectToPort)
+
+    def _ready(self):
+
+        self._attempt_timer.stop()
+        self._is_running = False
+        self._time_to_ready = time.monotonic() - self._begin
+        log.info("Server {}:{} ready after {:.3f}s ({} attempts)".format(self._host, self._port, self._time_to_ready, self._attempts))
         # connection has been successful, let's inform the GUI
         self.finished.emit()
 
+    def _closeSocket(self):
+
+        if self._socket is not None:
+            socket = self._socket
+            self._socket = None
+            socket.abort()
+            socket.deleteLater()
+
     def cancel(self):
         """
         Cancel this worker.
@@ -93,3 +252,8 @@ class WaitForConnectionWorker(QtCore.QObject):
         if not self:
             return
         self._is_running = False
+        self._closeSocket()
+        if self._reply is not None:
+            reply = self._reply
+            self._reply = None
+            reply.abort()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Benchmark the decompression of IOS images.
+
+Without an image a compressed image of 200 MB (decompressed size) is
+generated like a Cisco one: a loader, the ZIP archive and a trailer.
+
+Usage: python scripts/benchmark_decompress_ios.py [image.bin] [size_mb]
+"""
+
+import os
+import sys
+import time
+import shutil
+import zipfile
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from gns3.modules.dynamips.utils.decompress_ios import decompressIOS
+
+
+def generate_image(path, size):
+    # a mix of random and repeated data to get a realistic compression ratio
+    block = os.urandom(512 * 1024) + bytes(512 * 1024)
+    with zipfile.ZipFile(path + ".zip", "w", zipfile.ZIP_DEFLATED) as zip_file:
+        with zip_file.open("C7200-AD.BIN", "w") as member:
+            for _ in range(size // len(block)):
+                member.write(block)
+    with open(path, "wb") as f:
+        f.write(b"\x7fELF" + bytes(64 * 1024))
+        with open(path + ".zip", "rb") as zip_file:
+            shutil.copyfileobj(zip_file, f)
+        f.write(b"CISCO SYSTEMS")
+    os.remove(path + ".zip")
+
+
+def decompress_legacy(ios_image, destination_file):
+    """
+    Decompression as done before the streaming version
+    """
+
+    tmp_fd = tempfile.NamedTemporaryFile(delete=False)
+    shutil.copyfile(ios_image, tmp_fd.name)
+    data = tmp_fd.read()
+    pos = data.rfind(b"\x50\x4b\x05\x06")
+    if pos > 0:
+        tmp_fd.seek(pos + 22)
+        tmp_fd.truncate()
+    if zipfile.is_zipfile(tmp_fd.name):
+        zip_file = zipfile.ZipFile(tmp_fd.name, "r")
+        for member in zip_file.namelist():
+            source = zip_file.open(member)
+            target = open(destination_file, "wb")
+            shutil.copyfileobj(source, target)
+            source.close()
+            target.close()
+        zip_file.close()
+    tmp_fd.close()
+    os.remove(tmp_fd.name)
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    try:
+        if len(sys.argv) > 1:
+            image = sys.argv[1]
+        else:
+            size = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+            image = os.path.join(directory, "c7200.bin")
+            generate_image(image, size * 1024 * 1024)
+        print("Image {} of {} bytes".format(image, os.path.getsize(image)))
+
+        destination = os.path.join(directory, "c7200.image")
+        for name, method in (("legacy", decompress_legacy), ("streaming", decompressIOS)):
+            tracemalloc.start()
+            begin = time.perf_counter()
+            method(image, destination)
+            elapsed = time.perf_counter() - begin
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print("{:>10}: {:.3f}s peak memory {:.1f} MB output {} bytes".format(name, elapsed, peak / (1024 * 1024), os.path.getsize(destination)))
+            os.remove(destination)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
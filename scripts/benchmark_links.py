@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Benchmark the layout and the painting of the links on a synthetic scene.
+
+The nodes are placed on a grid and each node is connected to its right
+and bottom neighbours. The scene is rendered several times in an image
+and all the links are adjusted like when all the nodes are moved.
+
+Usage: python scripts/benchmark_links.py [nb_links] [nb_frames]
+"""
+
+import os
+import sys
+import math
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from gns3.qt import QtCore, QtGui, QtWidgets, QtSvg
+from gns3.settings import GRAPHICS_VIEW_SETTINGS
+
+
+class FakeGraphicsView:
+
+    LOD_FULL = 0
+
+    def settings(self):
+        return GRAPHICS_VIEW_SETTINGS
+
+    def levelOfDetail(self, painter):
+        return self.LOD_FULL
+
+
+class FakeMainWindow:
+
+    uiGraphicsView = FakeGraphicsView()
+
+
+class FakeLink(QtCore.QObject):
+
+    updated_link_signal = QtCore.Signal()
+    delete_link_signal = QtCore.Signal(str)
+
+    def suspended(self):
+        return False
+
+    def capturing(self):
+        return False
+
+    def filters(self):
+        return {}
+
+
+class FakeNode:
+
+    def __init__(self, node_id):
+        self._id = node_id
+
+    def id(self):
+        return self._id
+
+
+class FakeNodeItem(QtSvg.QGraphicsSvgItem):
+
+    def __init__(self, node_id, renderer):
+        super().__init__()
+        self.setSharedRenderer(renderer)
+        self._node = FakeNode(node_id)
+        self._links = []
+        self._links_by_node_item = {}
+
+    def node(self):
+        return self._node
+
+    def addLink(self, link_item):
+        self._links.append(link_item)
+        if link_item.sourceItem() is self:
+            node_item = link_item.destinationItem()
+        else:
+            node_item = link_item.sourceItem()
+        self._links_by_node_item.setdefault(node_item, []).append(link_item)
+
+    def links(self):
+        return self._links
+
+    def linksTo(self, node_item):
+        return self._links_by_node_item.get(node_item, [])
+
+
+def main():
+    application = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+    # The link items use the settings of the main window
+    from gns3.main_window import MainWindow
+    MainWindow._instance = FakeMainWindow()
+    from gns3.items.ethernet_link_item import EthernetLinkItem
+    from gns3.ports.ethernet_port import EthernetPort
+
+    nb_links = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    nb_frames = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    renderer = QtSvg.QSvgRenderer(os.path.join(os.path.dirname(__file__), "..", "resources", "symbols", "router.svg"))
+    scene = QtWidgets.QGraphicsScene()
+    side = int(math.ceil(math.sqrt(nb_links / 2))) + 1
+    nodes = []
+    for i in range(side * side):
+        node_item = FakeNodeItem(i, renderer)
+        node_item.setPos((i % side) * 200, (i // side) * 200)
+        scene.addItem(node_item)
+        nodes.append(node_item)
+
+    links = []
+    begin = time.perf_counter()
+    for i, node_item in enumerate(nodes):
+        for neighbour in (i + 1, i + side):
+            if len(links) == nb_links or neighbour >= len(nodes) or (neighbour == i + 1 and neighbour % side == 0):
+                continue
+            link_item = EthernetLinkItem(node_item, EthernetPort("e0"), nodes[neighbour], EthernetPort("e1"), link=FakeLink())
+            scene.addItem(link_item)
+            links.append(link_item)
+    create_time = time.perf_counter() - begin
+    # the scene updates queued by the creation are not part of the painting
+    application.processEvents()
+
+    image = QtGui.QImage(1920, 1080, QtGui.QImage.Format_ARGB32_Premultiplied)
+    painter = QtGui.QPainter(image)
+    source = scene.itemsBoundingRect()
+    begin = time.perf_counter()
+    for _ in range(nb_frames):
+        scene.render(painter, QtCore.QRectF(image.rect()), source)
+    paint_time = (time.perf_counter() - begin) / nb_frames
+    painter.end()
+
+    begin = time.perf_counter()
+    for link_item in links:
+        link_item.adjust()
+    unchanged_time = time.perf_counter() - begin
+
+    for node_item in nodes:
+        node_item.moveBy(15, 10)
+    begin = time.perf_counter()
+    for link_item in links:
+        link_item.adjust()
+    moved_time = time.perf_counter() - begin
+
+    print("{} nodes {} links: create {:.3f}s paint {:.3f}s/frame adjust {:.3f}s (unchanged) {:.3f}s (moved)".format(len(nodes), len(links), create_time, paint_time, unchanged_time, moved_time))
+
+
+if __name__ == '__main__':
+    main()
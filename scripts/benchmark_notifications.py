@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Benchmark the decoding of the notification feed.
+
+A recorded stream can be replayed, for example one saved with:
+curl http://localhost:3080/v2/projects/<project_id>/notifications > stream.json
+
+Without a recording a stream of 100k node.updated events is generated.
+
+Usage: python scripts/benchmark_notifications.py [stream.json] [chunk_size]
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from gns3.utils.json_stream_decoder import JSONStreamDecoder
+
+
+def generate_stream(nb_events):
+    node_ids = [str(uuid.uuid4()) for _ in range(300)]
+    events = []
+    for i in range(nb_events):
+        events.append(json.dumps({
+            "action": "node.updated",
+            "event": {
+                "node_id": node_ids[i % len(node_ids)],
+                "name": "R{}".format(i % len(node_ids)),
+                "status": "started",
+                "x": i % 1000,
+                "y": i % 700,
+                "properties": {"ram": 256, "startup_config": "config.cfg"}
+            }
+        }))
+    return "\n".join(events).encode("utf-8")
+
+
+def decode_legacy(chunks):
+    """
+    Decoding as done before the JSONStreamDecoder
+    """
+
+    nb_events = 0
+    buffer = ""
+    for chunk in chunks:
+        content = buffer + chunk.decode("utf-8")
+        try:
+            while True:
+                content = content.lstrip(" \r\n\t")
+                answer, index = json.JSONDecoder().raw_decode(content)
+                nb_events += 1
+                content = content[index:]
+        except ValueError:
+            buffer = content
+    return nb_events
+
+
+def decode(chunks):
+    nb_events = 0
+    decoder = JSONStreamDecoder()
+    for chunk in chunks:
+        nb_events += len(decoder.feed(chunk))
+    return nb_events
+
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "rb") as f:
+            stream = f.read()
+    else:
+        stream = generate_stream(100000)
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 64 * 1024
+    chunks = [stream[i:i + chunk_size] for i in range(0, len(stream), chunk_size)]
+
+    print("Stream of {} bytes in {} chunks of {} bytes".format(len(stream), len(chunks), chunk_size))
+    for name, method in (("legacy", decode_legacy), ("incremental", decode)):
+        begin = time.perf_counter()
+        nb_events = method(chunks)
+        print("{:>12}: {} events in {:.3f}s".format(name, nb_events, time.perf_counter() - begin))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Benchmark the topology lookups on synthetic topologies.
+
+Nodes are connected as a chain and every node, link and drawing
+is looked up once by uuid like when the notifications are received.
+
+Usage: python scripts/benchmark_topology.py [nb_nodes ...]
+"""
+
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from gns3.qt.QtWidgets import QApplication
+from gns3.topology import Topology
+
+
+class FakeNode:
+
+    def __init__(self, base_id):
+        self._id = base_id
+        self._node_id = str(uuid.uuid4())
+
+    def id(self):
+        return self._id
+
+    def node_id(self):
+        return self._node_id
+
+
+class FakeLink:
+
+    def __init__(self, base_id, source_node, destination_node):
+        self._id = base_id
+        self._link_id = str(uuid.uuid4())
+        self._source_node = source_node
+        self._source_port = (base_id, 0)
+        self._destination_node = destination_node
+        self._destination_port = (base_id, 1)
+
+    def id(self):
+        return self._id
+
+    def link_id(self):
+        return self._link_id
+
+
+class FakeDrawing:
+
+    def __init__(self):
+        self._id = str(uuid.uuid4())
+
+    def drawing_id(self):
+        return self._id
+
+
+def benchmark(nb_nodes):
+    topology = Topology()
+    nodes = [FakeNode(i) for i in range(nb_nodes)]
+    links = [FakeLink(i, nodes[i], nodes[i + 1]) for i in range(nb_nodes - 1)]
+    drawings = [FakeDrawing() for _ in range(nb_nodes // 10)]
+
+    begin = time.perf_counter()
+    for node in nodes:
+        topology.addNode(node)
+    for link in links:
+        topology.addLink(link)
+    for drawing in drawings:
+        topology.addDrawing(drawing)
+    load_time = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    for node in nodes:
+        assert topology.getNodeFromUuid(node.node_id()) is node
+        assert topology.getNode(node.id()) is node
+    for link in links:
+        assert topology.getLinkFromUuid(link.link_id()) is link
+        assert topology.getLink(link.id()) is link
+    for drawing in drawings:
+        assert topology.getDrawingFromUuid(drawing.drawing_id()) is drawing
+    lookup_time = time.perf_counter() - begin
+
+    print("{:>6} nodes {:>6} links: load {:.4f}s lookups {:.4f}s".format(nb_nodes, len(links), load_time, lookup_time))
+
+
+def main():
+    application = QApplication.instance() or QApplication(sys.argv[:1])
+    sizes = [int(size) for size in sys.argv[1:]] or [100, 1000, 5000]
+    for size in sizes:
+        benchmark(size)
+        # deferred deletions of the previous topology
+        application.processEvents()
+
+
+if __name__ == '__main__':
+    main()
@@ -153,11 +153,15 @@ def qemu_vm(local_server, project):
 @pytest.fixture
 def local_config():
     from gns3.local_config import LocalConfig
+    from gns3.registry.checksum_index import ChecksumIndex
 
-    (fd, config_path) = tempfile.mkstemp()
+    # the files stored next to the configuration (checksums index,
+    # static cache...) are not shared between the tests
+    (fd, config_path) = tempfile.mkstemp(dir=tempfile.mkdtemp())
     os.close(fd)
 
     LocalConfig._instance = LocalConfig(config_file=config_path)
+    ChecksumIndex._instance = None
     return LocalConfig.instance()
 
 
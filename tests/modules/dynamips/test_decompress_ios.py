@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import os
+import io
+import zipfile
+
+from gns3.modules.dynamips.utils.decompress_ios import isIOSCompressed, decompressIOS
+
+
+def _create_image(path, data):
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.writestr("C7200-AD.BIN", data)
+    with open(path, "wb") as f:
+        f.write(b"\x7fELF" + bytes(1024))
+        f.write(archive.getvalue())
+        f.write(b"CISCO SYSTEMS")
+
+
+def test_decompressIOS(tmpdir):
+    data = os.urandom(4096) + bytes(4096)
+    image = str(tmpdir / "c7200.bin")
+    _create_image(image, data)
+    assert isIOSCompressed(image)
+
+    progress = []
+    assert decompressIOS(image, str(tmpdir / "c7200.image"), progress_callback=lambda done, total: progress.append((done, total)))
+    with open(str(tmpdir / "c7200.image"), "rb") as f:
+        assert f.read() == data
+    assert progress[-1] == (len(data), len(data))
+    assert not isIOSCompressed(str(tmpdir / "c7200.image"))
+
+
+def test_decompressIOS_cancelled(tmpdir):
+    image = str(tmpdir / "c7200.bin")
+    _create_image(image, bytes(4096))
+    assert decompressIOS(image, str(tmpdir / "c7200.image"), is_cancelled=lambda: True) is False
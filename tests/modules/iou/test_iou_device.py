@@ -25,6 +25,7 @@ from gns3.ports.port import Port
 from gns3.base_node import BaseNode
 from gns3.utils.normalize_filename import normalize_filename
 from gns3.modules.iou import IOU
+from gns3.http_client import HTTPClient
 
 
 @pytest.fixture
@@ -58,3 +59,14 @@ def test_update(iou_device):
 
         # Callback
         args[1]({"properties": {}})
+
+
+def test_start(iou_device):
+
+    with patch('gns3.base_node.BaseNode.controllerHttpPost') as mock:
+        assert iou_device.start()
+        args, kwargs = mock.call_args
+        assert args[0] == "/nodes/{node_id}/start".format(node_id=iou_device.node_id())
+        # queued with the other nodes when starting all the nodes
+        assert kwargs["priority"] == HTTPClient.BULK
+        assert kwargs["timeout"] is None
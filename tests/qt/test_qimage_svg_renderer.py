@@ -18,7 +18,7 @@
 import pytest
 
 from gns3.qt import QtGui
-from gns3.qt.qimage_svg_renderer import QImageSvgRenderer
+from gns3.qt.qimage_svg_renderer import QImageSvgRenderer, QImageSvgRendererPool
 
 
 def test_render_svg():
@@ -39,3 +39,67 @@ def test_render_text_svg():
 def test_render_text_broken_svg():
     renderer = QImageSvgRenderer('<svg></svg')
     assert renderer.isValid() is False
+
+
+def test_pool_share_renderer(tmpdir):
+    pool = QImageSvgRendererPool()
+    with open('resources/symbols/router.svg', 'rb') as f:
+        data = f.read()
+    copy = str(tmpdir / "router.svg")
+    with open(copy, 'wb') as f:
+        f.write(data)
+
+    renderer = pool.renderer('resources/symbols/router.svg')
+    assert renderer.isValid()
+    assert pool.renderer('resources/symbols/router.svg') is renderer
+    # same content with a different path
+    assert pool.renderer(copy) is renderer
+
+    stats = pool.statistics()
+    assert stats["renderers"] == 1
+    assert stats["memory"] == len(data)
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_pool_file_changed(tmpdir):
+    pool = QImageSvgRendererPool()
+    path = str(tmpdir / "symbol.svg")
+    with open(path, 'w') as f:
+        f.write('<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"></svg>')
+    renderer = pool.renderer(path)
+
+    with open(path, 'w') as f:
+        f.write('<svg xmlns="http://www.w3.org/2000/svg" width="20" height="20"></svg>')
+    new_renderer = pool.renderer(path)
+    assert new_renderer is not renderer
+    assert new_renderer.digest() != renderer.digest()
+    # the renderer of the previous content is released
+    assert pool.statistics()["renderers"] == 1
+
+
+def test_pool_digest(tmpdir):
+    pool = QImageSvgRendererPool()
+    paths = []
+    for name in ("a.svg", "b.svg"):
+        paths.append(str(tmpdir / name))
+        with open(paths[-1], 'w') as f:
+            f.write('<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"></svg>')
+    renderer = pool.renderer(paths[0])
+    assert renderer.digest() is not None
+    assert pool.renderer(paths[1]) is renderer
+
+    # the content is still used by the other file
+    with open(paths[0], 'w') as f:
+        f.write('<svg xmlns="http://www.w3.org/2000/svg" width="20" height="20"></svg>')
+    assert pool.renderer(paths[0]) is not renderer
+    assert pool.renderer(paths[1]) is renderer
+    assert pool.statistics()["renderers"] == 2
+    assert QImageSvgRenderer(paths[1]).digest() is None
+
+
+def test_pool_resource():
+    pool = QImageSvgRendererPool()
+    renderer = pool.renderer(':/icons/reload.svg')
+    assert pool.renderer(':/icons/reload.svg') is renderer
+    assert pool.renderer(':/icons/reload.svg', fallback=':/icons/cancel.svg') is not renderer
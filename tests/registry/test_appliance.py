@@ -20,6 +20,7 @@ import pytest
 import json
 import os
 import tempfile
+from unittest.mock import patch
 
 from gns3.registry.appliance import Appliance, ApplianceError
 from gns3.registry.registry import Registry
@@ -205,3 +206,22 @@ def test_create_new_version():
 def test_emulator():
     assert Appliance(registry, os.path.abspath("tests/registry/appliances/microcore-linux.gns3a")).emulator() == "qemu"
     assert Appliance(registry, os.path.abspath("tests/registry/appliances/cisco-iou-l3.gns3a")).emulator() == "iou"
+
+
+def test_cache(tmpdir, registry):
+
+    test_path = str(tmpdir / "test.gns3a")
+    with open("tests/registry/appliances/microcore-linux.gns3a", encoding="utf-8") as f:
+        config = json.load(f)
+    with open(test_path, "w+", encoding="utf-8") as f:
+        json.dump(config, f)
+
+    appliance = Appliance(registry, test_path)
+    with patch("gns3.registry.appliance.Appliance._check_config") as mock:
+        cached_appliance = Appliance(registry, test_path)
+        assert not mock.called
+    assert cached_appliance.copy() == appliance.copy()
+
+    # the cached appliance is not changed by the instances
+    cached_appliance["versions"].append({"name": "42.0", "images": {}})
+    assert len(Appliance(registry, test_path)["versions"]) == len(appliance["versions"])
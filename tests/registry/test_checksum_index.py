@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2015 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import os
+
+from gns3.registry.checksum_index import ChecksumIndex
+
+
+def test_md5sum(tmpdir):
+    path = str(tmpdir / "test.img")
+    with open(path, "wb") as f:
+        f.write(b"hello")
+
+    index = ChecksumIndex(str(tmpdir / "index.json"))
+    assert index.lookup(path) is None
+    assert index.md5sum(path) == "5d41402abc4b2a76b9719d911017c592"
+    assert index.lookup(path) == "5d41402abc4b2a76b9719d911017c592"
+    assert index.find("5d41402abc4b2a76b9719d911017c592") == [path]
+
+
+def test_persistent(tmpdir):
+    path = str(tmpdir / "test.img")
+    with open(path, "wb") as f:
+        f.write(b"hello")
+
+    index = ChecksumIndex(str(tmpdir / "index.json"))
+    index.md5sum(path)
+    index.save()
+
+    index = ChecksumIndex(str(tmpdir / "index.json"))
+    assert index.lookup(path) == "5d41402abc4b2a76b9719d911017c592"
+
+
+def test_file_changed(tmpdir):
+    path = str(tmpdir / "test.img")
+    with open(path, "wb") as f:
+        f.write(b"hello")
+
+    index = ChecksumIndex(str(tmpdir / "index.json"))
+    index.md5sum(path)
+    with open(path, "wb") as f:
+        f.write(b"hello world")
+
+    assert index.lookup(path) is None
+    assert index.find("5d41402abc4b2a76b9719d911017c592") == []
+    assert index.md5sum(path) == "5eb63bbbe01eeed093cb22bb8f5acdc3"
+
+
+def test_hashFiles(tmpdir):
+    paths = []
+    for i in range(3):
+        path = str(tmpdir / "test{}.img".format(i))
+        with open(path, "wb") as f:
+            f.write(b"hello")
+        paths.append(path)
+
+    index = ChecksumIndex(str(tmpdir / "index.json"))
+    checksums = index.hashFiles(paths + [str(tmpdir / "missing.img")])
+    for path in paths:
+        assert checksums[path] == "5d41402abc4b2a76b9719d911017c592"
+    assert checksums[str(tmpdir / "missing.img")] is None
+    assert os.path.exists(str(tmpdir / "index.json"))
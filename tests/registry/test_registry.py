@@ -20,6 +20,7 @@
 import pytest
 import json
 import os
+from unittest.mock import patch
 
 
 from gns3.registry.registry import Registry, RegistryError
@@ -56,3 +57,71 @@ def test_search_image_file(tmpdir):
 
     # md5sum doesn't exists
     assert registry.search_image_file("qemu", "x", "00000000000000000000000000000000", 5) is None
+
+
+def test_search_image_file_directory_index(tmpdir):
+
+    os.makedirs(str(tmpdir / "QEMU"))
+    with open(str(tmpdir / "QEMU" / "a"), "w+", encoding="utf-8") as f:
+        f.write("ALPHA")
+
+    registry = Registry([str(tmpdir / "QEMU")])
+    assert registry.search_image_file("qemu", "b", None, None) is None
+
+    with open(str(tmpdir / "QEMU" / "b"), "w+", encoding="utf-8") as f:
+        f.write("BETA")
+    # the result is reused until the directory is scanned again
+    registry._directory_index[str(tmpdir / "QEMU")]["mtime"] = os.stat(str(tmpdir / "QEMU")).st_mtime_ns
+    assert registry.search_image_file("qemu", "b", None, None) is None
+
+    registry.refresh()
+    image = registry.search_image_file("qemu", "b", None, None)
+    assert image.path == str(tmpdir / "QEMU" / "b")
+    assert registry._candidates(str(tmpdir / "QEMU"), 5) == [str(tmpdir / "QEMU" / "b"), str(tmpdir / "QEMU" / "a")]
+
+
+def test_search_image_file_rewritten(tmpdir):
+
+    os.makedirs(str(tmpdir / "QEMU"))
+    path = str(tmpdir / "QEMU" / "a")
+    with open(path, "w+", encoding="utf-8") as f:
+        f.write("ALPH")
+
+    registry = Registry([str(tmpdir / "QEMU")])
+    # the file is still being copied
+    assert registry.search_image_file("qemu", "a", "002101f8725e5c78d9f30d87f3fa4c87", 5) is None
+
+    # the file grows in place, the directory doesn't change
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("A")
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10 ** 9))
+    assert registry.search_image_file("qemu", "a", "002101f8725e5c78d9f30d87f3fa4c87", 5) is None
+    # found once the wizard refreshes the images
+    registry.refresh()
+    image = registry.search_image_file("qemu", "a", "002101f8725e5c78d9f30d87f3fa4c87", 5)
+    assert image.path == path
+
+    # a cached result is not used once the file has changed
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("ALPHB")
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 2 * 10 ** 9))
+    assert registry.search_image_file("qemu", "a", "002101f8725e5c78d9f30d87f3fa4c87", 5) is None
+
+
+def test_search_image_file_cached_stats(tmpdir):
+
+    os.makedirs(str(tmpdir / "QEMU"))
+    for i in range(100):
+        with open(str(tmpdir / "QEMU" / str(i)), "w+", encoding="utf-8") as f:
+            f.write(str(i))
+
+    registry = Registry([str(tmpdir / "QEMU")])
+    registry.search_image_file("qemu", "x", None, None)
+    registry.search_image_file("qemu", "1", None, None)
+    with patch("gns3.registry.registry.os.stat", wraps=os.stat) as mock:
+        # a miss only checks the directory
+        assert registry.search_image_file("qemu", "x", None, None) is None
+        assert mock.call_count == 1
+        # a hit also checks its file
+        assert registry.search_image_file("qemu", "1", None, None).path == str(tmpdir / "QEMU" / "1")
+        assert mock.call_count == 3
@@ -16,9 +16,10 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from gns3.controller import Controller
+from gns3.utils.static_asset_cache import StaticAssetCache
 
 
 @pytest.fixture
@@ -49,3 +50,124 @@ def test_connected(controller):
     controller._httpClientConnectedSlot()
     assert controller.connected() is True
     assert callback.called
+
+
+def test_getStatic(controller, tmpdir):
+    controller._static_cache = StaticAssetCache(str(tmpdir))
+    callback = MagicMock()
+    controller.getStatic("/symbols/router.svg/raw", callback)
+    controller.getStatic("/symbols/router.svg/raw", callback)
+
+    # only one download for the two calls
+    assert controller._http_client.createHTTPQuery.call_count == 1
+    args, kwargs = controller._http_client.createHTTPQuery.call_args
+    args[2]({}, raw_body=b"<svg></svg>", headers={"etag": "abc"})
+    assert callback.call_count == 2
+    path = callback.call_args[0][0]
+    with open(path, "rb") as f:
+        assert f.read() == b"<svg></svg>"
+
+    # served from the cache
+    controller.getStatic("/symbols/router.svg/raw", callback)
+    callback.assert_called_with(path)
+    assert controller._http_client.createHTTPQuery.call_count == 1
+
+
+def test_getStatic_revalidate(controller, tmpdir):
+    controller._static_cache = StaticAssetCache(str(tmpdir))
+    key = controller._staticCacheKey("/symbols/router.svg/raw")
+    path = controller._static_cache.store(key, b"<svg></svg>", etag="abc")
+    controller._static_cache.save()
+    controller._static_cache = StaticAssetCache(str(tmpdir))
+
+    callback = MagicMock()
+    controller.getStatic("/symbols/router.svg/raw", callback)
+    # the cached file is used while it's validated
+    callback.assert_called_with(path)
+    args, kwargs = controller._http_client.createHTTPQuery.call_args
+    assert kwargs["headers"] == {"If-None-Match": "abc"}
+
+    # not modified
+    args[2]({}, raw_body=b"", headers={}, status=304)
+    assert controller._static_cache.validated(key)
+    controller.getStatic("/symbols/router.svg/raw", callback)
+    assert controller._http_client.createHTTPQuery.call_count == 1
+
+
+def test_getStatic_revalidate_empty_body(controller, tmpdir):
+    controller._static_cache = StaticAssetCache(str(tmpdir))
+    key = controller._staticCacheKey("/symbols/router.svg/raw")
+    controller._static_cache.store(key, b"<svg></svg>", etag="abc")
+    controller._static_cache.save()
+    controller._static_cache = StaticAssetCache(str(tmpdir))
+
+    callback = MagicMock()
+    controller.getStatic("/symbols/router.svg/raw", callback)
+    args, kwargs = controller._http_client.createHTTPQuery.call_args
+
+    # an empty body is neither a "Not Modified" answer nor a symbol
+    args[2]({}, raw_body=b"", headers={}, status=200)
+    path = callback.call_args[0][0]
+    assert controller._static_cache.path(key) == path
+    assert not controller._static_cache.validated(key)
+    with open(path, "rb") as f:
+        assert f.read() == b"<svg></svg>"
+
+
+def test_getStatic_revalidate_new_content(controller, tmpdir):
+    controller._static_cache = StaticAssetCache(str(tmpdir))
+    key = controller._staticCacheKey("/symbols/router.svg/raw")
+    controller._static_cache.store(key, b"<svg></svg>", etag="abc")
+    controller._static_cache.save()
+    controller._static_cache = StaticAssetCache(str(tmpdir))
+
+    callback = MagicMock()
+    controller.getStatic("/symbols/router.svg/raw", callback)
+    old_path = callback.call_args[0][0]
+    args, kwargs = controller._http_client.createHTTPQuery.call_args
+
+    args[2]({}, raw_body=b"<svg><g/></svg>", headers={"etag": "def"}, status=200)
+    assert controller._static_cache.validated(key)
+    with open(controller._static_cache.path(key), "rb") as f:
+        assert f.read() == b"<svg><g/></svg>"
+    # the path given to the callback is still valid
+    with open(old_path, "rb") as f:
+        assert f.read() == b"<svg></svg>"
+
+
+def test_getStatic_store_error(controller, tmpdir):
+    controller._static_cache = StaticAssetCache(str(tmpdir))
+    callback = MagicMock()
+    error_callback = MagicMock()
+    controller.getStatic("/symbols/router.svg/raw", callback, error_callback=error_callback)
+    args, kwargs = controller._http_client.createHTTPQuery.call_args
+
+    with patch("gns3.utils.static_asset_cache.StaticAssetCache.store", side_effect=OSError("No space left on device")):
+        args[2]({}, raw_body=b"<svg></svg>", headers={}, status=200)
+    assert not callback.called
+    assert error_callback.called
+
+
+def test_getStatic_truncated_body(controller, tmpdir):
+    controller._static_cache = StaticAssetCache(str(tmpdir))
+    callback = MagicMock()
+    error_callback = MagicMock()
+    controller.getStatic("/symbols/router.svg/raw", callback, error_callback=error_callback)
+    args, kwargs = controller._http_client.createHTTPQuery.call_args
+
+    args[2]({}, raw_body=b"<svg>", headers={"content-length": "11"}, status=200)
+    assert error_callback.called
+    assert controller._static_cache.path(controller._staticCacheKey("/symbols/router.svg/raw")) is None
+
+
+def test_prefetchStatic(controller, tmpdir):
+    controller._static_cache = StaticAssetCache(str(tmpdir))
+    callback = MagicMock()
+    controller.prefetchStatic(["/symbols/a.svg/raw", "/symbols/b.svg/raw", "/symbols/a.svg/raw"], callback)
+
+    assert controller._http_client.createHTTPQuery.call_count == 2
+    (args_a, _), (args_b, _) = controller._http_client.createHTTPQuery.call_args_list
+    args_a[2]({}, raw_body=b"<svg></svg>")
+    assert not callback.called
+    args_b[2]({"message": "not found"}, error=True)
+    assert callback.called
@@ -16,7 +16,9 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from unittest.mock import MagicMock, patch
+from gns3.qt import QtGui
 from gns3.graphics_view import GraphicsView
+from gns3.settings import GRAPHICS_VIEW_SETTINGS
 from gns3.node import Node
 
 
@@ -32,3 +34,61 @@ def test_console_to_node_vncviewer_and_ipv6():
         view.consoleToNode(node)
         assert warning_mock.called
         assert warning_mock.call_args[0][1] == 'TightVNC'
+
+
+def test_adjustLinks():
+    link = MagicMock()
+    view = GraphicsView.__new__(GraphicsView)
+    view._dirty_links = None
+    view.adjustLinks([link])
+    assert link.adjust.call_count == 1
+
+    # during a mouse move the links are adjusted once at the end
+    view._dirty_links = set()
+    view.adjustLinks([link])
+    view.adjustLinks([link])
+    assert link.adjust.call_count == 1
+    assert view._dirty_links == {link}
+
+
+def test_levelOfDetail():
+    view = GraphicsView.__new__(GraphicsView)
+    view._settings = GRAPHICS_VIEW_SETTINGS.copy()
+    view._settings["level_of_detail_min_nodes"] = 0
+    painter = MagicMock()
+
+    painter.worldTransform.return_value = QtGui.QTransform.fromScale(1.0, 1.0)
+    assert view.levelOfDetail(painter) == GraphicsView.LOD_FULL
+    painter.worldTransform.return_value = QtGui.QTransform.fromScale(0.3, 0.3)
+    assert view.levelOfDetail(painter) == GraphicsView.LOD_PIXMAP
+    painter.worldTransform.return_value = QtGui.QTransform.fromScale(0.1, 0.1)
+    assert view.levelOfDetail(painter) == GraphicsView.LOD_GLYPH
+
+    view._settings["level_of_detail"] = False
+    assert view.levelOfDetail(painter) == GraphicsView.LOD_FULL
+
+
+def test_levelOfDetail_small_topology():
+    view = GraphicsView.__new__(GraphicsView)
+    view._settings = GRAPHICS_VIEW_SETTINGS.copy()
+    view._settings["level_of_detail_min_nodes"] = 10
+    painter = MagicMock()
+    painter.worldTransform.return_value = QtGui.QTransform.fromScale(0.1, 0.1)
+
+    with patch("gns3.graphics_view.Topology.instance") as topology:
+        topology.return_value.nodes.return_value = [MagicMock()] * 3
+        assert view.levelOfDetail(painter) == GraphicsView.LOD_FULL
+        topology.return_value.nodes.return_value = [MagicMock()] * 10
+        assert view.levelOfDetail(painter) == GraphicsView.LOD_GLYPH
+
+
+def test_invalidateBackgroundCache():
+    view = GraphicsView.__new__(GraphicsView)
+    view._grid_tiles = {1.0: MagicMock()}
+    view.resetCachedContent = MagicMock()
+    view.viewport = MagicMock()
+
+    view.invalidateBackgroundCache()
+    assert view._grid_tiles == {}
+    assert view.resetCachedContent.called
+    assert view.viewport.return_value.update.called
@@ -19,7 +19,7 @@ import pytest
 import unittest.mock
 
 from gns3.qt import QtCore, QtNetwork, FakeQtSignal, QtWebSockets
-from gns3.http_client import HTTPClient
+from gns3.http_client import HTTPClient, HTTPQueryScheduler
 from gns3.version import __version__, __version_info__
 
 
@@ -348,3 +348,108 @@ def test_connectWebSocket(http_client):
     assert open_mock.called
     request = open_mock.call_args[0][0]
     assert request.url().toString() == "ws://127.0.0.1:3080/v2/test"
+
+
+def test_readyReadySlotBufferReleased(http_client):
+    """
+    The partial JSON waiting for the next packet is released
+    when the query is finished"""
+    callback = unittest.mock.MagicMock()
+    response = unittest.mock.MagicMock()
+    server = unittest.mock.MagicMock()
+    response.header.return_value = "application/json"
+    response.readAll.return_value = b'{"action": "ping"}\n{"action": "p'
+    response.error.return_value = QtNetwork.QNetworkReply.NoError
+    response.attribute.return_value = 200
+
+    http_client._readyReadySlot(response, callback, {"query_id": "bla"}, server)
+    assert callback.call_count == 1
+    assert "bla" in http_client._buffer
+
+    response.readAll.return_value = b''
+    http_client._processResponse(response, server, None, {"query_id": "bla"}, None, False)
+    assert "bla" not in http_client._buffer
+
+
+def test_scheduler_limit():
+    scheduler = HTTPQueryScheduler(max_concurrent_queries=2)
+    responses = [unittest.mock.MagicMock() for i in range(3)]
+    for response in responses:
+        response.finished = FakeQtSignal()
+    queries = [unittest.mock.MagicMock(return_value=response) for response in responses]
+
+    assert scheduler.schedule(queries[0]) == responses[0]
+    assert scheduler.schedule(queries[1]) == responses[1]
+    assert scheduler.schedule(queries[2]) is None
+    assert not queries[2].called
+    assert scheduler.statistics()["queued"]["interactive"] == 1
+
+    responses[0].finished.emit()
+    assert queries[2].called
+    statistics = scheduler.statistics()
+    assert statistics["running"] == 2
+    assert statistics["completed"] == 1
+    assert statistics["queued"]["interactive"] == 0
+
+
+def test_scheduler_keep_slots_for_interactive():
+    scheduler = HTTPQueryScheduler(max_concurrent_queries=3)
+    bulk = [unittest.mock.MagicMock() for i in range(2)]
+    for query in bulk:
+        scheduler.schedule(query, HTTPQueryScheduler.BULK)
+    assert bulk[0].called
+    assert not bulk[1].called
+
+    interactive = unittest.mock.MagicMock()
+    scheduler.schedule(interactive, HTTPQueryScheduler.INTERACTIVE)
+    assert interactive.called
+
+
+def test_scheduler_failed_query():
+    scheduler = HTTPQueryScheduler(max_concurrent_queries=1)
+    failed = unittest.mock.MagicMock(return_value=None)
+    scheduler.schedule(failed)
+    query = unittest.mock.MagicMock()
+    scheduler.schedule(query)
+    assert query.called
+
+
+def test_get_connected_stream_not_scheduled(http_client, network_manager):
+
+    http_client._connected = True
+    http_client.setMaxConcurrentQueries(1)
+    http_client.createHTTPQuery("GET", "/notifications", None, downloadProgressCallback=unittest.mock.MagicMock())
+    http_client.createHTTPQuery("GET", "/test", None)
+    assert network_manager.sendCustomRequest.call_count == 2
+
+
+def test_query_dropped(http_client, network_manager):
+
+    http_client._connected = True
+    http_client.setMaxTimeDifferenceBetweenQueries(120)
+    http_client._last_query_timestamp = 0
+    # the computer has been in hibernation
+    with unittest.mock.patch("gns3.http_client.HTTPClient.disconnect"):
+        assert http_client.createHTTPQuery("GET", "/test", None) is False
+
+    http_client._shutdown = True
+    assert http_client.createHTTPQuery("GET", "/test", None) is False
+    assert not network_manager.sendCustomRequest.called
+
+
+def test_progress_throttle(http_client):
+
+    progress = unittest.mock.MagicMock()
+    http_client.setProgressCallback(progress)
+
+    http_client._notify_progress_download("test", 10, 100)
+    http_client._notify_progress_download("test", 20, 100)
+    assert progress.progress_signal.emit.call_count == 1
+
+    # the end of the transfer is always notified
+    http_client._notify_progress_download("test", 100, 100)
+    assert progress.progress_signal.emit.call_count == 2
+
+    http_client._notify_progress_end_query("test")
+    progress.transfer_signal.emit.assert_called_with("test", "0", "100")
+    assert progress.remove_query_signal.emit.called
@@ -94,6 +94,8 @@ def test_updatePorts(vpcs_device):
     assert port.dataLinkTypes() == {"Ethernet": "DLT_EN10MB"}
     assert port.status() == Port.stopped
     assert isinstance(port, EthernetPort)
+    assert vpcs_device.getPort(0, 0) == port
+    assert vpcs_device.getPort(0, 1) is None
 
     vpcs_device.setStatus(Node.started)
     vpcs_device._updatePorts([
@@ -110,6 +112,7 @@ def test_updatePorts(vpcs_device):
     port = vpcs_device._ports[0]
     assert port.status() == Port.started
     assert isinstance(port, SerialPort)
+    assert vpcs_device.getPort(0, 0) == port
 
 
 def test_updatePorts_PortChange(vpcs_device):
@@ -176,4 +179,21 @@ def test_node_setGraphics(vpcs_device):
         vpcs_device.setSettingValue('label', node.label().dump())
 
         vpcs_device.setGraphics(node)
-        assert mock.call_count == 1
\ No newline at end of file
+        assert mock.call_count == 1
+
+def test_vpcs_device_start_callback(vpcs_device):
+
+    callback = MagicMock()
+    with patch('gns3.base_node.BaseNode.controllerHttpPost') as mock:
+        assert vpcs_device.start(callback=callback, showProgress=False)
+        args, kwargs = mock.call_args
+        assert kwargs["showProgress"] is False
+        args[1]({"message": "error"}, error=True)
+    callback.assert_called_with({"message": "error"}, error=True)
+
+    # the HTTP client didn't send the query
+    with patch('gns3.base_node.BaseNode.controllerHttpPost', return_value=False):
+        assert vpcs_device.start() is False
+
+    vpcs_device.setStatus(Node.started)
+    assert vpcs_device.start() is False
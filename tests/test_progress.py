@@ -38,3 +38,28 @@ def test_context():
         assert progress._allow_cancel_query is True
     assert progress._cancel_button_text == ""
     assert progress._allow_cancel_query is False
+
+
+def test_timer():
+    progress = Progress(None, min_duration=0)
+    assert not progress._rtimer.isActive()
+
+    progress._addQuerySlot("test", "Test", None)
+    assert progress._rtimer.isActive()
+
+    progress._removeQuerySlot("test")
+    progress.update()
+    assert not progress._rtimer.isActive()
+
+
+def test_statistics():
+    progress = Progress(None)
+    assert progress.statistics() == {"queries": 0, "oldest_query_age": 0, "bytes_sent": 0, "bytes_received": 0}
+
+    progress._addQuerySlot("test", "Test", None)
+    progress._transferSlot("test", "1000", "200")
+    stats = progress.statistics()
+    assert stats["queries"] == 1
+    assert stats["oldest_query_age"] >= 0
+    assert stats["bytes_sent"] == 1000
+    assert stats["bytes_received"] == 200
@@ -140,3 +140,157 @@ def test_project_destroy(controller):
 
     assert args[0] == "DELETE"
     assert args[1] == "/projects/{project_id}".format(project_id=project.id())
+
+
+
+def test_project_open_list_items(project, controller):
+    project._projectOpenCallback({"project_id": project.id(), "name": "test"})
+
+    mock = controller._http_client.createHTTPQuery
+    paths = [args[1] for args, kwargs in mock.call_args_list if args[0] == "GET"]
+    for name in ("nodes", "links", "drawings"):
+        assert "/projects/{uuid}/{name}".format(uuid=project.id(), name=name) in paths
+
+
+def test_project_listItemsCallback(project):
+    topology = MagicMock()
+    topology.project.return_value = project
+    topology.createNode.side_effect = lambda data: topology.createLink.assert_not_called()
+    with patch("gns3.project.Topology.instance", return_value=topology):
+        with patch("gns3.project.Project.project_loaded_signal") as loaded_signal:
+            project._listItemsCallback(project._load_id, "drawings", [{"drawing_id": "1"}])
+            project._listItemsCallback(project._load_id, "links", [{"link_id": "1"}])
+            assert not topology.beginBulkLoad.called
+            project._listItemsCallback(project._load_id, "nodes", [{"node_id": "1"}, {"node_id": "2"}])
+    assert topology.beginBulkLoad.called
+    assert topology.createNode.call_count == 2
+    assert topology.createLink.call_count == 1
+    assert topology.createDrawing.call_count == 1
+    assert topology.endBulkLoad.called
+    assert loaded_signal.emit.called
+
+
+def test_project_listItemsCallback_error(project):
+    topology = MagicMock()
+    topology.project.return_value = project
+    with patch("gns3.project.Topology.instance", return_value=topology):
+        with patch("gns3.project.Project.project_loaded_signal") as loaded_signal:
+            project._listItemsCallback(project._load_id, "nodes", [{"node_id": "1"}])
+            project._listItemsCallback(project._load_id, "links", {"message": "error"}, error=True)
+            project._listItemsCallback(project._load_id, "drawings", [{"drawing_id": "1"}])
+    assert topology.createNode.call_count == 1
+    assert not topology.createLink.called
+    assert not topology.createDrawing.called
+    assert topology.endBulkLoad.called
+    assert not loaded_signal.emit.called
+
+
+def test_project_event_received_coalesced(project):
+    node = MagicMock()
+    topology = MagicMock()
+    topology.getNodeFromUuid.return_value = node
+    with patch("gns3.project.Topology.instance", return_value=topology):
+        project._event_received({"action": "node.updated", "event": {"node_id": "1", "name": "PC1", "x": 1}})
+        project._event_received({"action": "node.updated", "event": {"node_id": "1", "x": 2}})
+        assert not node.updateNodeCallback.called
+        project._dispatchPendingEvents()
+    node.updateNodeCallback.assert_called_once_with({"node_id": "1", "name": "PC1", "x": 2})
+    assert project.eventsStatistics() == {"received": 2, "applied": 1}
+
+
+def test_project_event_received_order(project):
+    node = MagicMock()
+    topology = MagicMock()
+    topology.getNodeFromUuid.return_value = node
+    with patch("gns3.project.Topology.instance", return_value=topology):
+        project._event_received({"action": "node.updated", "event": {"node_id": "1", "x": 1}})
+        project._event_received({"action": "node.deleted", "event": {"node_id": "1"}})
+    # the waiting update is applied before the deletion
+    assert node.mock_calls[0][0] == "updateNodeCallback"
+    node.delete.assert_called_with(skip_controller=True)
+    assert project.eventsStatistics() == {"received": 2, "applied": 2}
+
+
+def test_project_applyNodeAction_all_nodes(project, controller):
+    nodes = [MagicMock(), MagicMock()]
+    nodes[0].id.return_value = 1
+    nodes[1].id.return_value = 2
+    topology = MagicMock()
+    topology.nodes.return_value = nodes
+    with patch("gns3.project.Topology.instance", return_value=topology):
+        project.applyNodeAction("start", nodes)
+
+    assert not nodes[0].start.called
+    mock = controller._http_client.createHTTPQuery
+    args, kwargs = mock.call_args
+    assert args[0] == "POST"
+    assert args[1] == "/projects/{project_id}/nodes/start".format(project_id=project.id())
+
+
+def test_project_applyNodeAction_selection(project, controller):
+    nodes = [MagicMock(), MagicMock(), MagicMock()]
+    for i, node in enumerate(nodes):
+        node.id.return_value = i
+    # already stopped
+    nodes[1].stop.return_value = False
+    topology = MagicMock()
+    topology.nodes.return_value = nodes + [MagicMock()]
+    progress = MagicMock()
+    with patch("gns3.project.Topology.instance", return_value=topology):
+        with patch("gns3.project.Progress.instance", return_value=progress):
+            project.applyNodeAction("stop", nodes)
+            assert not controller._http_client.createHTTPQuery.called
+            for node in nodes:
+                args, kwargs = node.stop.call_args
+                assert kwargs["showProgress"] is False
+
+            # the progress is reported once for the whole selection
+            assert progress.add_query_signal.emit.call_count == 1
+            query_id, text, response = progress.add_query_signal.emit.call_args[0]
+            assert text == "Stopping 2 nodes"
+
+            nodes[0].stop.call_args[1]["callback"]({})
+            assert not progress.remove_query_signal.emit.called
+            nodes[2].stop.call_args[1]["callback"]({"message": "error"}, error=True)
+            progress.remove_query_signal.emit.assert_called_with(query_id)
+
+
+def test_project_listItemsCallback_prefetch_symbols(project):
+    topology = MagicMock()
+    topology.project.return_value = project
+    controller = MagicMock()
+    with patch("gns3.project.Topology.instance", return_value=topology):
+        with patch("gns3.project.Controller.instance", return_value=controller):
+            project._listItemsCallback(project._load_id, "nodes", [{"node_id": "1", "symbol": ":/symbols/router.svg"}, {"node_id": "2", "symbol": ":/symbols/router.svg"}])
+            project._listItemsCallback(project._load_id, "links", [])
+            project._listItemsCallback(project._load_id, "drawings", [])
+            args, kwargs = controller.prefetchStatic.call_args
+            assert len(args[0]) == 1
+            # the scene is built once the symbols are downloaded
+            assert not topology.createNode.called
+            args[1]()
+    assert topology.createNode.call_count == 2
+
+
+def test_project_listItemsCallback_previous_load(project):
+    topology = MagicMock()
+    topology.project.return_value = project
+    controller = MagicMock()
+    with patch("gns3.project.Topology.instance", return_value=topology):
+        with patch("gns3.project.Controller.instance", return_value=controller):
+            previous_load_id = project._load_id
+            project._listItemsCallback(previous_load_id, "nodes", [{"node_id": "1"}])
+            # the project is loaded again before the end of the first loading
+            project._load_id += 1
+            project._load_results = {}
+            project._listItemsCallback(previous_load_id, "links", [])
+            project._listItemsCallback(previous_load_id, "drawings", [])
+            assert not controller.prefetchStatic.called
+
+            for name in ("nodes", "links", "drawings"):
+                project._listItemsCallback(project._load_id, name, [])
+            assert controller.prefetchStatic.call_count == 1
+            args, kwargs = controller.prefetchStatic.call_args
+            project._load_id += 1
+            args[1]()
+    assert not topology.beginBulkLoad.called
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shlex
+
+from unittest.mock import MagicMock, patch
+from gns3.telnet_console import ConsoleLauncher, nodeTelnetConsole
+from gns3.settings import BUILTIN_TELNET_CONSOLE_COMMAND
+
+
+def _node(name="PC1"):
+    node = MagicMock()
+    node.name.return_value = name
+    node.id.return_value = name
+    node.consoleHost.return_value = "localhost"
+    node.project.return_value.id.return_value = "project"
+    return node
+
+
+def test_launch(main_window, controller):
+    main_window.settings.return_value = {"delay_console_all": 500}
+    controller._http_client.fullUrl.return_value = "http://127.0.0.1:3080"
+    launcher = ConsoleLauncher()
+    with patch('subprocess.Popen') as popen, \
+            patch('sys.platform', new="linux"):
+        launcher.launch(_node(), 5000, 'telnet %h %p')
+        assert len(launcher.sessions()) == 1
+        launcher._launchNextSlot()
+        popen.assert_called_once_with(shlex.split('telnet localhost 5000'), env=os.environ)
+
+
+def test_launch_reuse(main_window, controller):
+    main_window.settings.return_value = {"delay_console_all": 500}
+    controller._http_client.fullUrl.return_value = "http://127.0.0.1:3080"
+    launcher = ConsoleLauncher()
+    node = _node()
+    with patch('subprocess.Popen') as popen, \
+            patch('sys.platform', new="linux"):
+        popen.return_value.poll.return_value = None
+        launcher.launch(node, 5000, 'telnet %h %p')
+        launcher._launchNextSlot()
+        # the console is still open
+        launcher.launch(node, 5000, 'telnet %h %p')
+        launcher._launchNextSlot()
+        assert popen.call_count == 1
+
+        # the console has been closed
+        popen.return_value.poll.return_value = 0
+        launcher._pollSlot()
+        assert launcher.sessions() == []
+
+
+def test_launch_rate_limit(main_window, controller):
+    main_window.settings.return_value = {"delay_console_all": 500}
+    controller._http_client.fullUrl.return_value = "http://127.0.0.1:3080"
+    launcher = ConsoleLauncher()
+    with patch('subprocess.Popen') as popen, \
+            patch('sys.platform', new="linux"):
+        launcher.launch(_node("PC1"), 5000, 'telnet %h %p')
+        launcher.launch(_node("PC2"), 5001, 'telnet %h %p')
+        launcher._launchNextSlot()
+        # one console is started at a time
+        assert popen.call_count == 1
+        assert launcher._launch_timer.isActive()
+        launcher._launchNextSlot()
+        assert popen.call_count == 2
+
+
+def test_node_telnet_console_builtin(main_window):
+    node = _node()
+    node.isStarted.return_value = True
+    with patch('gns3.telnet_console_dock.TelnetConsoleDock.instance') as dock, \
+            patch('gns3.telnet_console.ConsoleLauncher.instance') as launcher:
+        nodeTelnetConsole(node, 5000, command=BUILTIN_TELNET_CONSOLE_COMMAND)
+        dock.return_value.openConsole.assert_called_once_with(node, 5000)
+        assert not launcher.return_value.launch.called
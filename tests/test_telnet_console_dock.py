@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import pytest
+
+from unittest.mock import MagicMock, patch
+from gns3.qt import QtNetwork
+from gns3.items.node_item import NodeItem
+from gns3.telnet_console_dock import TelnetConsoleDock, TelnetSession
+from gns3.utils.telnet_protocol import IAC, WILL, DO, ECHO
+
+
+def _node(name="PC1"):
+    node = MagicMock()
+    node.name.return_value = name
+    node.id.return_value = name
+    node.consoleHost.return_value = "localhost"
+    return node
+
+
+def _socket(parent=None):
+    socket = MagicMock()
+    socket.state.return_value = QtNetwork.QAbstractSocket.UnconnectedState
+    return socket
+
+
+@pytest.fixture
+def dock(main_window, tmpdir):
+    main_window.settings.return_value = {"console_log_max_size": 1024 * 1024, "console_log_backups": 3}
+    with patch("gns3.telnet_console_dock.QtNetwork.QTcpSocket", side_effect=_socket), \
+            patch("gns3.telnet_console_dock.TelnetConsoleDock._logPath", side_effect=lambda node, port: str(tmpdir / "{}_{}.log".format(node.name(), port))):
+        yield TelnetConsoleDock()
+
+
+def _connect(widget):
+    widget.session()._socket.state.return_value = QtNetwork.QAbstractSocket.ConnectedState
+
+
+def test_open_console_reuse_tab(dock):
+    node = _node()
+    dock.openConsole(node, 5000)
+    widget = dock.consoles()[("PC1", 5000)]
+    socket = widget.session()._socket
+    socket.connectToHost.assert_called_once_with("localhost", 5000)
+
+    # the tab of the node is reused
+    _connect(widget)
+    dock.openConsole(node, 5000)
+    assert dock._tab_widget.count() == 1
+    assert socket.connectToHost.call_count == 1
+
+    # another console port of the node has its own tab
+    dock.openConsole(node, 5001)
+    assert dock._tab_widget.count() == 2
+
+
+def test_open_console_reconnect(dock):
+    node = _node()
+    dock.openConsole(node, 5000)
+    widget = dock.consoles()[("PC1", 5000)]
+    socket = widget.session()._socket
+
+    # the console has been disconnected
+    socket.state.return_value = QtNetwork.QAbstractSocket.UnconnectedState
+    widget.session()._disconnectedSlot()
+    assert dock._tab_widget.tabText(0) == "PC1 (disconnected)"
+    dock.openConsole(node, 5000)
+    assert socket.connectToHost.call_count == 2
+    assert dock._tab_widget.count() == 1
+
+    _connect(widget)
+    widget.session()._connectedSlot()
+    assert dock._tab_widget.tabText(0) == "PC1"
+
+
+def test_broadcast_selected_nodes(dock, main_window):
+    dock.openConsole(_node("PC1"), 5000)
+    dock.openConsole(_node("PC2"), 5001)
+    pc1 = dock.consoles()[("PC1", 5000)]
+    pc2 = dock.consoles()[("PC2", 5001)]
+    _connect(pc1)
+    _connect(pc2)
+
+    node_item = MagicMock(spec=NodeItem)
+    node_item.node.return_value.id.return_value = "PC2"
+    main_window.uiGraphicsView.scene.return_value.selectedItems.return_value = [node_item, MagicMock()]
+
+    dock._broadcast_line_edit.setText("show version")
+    dock._broadcastSlot()
+    pc2.session()._socket.write.assert_called_once_with(b"show version\r\0")
+    assert not pc1.session()._socket.write.called
+    assert dock._broadcast_line_edit.text() == ""
+
+
+def test_broadcast_current_tab(dock, main_window):
+    dock.openConsole(_node("PC1"), 5000)
+    dock.openConsole(_node("PC2"), 5001)
+    pc1 = dock.consoles()[("PC1", 5000)]
+    pc2 = dock.consoles()[("PC2", 5001)]
+    _connect(pc1)
+    _connect(pc2)
+    main_window.uiGraphicsView.scene.return_value.selectedItems.return_value = []
+
+    # no node selected, only the current console
+    dock._tab_widget.setCurrentWidget(pc1)
+    dock._broadcast_line_edit.setText("enable")
+    dock._broadcastSlot()
+    pc1.session()._socket.write.assert_called_once_with(b"enable\r\0")
+    assert not pc2.session()._socket.write.called
+
+
+def test_broadcast_disconnected(dock, main_window):
+    dock.openConsole(_node("PC1"), 5000)
+    pc1 = dock.consoles()[("PC1", 5000)]
+    main_window.uiGraphicsView.scene.return_value.selectedItems.return_value = []
+
+    dock._broadcast_line_edit.setText("enable")
+    dock._broadcastSlot()
+    assert not pc1.session()._socket.write.called
+    # the command is kept to be sent again
+    assert dock._broadcast_line_edit.text() == "enable"
+
+
+def test_close_all(dock):
+    dock.openConsole(_node("PC1"), 5000)
+    dock.openConsole(_node("PC2"), 5001)
+    sockets = [widget.session()._socket for widget in dock.consoles().values()]
+
+    dock.closeAll()
+    assert dock._tab_widget.count() == 0
+    assert dock.consoles() == {}
+    for socket in sockets:
+        assert socket.abort.called
+
+
+def test_session_read(tmpdir):
+    log_path = str(tmpdir / "PC1_5000.log")
+    with patch("gns3.telnet_console_dock.QtNetwork.QTcpSocket", side_effect=_socket):
+        session = TelnetSession("localhost", 5000, log_path=log_path)
+    session.connectToConsole()
+    received = MagicMock()
+    session.data_received_signal.connect(received)
+
+    session._socket.readAll.return_value = bytes((IAC, WILL, ECHO)) + "Router>é".encode("utf-8")
+    session._readyReadSlot()
+    # the negotiation is answered and removed from the output
+    session._socket.write.assert_called_once_with(bytes((IAC, DO, ECHO)))
+    received.assert_called_once_with("Router>é")
+
+    session.close()
+    assert session._socket.abort.called
+    with open(log_path, "rb") as f:
+        assert f.read() == "Router>é".encode("utf-8")
+    assert os.path.basename(session.logPath()) == "PC1_5000.log"
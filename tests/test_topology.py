@@ -96,3 +96,75 @@ def test_createDrawing_svg():
     topology.createDrawing(shape_data)
     topology._main_window.uiGraphicsView.createDrawingItem.assert_called_with("image", 42, 12, 0, rotation=0, svg=shape_data["svg"], drawing_id=shape_data["drawing_id"])
 
+
+
+def test_topology_getNodeFromUuid(vpcs_device):
+    topology = Topology()
+    topology.addNode(vpcs_device)
+    assert topology.getNodeFromUuid(vpcs_device.node_id()) == vpcs_device
+    assert topology.getNodeFromUuid(str(uuid.uuid4())) is None
+    topology.removeNode(vpcs_device)
+    assert topology.getNodeFromUuid(vpcs_device.node_id()) is None
+    assert topology.getNode(vpcs_device.id()) is None
+
+
+def test_topology_updateNodeIndex(vpcs_device):
+    topology = Topology()
+    topology.addNode(vpcs_device)
+    old_node_id = vpcs_device.node_id()
+    vpcs_device._node_id = str(uuid.uuid4())
+    topology.updateNodeIndex(vpcs_device, old_node_id=old_node_id)
+    assert topology.getNodeFromUuid(old_node_id) is None
+    assert topology.getNodeFromUuid(vpcs_device.node_id()) == vpcs_device
+
+
+def test_topology_link():
+    topology = Topology()
+    link = MagicMock()
+    link.id.return_value = 42
+    link.link_id.return_value = str(uuid.uuid4())
+    assert topology.addLink(link)
+    assert topology.getLink(42) == link
+    assert topology.getLinkFromUuid(link.link_id()) == link
+
+    old_link_id = link.link_id()
+    link.link_id.return_value = str(uuid.uuid4())
+    topology.updateLinkIndex(link, old_link_id)
+    assert topology.getLinkFromUuid(old_link_id) is None
+    assert topology.getLinkFromUuid(link.link_id()) == link
+
+    topology.removeLink(link)
+    assert topology.getLink(42) is None
+    assert topology.getLinkFromUuid(link.link_id()) is None
+
+
+def test_topology_drawing():
+    topology = Topology()
+    drawing = MagicMock()
+    drawing.drawing_id.return_value = str(uuid.uuid4())
+    topology.addDrawing(drawing)
+    assert topology.getDrawingFromUuid(drawing.drawing_id()) == drawing
+    topology.removeDrawing(drawing)
+    assert topology.getDrawingFromUuid(drawing.drawing_id()) is None
+
+
+def test_topology_addLink_port_conflict():
+    topology = Topology()
+    node1 = MagicMock()
+    node2 = MagicMock()
+    node3 = MagicMock()
+    port1 = MagicMock()
+    port2 = MagicMock()
+    port3 = MagicMock()
+
+    link = MagicMock(_source_node=node1, _source_port=port1, _destination_node=node2, _destination_port=port2)
+    assert topology.addLink(link)
+    assert topology.getLinkFromPort(node1, port1) == link
+    assert topology.getLinkFromPort(node2, port2) == link
+
+    conflict = MagicMock(_source_node=node3, _source_port=port3, _destination_node=node2, _destination_port=port2)
+    assert not topology.addLink(conflict)
+
+    topology.removeLink(link)
+    assert topology.getLinkFromPort(node1, port1) is None
+    assert topology.addLink(conflict)
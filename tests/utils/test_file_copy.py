@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+
+from gns3.utils.file_copy import copy_file, data_segments
+
+
+def test_copy_file(tmpdir):
+    source = str(tmpdir / "source")
+    destination = str(tmpdir / "destination")
+    with open(source, "wb") as f:
+        f.write(os.urandom(10000))
+    os.chmod(source, 0o755)
+
+    progress = []
+    assert copy_file(source, destination, progress_callback=progress.append, chunk_size=4096)
+    with open(source, "rb") as f1, open(destination, "rb") as f2:
+        assert f1.read() == f2.read()
+    assert sum(progress) == 10000
+    assert len(progress) == 3
+    assert os.stat(destination).st_mode == os.stat(source).st_mode
+
+
+def test_copy_sparse_file(tmpdir):
+    source = str(tmpdir / "source")
+    destination = str(tmpdir / "destination")
+    with open(source, "wb") as f:
+        f.write(b"a" * 4096)
+        f.seek(16 * 1024 * 1024)
+        f.write(b"b" * 4096)
+        f.truncate(32 * 1024 * 1024)
+
+    progress = []
+    assert copy_file(source, destination, progress_callback=progress.append)
+    assert os.path.getsize(destination) == 32 * 1024 * 1024
+    assert sum(progress) == 32 * 1024 * 1024
+    with open(destination, "rb") as f:
+        assert f.read(4096) == b"a" * 4096
+        f.seek(16 * 1024 * 1024)
+        assert f.read(4096) == b"b" * 4096
+        assert f.read(4096) == b"\0" * 4096
+
+    with open(destination, "rb") as f:
+        segments = data_segments(f.fileno(), 32 * 1024 * 1024)
+    with open(source, "rb") as f:
+        assert segments == data_segments(f.fileno(), 32 * 1024 * 1024)
+
+
+def test_copy_file_cancelled(tmpdir):
+    source = str(tmpdir / "source")
+    destination = str(tmpdir / "destination")
+    with open(source, "wb") as f:
+        f.write(b"a" * 10000)
+
+    assert not copy_file(source, destination, is_cancelled=lambda: True)
+
+
+def test_copy_empty_file(tmpdir):
+    source = str(tmpdir / "source")
+    destination = str(tmpdir / "destination")
+    open(source, "wb").close()
+
+    assert copy_file(source, destination)
+    assert os.path.getsize(destination) == 0
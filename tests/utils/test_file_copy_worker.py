@@ -40,3 +40,32 @@ def test_file_copy_worker_with_preserve_permissions():
     os.close(destination_fp)
     os.remove(source)
     os.remove(destination)
+
+
+def test_file_copy_worker_progress(tmpdir):
+    source = str(tmpdir / "source")
+    destination = str(tmpdir / "destination")
+    with open(source, "wb") as f:
+        f.write(b"a" * 10000)
+
+    with patch('gns3.utils.file_copy_worker.FileCopyWorker.finished') as finished:
+        with patch('gns3.utils.file_copy_worker.FileCopyWorker.updated') as updated:
+            worker = FileCopyWorker(source, destination)
+            worker.run()
+            updated.emit.assert_called_with(100)
+            assert finished.emit.called
+    assert os.path.getsize(destination) == 10000
+
+
+def test_file_copy_worker_cancel(tmpdir):
+    source = str(tmpdir / "source")
+    destination = str(tmpdir / "destination")
+    with open(source, "wb") as f:
+        f.write(b"a" * 10000)
+
+    with patch('gns3.utils.file_copy_worker.FileCopyWorker.finished') as finished:
+        worker = FileCopyWorker(source, destination)
+        worker._isCancelled = lambda: True
+        worker.run()
+        assert not finished.emit.called
+    assert not os.path.exists(destination)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from gns3.utils.json_stream_decoder import JSONStreamDecoder
+
+
+def test_feed():
+    decoder = JSONStreamDecoder()
+    assert decoder.feed(b'{"action": "ping"}\n{"action": "node.updated"}\n') == [{"action": "ping"}, {"action": "node.updated"}]
+    assert decoder.pending() == 0
+
+
+def test_feed_partial():
+    decoder = JSONStreamDecoder()
+    assert decoder.feed(b'{"action": "ping"') == []
+    assert decoder.pending() > 0
+    assert decoder.feed(b'}\n{"a": "b"') == [{"action": "ping"}]
+    assert decoder.feed(b'}') == [{"a": "b"}]
+    assert decoder.pending() == 0
+
+
+def test_feed_partial_utf8():
+    decoder = JSONStreamDecoder()
+    data = '{"name": "été"}'.encode("utf-8")
+    assert decoder.feed(data[:11]) == []
+    assert decoder.feed(data[11:]) == [{"name": "été"}]
+
+
+def test_feed_whitespaces():
+    decoder = JSONStreamDecoder()
+    assert decoder.feed(b'  \r\n\t') == []
+    assert decoder.pending() == 0
+    assert decoder.feed(b'\n{"a": 1}  \n  ') == [{"a": 1}]
+    assert decoder.pending() == 0
+
+
+def test_feed_strings():
+    decoder = JSONStreamDecoder()
+    data = b'{"a": "}{[\\"\\\\"}["x", {"b": 1}] "s" 12'
+    # one byte at a time to split the escapes between the chunks
+    documents = []
+    for i in range(len(data)):
+        documents += decoder.feed(data[i:i + 1])
+    assert documents == [{"a": '}{["\\'}, ["x", {"b": 1}], "s"]
+    assert decoder.feed(b'\n') == [12]
+
+
+def test_feed_compact():
+    decoder = JSONStreamDecoder()
+    document = b'{"a": "' + b'x' * 1024 + b'"}'
+    documents = decoder.feed(document * 100 + document[:10])
+    assert len(documents) == 100
+    assert decoder.pending() == 10
+    assert decoder.feed(document[10:]) == [{"a": "x" * 1024}]
+    assert decoder.pending() == 0
+
+
+def test_feed_partial_number():
+    decoder = JSONStreamDecoder()
+    assert decoder.feed(b'3.') == []
+    assert decoder.feed(b'5') == []
+    assert decoder.feed(b' true') == [3.5]
+    assert decoder.feed(b'{"a": 1}') == [True, {"a": 1}]
+    assert decoder.pending() == 0
+
+
+def test_feed_invalid():
+    decoder = JSONStreamDecoder()
+    assert decoder.feed(b'xyz {"a": 1}\n') == [{"a": 1}]
+    assert decoder.feed(b']}, [1] {"b": 2}') == [{"b": 2}]
+    assert decoder.feed(b'{"c": x}{"d": 3}') == [{"d": 3}]
+    assert decoder.feed(b'garbage') == []
+    assert decoder.feed(b'\n{"e": 4}') == [{"e": 4}]
+    assert decoder.pending() == 0
+
+
+def test_feed_invalid_utf8():
+    decoder = JSONStreamDecoder()
+    assert decoder.feed(b'{"a": "\xff"}\n\xfe{"b": 1}') == [{"a": "\ufffd"}, {"b": 1}]
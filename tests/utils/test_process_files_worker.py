@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import json
+from unittest.mock import MagicMock, patch
+
+from gns3.utils.process_files_worker import ProcessFilesWorker
+
+
+def _create_project(directory):
+    os.makedirs(os.path.join(directory, "project-files", "qemu"))
+    with open(os.path.join(directory, "test.gns3"), "w") as f:
+        f.write("{}")
+    with open(os.path.join(directory, "project-files", "qemu", "hda_disk.qcow2"), "wb") as f:
+        f.write(b"a" * 3000)
+
+
+def test_copy(tmpdir):
+    source = str(tmpdir / "source")
+    destination = str(tmpdir / "destination")
+    _create_project(source)
+
+    worker = ProcessFilesWorker(source, destination)
+    worker.updated = MagicMock()
+    with patch("gns3.utils.process_files_worker.ProcessFilesWorker.finished") as finished:
+        worker.run()
+        assert finished.emit.called
+
+    with open(os.path.join(destination, "project-files", "qemu", "hda_disk.qcow2"), "rb") as f:
+        assert f.read() == b"a" * 3000
+    assert os.path.exists(os.path.join(destination, "test.gns3"))
+    assert not os.path.exists(os.path.join(destination, ProcessFilesWorker.MANIFEST_FILE))
+    # the progress is computed from the size of the files
+    worker.updated.emit.assert_called_with(100)
+
+
+def test_copy_resume(tmpdir):
+    source = str(tmpdir / "source")
+    destination = str(tmpdir / "destination")
+    _create_project(source)
+    os.makedirs(destination)
+
+    # the disk has been copied by a cancelled copy
+    disk = os.path.join("project-files", "qemu", "hda_disk.qcow2")
+    os.makedirs(os.path.join(destination, "project-files", "qemu"))
+    with open(os.path.join(destination, disk), "wb") as f:
+        f.write(b"b" * 3000)
+    st = os.stat(os.path.join(source, disk))
+    with open(os.path.join(destination, ProcessFilesWorker.MANIFEST_FILE), "w") as f:
+        json.dump({"source": os.path.abspath(source), "files": {disk: [st.st_size, st.st_mtime_ns]}}, f)
+
+    worker = ProcessFilesWorker(source, destination)
+    with patch("gns3.utils.process_files_worker.ProcessFilesWorker.finished"):
+        worker.run()
+
+    with open(os.path.join(destination, disk), "rb") as f:
+        assert f.read() == b"b" * 3000
+    assert os.path.exists(os.path.join(destination, "test.gns3"))
+    assert not os.path.exists(os.path.join(destination, ProcessFilesWorker.MANIFEST_FILE))
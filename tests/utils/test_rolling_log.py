@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+
+from gns3.utils.rolling_log import RollingLog
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_write(tmpdir):
+    path = str(tmpdir / "logs" / "PC1.log")
+    rolling_log = RollingLog(path, max_size=1024)
+    rolling_log.write(b"hello")
+    rolling_log.close()
+    assert _read(path) == b"hello"
+
+    # appended to the existing file
+    rolling_log = RollingLog(path, max_size=1024)
+    rolling_log.write(b"world")
+    rolling_log.close()
+    assert _read(path) == b"helloworld"
+
+
+def test_rotate(tmpdir):
+    path = str(tmpdir / "PC1.log")
+    rolling_log = RollingLog(path, max_size=1024, backups=2)
+    rolling_log.write(b"a" * 1024 + b"b" * 1024 + b"c" * 1024 + b"dd")
+    rolling_log.close()
+    assert _read(path) == b"dd"
+    assert _read(path + ".1") == b"c" * 1024
+    assert _read(path + ".2") == b"b" * 1024
+    assert not os.path.exists(path + ".3")
+
+
+def test_rotate_without_backup(tmpdir):
+    path = str(tmpdir / "PC1.log")
+    rolling_log = RollingLog(path, max_size=1024, backups=0)
+    rolling_log.write(b"a" * 1024 + b"bb")
+    rolling_log.close()
+    assert _read(path) == b"bb"
+    assert not os.path.exists(path + ".1")
+
+
+def test_invalid_max_size(tmpdir):
+    path = str(tmpdir / "PC1.log")
+    for max_size in (0, -1):
+        rolling_log = RollingLog(path, max_size=max_size, backups=1)
+        rolling_log.write(b"hello")
+        rolling_log.close()
+    assert _read(path) == b"hellohello"
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+
+from gns3.utils.static_asset_cache import StaticAssetCache
+
+
+def test_store(tmpdir):
+    cache = StaticAssetCache(str(tmpdir))
+    assert cache.path("/symbols/router.svg/raw") is None
+
+    path = cache.store("/symbols/router.svg/raw", b"<svg></svg>", etag="abc")
+    assert path.endswith(".svg")
+    assert cache.path("/symbols/router.svg/raw") == path
+    assert cache.validated("/symbols/router.svg/raw")
+    assert cache.validationHeaders("/symbols/router.svg/raw") == {"If-None-Match": "abc"}
+    with open(path, "rb") as f:
+        assert f.read() == b"<svg></svg>"
+
+
+def test_store_same_content(tmpdir):
+    cache = StaticAssetCache(str(tmpdir))
+    path = cache.store("/symbols/a.svg/raw", b"<svg></svg>")
+    assert cache.store("/symbols/b.svg/raw", b"<svg></svg>") == path
+    assert cache.size() == len(b"<svg></svg>")
+
+    cache.remove("/symbols/a.svg/raw")
+    assert os.path.exists(path)
+    cache.remove("/symbols/b.svg/raw")
+    assert not os.path.exists(path)
+    assert cache.size() == 0
+
+
+def test_persistent(tmpdir):
+    cache = StaticAssetCache(str(tmpdir))
+    path = cache.store("/symbols/router.svg/raw", b"<svg></svg>", last_modified="Mon, 02 Jan 2017 10:00:00 GMT")
+    cache.save()
+
+    cache = StaticAssetCache(str(tmpdir))
+    assert cache.path("/symbols/router.svg/raw") == path
+    # must be validated again by the controller
+    assert not cache.validated("/symbols/router.svg/raw")
+    assert cache.validationHeaders("/symbols/router.svg/raw") == {"If-Modified-Since": "Mon, 02 Jan 2017 10:00:00 GMT"}
+    cache.setValidated("/symbols/router.svg/raw")
+    assert cache.validated("/symbols/router.svg/raw")
+
+
+def test_persistent_missing_file(tmpdir):
+    cache = StaticAssetCache(str(tmpdir))
+    path = cache.store("/symbols/router.svg/raw", b"<svg></svg>")
+    cache.save()
+    os.remove(path)
+
+    cache = StaticAssetCache(str(tmpdir))
+    assert cache.path("/symbols/router.svg/raw") is None
+
+
+def test_eviction(tmpdir):
+    cache = StaticAssetCache(str(tmpdir), max_size=20)
+    cache.store("/symbols/a.svg/raw", b"a" * 8)
+    cache.store("/symbols/b.svg/raw", b"b" * 8)
+    # a is now the most recently used
+    cache.path("/symbols/a.svg/raw")
+    cache.store("/symbols/c.svg/raw", b"c" * 8)
+
+    assert cache.path("/symbols/b.svg/raw") is None
+    assert cache.path("/symbols/a.svg/raw") is not None
+    assert cache.path("/symbols/c.svg/raw") is not None
+    assert cache.size() == 16
+    assert cache.statistics()["evictions"] == 1
+
+
+def test_store_new_content(tmpdir):
+    cache = StaticAssetCache(str(tmpdir), max_size=20)
+    old_path = cache.store("/symbols/a.svg/raw", b"a" * 8)
+    path = cache.store("/symbols/a.svg/raw", b"b" * 8)
+    assert path != old_path
+    assert cache.path("/symbols/a.svg/raw") == path
+    # the previous file can still be used by the items
+    assert os.path.exists(old_path)
+    assert cache.statistics()["superseded"] == 1
+
+    # the superseded file is evicted first
+    cache.store("/symbols/c.svg/raw", b"c" * 8)
+    assert not os.path.exists(old_path)
+    assert cache.path("/symbols/a.svg/raw") == path
+    assert cache.size() == 16
+
+
+def test_store_previous_content(tmpdir):
+    cache = StaticAssetCache(str(tmpdir))
+    old_path = cache.store("/symbols/a.svg/raw", b"a" * 8)
+    cache.store("/symbols/a.svg/raw", b"b" * 8)
+    assert cache.store("/symbols/a.svg/raw", b"a" * 8) == old_path
+    assert cache.statistics()["superseded"] == 1
+    assert cache.size() == 16
+
+
+def test_load_removes_superseded(tmpdir):
+    cache = StaticAssetCache(str(tmpdir))
+    old_path = cache.store("/symbols/a.svg/raw", b"a" * 8)
+    path = cache.store("/symbols/a.svg/raw", b"b" * 8)
+    cache.save()
+
+    cache = StaticAssetCache(str(tmpdir))
+    assert not os.path.exists(old_path)
+    assert cache.path("/symbols/a.svg/raw") == path
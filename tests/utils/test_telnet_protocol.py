@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from gns3.utils.telnet_protocol import TelnetProtocol, IAC, DO, DONT, WILL, WONT, SB, SE, ECHO, SGA
+
+
+def test_feed_data():
+    protocol = TelnetProtocol()
+    assert protocol.feed(b"Router>") == (b"Router>", b"")
+
+
+def test_feed_negotiation():
+    protocol = TelnetProtocol()
+    data = bytes((IAC, WILL, ECHO, IAC, WILL, SGA, IAC, DO, 24)) + b"Router>"
+    assert protocol.feed(data) == (b"Router>", bytes((IAC, DO, ECHO, IAC, DO, SGA, IAC, WONT, 24)))
+    assert protocol.serverEchoes()
+    # already answered
+    assert protocol.feed(bytes((IAC, WILL, ECHO))) == (b"", b"")
+    assert protocol.feed(bytes((IAC, WONT, ECHO))) == (b"", bytes((IAC, DONT, ECHO)))
+    assert not protocol.serverEchoes()
+
+
+def test_feed_split_command():
+    protocol = TelnetProtocol()
+    assert protocol.feed(b"a" + bytes((IAC,))) == (b"a", b"")
+    assert protocol.feed(bytes((WILL,))) == (b"", b"")
+    assert protocol.feed(bytes((ECHO,)) + b"b") == (b"b", bytes((IAC, DO, ECHO)))
+
+
+def test_feed_subnegotiation_and_escape():
+    protocol = TelnetProtocol()
+    data = b"a" + bytes((IAC, SB, 24, 1, IAC, SE, IAC, IAC)) + b"b"
+    assert protocol.feed(data) == (b"a\xffb", b"")
+
+
+def test_encode():
+    assert TelnetProtocol.encode(b"a\xffb") == b"a\xff\xffb"
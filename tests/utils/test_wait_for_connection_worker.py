@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import time
+from unittest.mock import MagicMock, patch
+
+from gns3.qt import QtNetwork
+from gns3.utils.wait_for_connection_worker import WaitForConnectionWorker
+
+
+def _worker(timeout=30.0):
+    worker = WaitForConnectionWorker("127.0.0.1", 3080, timeout=timeout)
+    worker._is_running = True
+    worker._begin = time.monotonic()
+    worker._attempt_timer = MagicMock()
+    return worker
+
+
+def test_retry_backoff():
+    worker = _worker()
+    with patch("gns3.qt.QtCore.QTimer.singleShot") as mock:
+        worker._retry()
+        worker._retry()
+        worker._retry()
+    delays = [call[0][0] for call in mock.call_args_list]
+    assert delays == [50, 100, 200]
+
+
+def test_retry_timeout():
+    worker = _worker(timeout=0)
+    errors = []
+    worker.error.connect(lambda message, stop: errors.append(message))
+    worker._last_error = "Connection refused"
+    worker._retry()
+    assert errors == ["Could not connect to 127.0.0.1 on port 3080: Connection refused"]
+    assert not worker._is_running
+
+
+def test_version_received():
+    worker = _worker()
+    finished = MagicMock()
+    worker.finished.connect(finished)
+
+    reply = MagicMock()
+    reply.attribute.return_value = 200
+    reply.readAll.return_value = b'{"version": "2.1.0"}'
+    worker._reply = reply
+    worker._versionReceivedSlot()
+
+    assert finished.called
+    assert worker.timeToReady() is not None
+
+
+def test_version_received_not_gns3():
+    worker = _worker()
+    reply = MagicMock()
+    reply.attribute.return_value = 200
+    reply.error.return_value = QtNetwork.QNetworkReply.NoError
+    reply.readAll.return_value = b'{}'
+    worker._reply = reply
+    with patch("gns3.utils.wait_for_connection_worker.WaitForConnectionWorker._retry") as mock:
+        worker._versionReceivedSlot()
+    assert mock.called
+    assert worker.timeToReady() is None